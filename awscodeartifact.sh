@@ -31,4 +31,4 @@ else
 fi
 
 export PYTHONPATH=$(pwd)
-python src/main.py
+python src/main.py "$@"
@@ -0,0 +1,143 @@
+"""End-to-end throughput of StockAnalyser.start_process against FakeFmpServer.
+
+Each universe size runs in a fresh process, so peak RSS is that of the run
+alone, while the fake server answers from the parent process.
+
+Usage: python -m src.benchmarks.end_to_end_benchmark --tickers 10 500 5000 \
+    --engine threads --latency 0.02 --error-rate 0.01 --output bench.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+from src.benchmarks.fake_fmp_server import FakeFmpServer
+
+
+def build_config(url: str, args: argparse.Namespace, work_dir: str) -> Dict:
+    return {
+        "API_KEYS": {
+            "FMP": {
+                "URL": url,
+                "API_TOKEN": "offline",
+                # Measure the pipeline, not the token bucket
+                "RATE_LIMIT_PER_MINUTE": 10_000_000,
+            }
+        },
+        "PROCESSING": {
+            "ENGINE": args.engine,
+            "INDICATOR_SOURCE": args.indicator_source,
+            "MAX_WORKERS": args.workers,
+        },
+        # The database layer is not part of an offline run
+        "PERSISTENCE": {"ENABLED": False},
+        "CHECKPOINT": {"PATH": os.path.join(work_dir, "run_journal.sqlite")},
+        # Fresh per universe size, so no scenario reuses the previous one
+        "UNIVERSE": {"PATH": os.path.join(work_dir, "universe.sqlite")},
+        "SCREENER": {"INDEX_PATH": os.path.join(work_dir, "signal_index.npz")},
+        "METRICS": {"JSON_PATH": os.path.join(work_dir, "metrics.json")},
+    }
+
+
+def run_scenario(app_config: Dict) -> Dict:
+    """Runs in the child process; returns the numbers of one universe size."""
+    from src.settings.shared import set_app_config
+    from src.stock_analyser.stock_processor import StockAnalyser
+
+    set_app_config(config=app_config)
+    start_time = time.perf_counter()
+    summary = StockAnalyser().start_process(app_config=app_config)
+    elapsed = time.perf_counter() - start_time
+
+    with open(app_config["METRICS"]["JSON_PATH"]) as report_file:
+        report = json.load(report_file)
+    stages = {
+        histogram["labels"]["stage"]: round(histogram["p95"], 4)
+        for histogram in report["histograms"]
+        if histogram["name"] == "stage_seconds"
+        and set(histogram["labels"]) == {"stage"}
+    }
+    quality_seconds = sum(
+        histogram["sum"]
+        for histogram in report["histograms"]
+        if histogram["name"] == "stage_seconds"
+        and histogram["labels"].get("stage") == "data_quality"
+    )
+    ticker_seconds = sum(
+        histogram["sum"]
+        for histogram in report["histograms"]
+        if histogram["name"] == "ticker_seconds"
+    )
+    totals = summary.as_dict()
+    return {
+        "tickers": totals["total"],
+        "succeeded": totals["succeeded"],
+        "failed": totals["failed"],
+        "seconds": elapsed,
+        "tickers_per_second": totals["total"] / elapsed if elapsed else 0.0,
+        "p95_ticker_seconds": totals["p95_seconds"],
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "http": report["http"],
+        "stage_p95_seconds": stages,
+        # Both are wall times inside the worker threads, so they inflate alike
+        "data_quality_share": (
+            quality_seconds / ticker_seconds if ticker_seconds else 0.0
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, nargs="+", default=[10, 500, 5000])
+    parser.add_argument("--days", type=int, default=1260)
+    parser.add_argument("--engine", choices=["threads", "asyncio"], default="threads")
+    parser.add_argument(
+        "--indicator-source", choices=["local", "remote"], default="local"
+    )
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for tickers in args.tickers:
+        with FakeFmpServer(
+            tickers=tickers,
+            days=args.days,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+        ) as server, tempfile.TemporaryDirectory() as work_dir:
+            app_config = build_config(server.url, args, work_dir)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(run_scenario, app_config).result()
+            result["server"] = dict(server.stats)
+        results.append(result)
+        print(
+            f"{tickers:>6} tickers | {result['seconds']:8.2f}s | "
+            f"{result['tickers_per_second']:7.1f} tickers/s | "
+            f"p95 {result['p95_ticker_seconds']:.3f}s | "
+            f"peak RSS {result['peak_rss_mb']:.0f} MiB | "
+            f"data quality {result['data_quality_share']:.2%} | "
+            f"failed {result['failed']}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(
+                {"arguments": vars(args), "results": results}, output_file, indent=2
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from src.benchmarks.synthetic_data import SyntheticMarket
+
+
+class FakeFmpServer:
+    """Local stand-in for the FMP API, serving synthetic but stable data.
+
+    Serves /stock/list, /profile/{symbols}, /historical-price-full/{symbol}
+    and /technical_indicator/1day/{symbol} in the shapes the collectors
+    expect. Each request waits `latency` seconds (plus up to `jitter`), and
+    a share `error_rate` of the requests fails with a 500, so retries and
+    slow networks can be reproduced without spending API quota. `failures`
+    maps an endpoint, such as "profile" or "historical-price-full", to the
+    status every request to it gets, e.g. 429 for a rate-limit lockout.
+    Responses carry an ETag and a matching If-None-Match gets a 304.
+
+    Usage:
+        with FakeFmpServer(tickers=500) as server:
+            app_config["API_KEYS"]["FMP"]["URL"] = server.url
+    """
+
+    def __init__(
+        self,
+        tickers: int = 10,
+        days: int = 1260,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        failures: Dict[str, int] = None,
+    ) -> None:
+        self.symbols = [f"T{number:05d}" for number in range(tickers)]
+        self.seeds = {symbol: number for number, symbol in enumerate(self.symbols)}
+        self.days = days
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.failures = failures or {}
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "errors": 0, "not_modified": 0}
+        self.server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_port}/api/v3"
+
+    def __enter__(self) -> "FakeFmpServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                status, body = fake.respond(self.path)
+                etag = f'"{zlib.crc32(body):08x}"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    fake.increment("not_modified")
+                    status, body = 304, b""
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                if status in (200, 304):
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+
+            def handle_error(self, request, client_address) -> None:
+                # Clients dropping keep-alive connections at exit are expected
+                pass
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        threading.Thread(
+            target=self.server.serve_forever, name="fake-fmp", daemon=True
+        ).start()
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def draw(self) -> float:
+        with self.lock:
+            return self.random.random()
+
+    def increment(self, counter: str) -> None:
+        with self.lock:
+            self.stats[counter] += 1
+
+    def respond(self, path: str):
+        """Status code and JSON body for a request path."""
+        self.increment("requests")
+        delay = self.latency + self.jitter * self.draw()
+        if delay:
+            time.sleep(delay)
+        if self.error_rate and self.draw() < self.error_rate:
+            self.increment("errors")
+            return 500, b'{"Error Message": "Injected failure"}'
+
+        parts = urlsplit(path)
+        query = {name: values[0] for name, values in parse_qs(parts.query).items()}
+        route = parts.path
+        for endpoint, status in self.failures.items():
+            if f"/{endpoint}" in route:
+                self.increment("errors")
+                return status, b'{"Error Message": "Injected failure"}'
+        if route.endswith("/stock/list"):
+            body = self.stock_list()
+        elif "/profile/" in route:
+            body = self.profiles(route.rsplit("/", 1)[-1].split(","))
+        elif "/historical-price-full/" in route:
+            body = {
+                "symbol": route.rsplit("/", 1)[-1],
+                "historical": self.bars(route.rsplit("/", 1)[-1], query),
+            }
+        elif "/technical_indicator/" in route:
+            indicator = query.get("type", "sma")
+            body = [
+                dict(bar, **{indicator: bar["close"]})
+                for bar in self.bars(route.rsplit("/", 1)[-1], query)
+            ]
+        else:
+            return 404, b'{"Error Message": "Unknown endpoint"}'
+        return 200, json.dumps(body).encode()
+
+    def stock_list(self) -> List[Dict]:
+        return [
+            {
+                "symbol": symbol,
+                "name": f"{symbol} Inc.",
+                "price": 10.0,
+                "exchange": "NASDAQ Global Select",
+                "exchangeShortName": "NASDAQ",
+                "type": "stock",
+            }
+            for symbol in self.symbols
+        ]
+
+    def profiles(self, symbols: List[str]) -> List[Dict]:
+        return [
+            {
+                "symbol": symbol,
+                "companyName": f"{symbol} Inc.",
+                "name": f"{symbol} Inc.",
+                "mktCap": 1_000_000_000,
+                "sector": "Technology",
+                "industry": "Software",
+                "exchangeShortName": "NASDAQ",
+            }
+            for symbol in symbols
+            if symbol in self.seeds
+        ]
+
+    def bars(self, symbol: str, query: Dict) -> List[Dict]:
+        """Daily bars of `symbol`, newest first and filtered on from/to like FMP."""
+        if symbol not in self.seeds:
+            return []
+        frame = SyntheticMarket.ohlcv_frame(symbol, self.days, seed=self.seeds[symbol])
+        if "from" in query:
+            frame = frame[frame.index >= pd.Timestamp(query["from"])]
+        if "to" in query:
+            frame = frame[frame.index <= pd.Timestamp(query["to"])]
+        frame = frame.iloc[::-1]
+        dates = frame.index.strftime("%Y-%m-%d")
+        return [
+            {
+                "date": day,
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "adjClose": close,
+                "volume": int(volume),
+            }
+            for day, open_, high, low, close, volume in zip(
+                dates,
+                frame["open"].tolist(),
+                frame["high"].tolist(),
+                frame["low"].tolist(),
+                frame["close"].tolist(),
+                frame["volume"].tolist(),
+            )
+        ]
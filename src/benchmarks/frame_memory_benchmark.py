@@ -0,0 +1,69 @@
+"""Compare bytes per bar of the merged universe before and after FrameSchema.
+
+Usage: python -m src.benchmarks.frame_memory_benchmark --tickers 500 --days 2520
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from src.benchmarks.synthetic_data import SyntheticMarket
+from src.model.frame_schema import FrameSchema
+from src.services.technical_indicators import TechnicalIndicators
+
+
+def merged_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Per-ticker frame as built before the canonical schema, FMP leftovers included."""
+    df = frame.copy()
+    df["adjClose"] = df["close"]
+    df["unadjustedVolume"] = df["volume"]
+    df["change"] = df["close"] - df["open"]
+    df["changePercent"] = df["change"] / df["open"] * 100
+    df["vwap"] = (df["high"] + df["low"] + df["close"]) / 3
+    df["label"] = df.index.strftime("%B %d, %y")
+    df["changeOverTime"] = df["change"] / df["open"]
+    df["sma_50"] = TechnicalIndicators.compute_sma(df, 50)
+    df["sma_200"] = TechnicalIndicators.compute_sma(df, 200)
+    return df.join(TechnicalIndicators.compute_local_indicators(df))
+
+
+def bytes_per_bar(df: pd.DataFrame) -> float:
+    return df.memory_usage(index=True, deep=True).sum() / len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--days", type=int, default=2520)
+    args = parser.parse_args()
+
+    frames = {
+        ticker: merged_frame(frame)
+        for ticker, frame in SyntheticMarket.universe(
+            tickers=args.tickers, days=args.days
+        ).items()
+    }
+
+    before_df = pd.concat(
+        [frame.assign(symbol=ticker) for ticker, frame in frames.items()]
+    )
+    after_df = FrameSchema.universe_frame(
+        {ticker: FrameSchema.conform(frame) for ticker, frame in frames.items()}
+    )
+
+    before = bytes_per_bar(before_df)
+    after = bytes_per_bar(after_df)
+    print(f"Tickers: {args.tickers} | Days: {args.days} | Bars: {len(after_df)}")
+    print(
+        f"Before: {before:.1f} bytes/bar | {before * len(before_df) / 1024**2:.1f} MiB"
+    )
+    print(f"After:  {after:.1f} bytes/bar | {after * len(after_df) / 1024**2:.1f} MiB")
+    print(f"Reduction: {before / after:.1f}x")
+
+    ema_error = np.abs(after_df["ema"].to_numpy() - before_df["ema"].to_numpy())
+    print(f"Max ema error from float32: {np.nanmax(ema_error):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Startup import cost of the CLI entry point, checked against a budget.
+
+Each module is imported in a fresh `python -X importtime` process, several
+times, and the best cumulative time is reported with its heaviest imports.
+The exit status is 1 when a module with a budget goes over it;
+tests/test_import_time.py runs the same check with the test suite.
+
+Usage: python -m src.benchmarks.import_time_benchmark --repeat 5 --budget-ms 100
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+# Modules imported before the config is validated, which have to stay light
+BUDGETED_MODULES = ["src.main", "src.settings.shared"]
+DEFAULT_BUDGET_MS = 100.0
+# Directory holding the src package, so the check runs from any directory
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Reported for reference: what a real run pays once the config is valid
+REFERENCE_MODULES = [
+    "src.stock_analyser.shard_runner",
+    "src.stock_analyser.stock_processor",
+]
+
+
+def import_times(module: str) -> List[Tuple[int, str, int]]:
+    """(depth, package, cumulative microseconds) of one fresh interpreter."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, package = line[len("import time:") :].split("|")
+        depth = (len(package) - len(package.lstrip()) - 1) // 2
+        entries.append((depth, package.strip(), int(cumulative)))
+    return entries
+
+
+def direct_imports(entries: List[Tuple[int, str, int]], module: str) -> List:
+    """Imports made by `module` itself; importtime lists them right before it."""
+    position = next(index for index, entry in enumerate(entries) if entry[1] == module)
+    children = []
+    for depth, package, cumulative in reversed(entries[:position]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((package, cumulative))
+    return sorted(children, key=lambda child: child[1], reverse=True)
+
+
+def best_run(module: str, repeat: int) -> Tuple[int, List[Tuple[str, int]]]:
+    """Fastest cumulative time of `module` and the heaviest imports of that run."""
+    runs = [import_times(module) for _ in range(repeat)]
+
+    def cumulative_of(entries: List[Tuple[int, str, int]]) -> int:
+        return next(entry[2] for entry in entries if entry[1] == module)
+
+    best = min(runs, key=cumulative_of)
+    return cumulative_of(best), direct_imports(best, module)[:5]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in BUDGETED_MODULES + REFERENCE_MODULES:
+        cumulative, heaviest = best_run(module, args.repeat)
+        budgeted = module in BUDGETED_MODULES
+        verdict = ""
+        if budgeted:
+            verdict = "ok" if cumulative / 1000 <= args.budget_ms else "OVER BUDGET"
+            if verdict != "ok":
+                over_budget.append(module)
+        print(f"{module:<40} {cumulative / 1000:8.1f} ms  {verdict}")
+        for package, package_cumulative in heaviest:
+            print(f"    {package:<36} {package_cumulative / 1000:8.1f} ms")
+
+    if over_budget:
+        print(
+            f"Over the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}. "
+            "Move the heavy imports into the functions that need them."
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
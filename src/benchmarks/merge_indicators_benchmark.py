@@ -0,0 +1,78 @@
+"""Time HelperMethods.merge_indicator_data against the previous per-indicator merge.
+
+Usage: python -m src.benchmarks.merge_indicators_benchmark --days 2520 --repeat 50
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from src.benchmarks.synthetic_data import SyntheticMarket
+from src.services.helper import HelperMethods
+from src.services.technical_indicators import INDICATORS_TO_FETCH
+
+
+def build_responses(days: int):
+    """technical_indicator responses: OHLCV echoed back plus the value, newest first."""
+    frame = SyntheticMarket.ohlcv_frame("BENCH", days, seed=11).iloc[::-1]
+    bars = [
+        {
+            "date": f"{day.date()} 00:00:00",
+            "open": row.open,
+            "high": row.high,
+            "low": row.low,
+            "close": row.close,
+            "volume": int(row.volume),
+        }
+        for day, row in frame.iterrows()
+    ]
+    return {
+        name: [dict(bar, **{name: bar["close"] * (1 + position / 100)}) for bar in bars]
+        for position, name in enumerate(INDICATORS_TO_FETCH)
+    }
+
+
+def run_previous(indicators) -> pd.DataFrame:
+    """The merge as it was: rsi frame as base, other columns assigned by position."""
+    frames = {name: pd.DataFrame(data) for name, data in indicators.items()}
+    df = frames["rsi"].set_index("date")
+    for name in ["ema", "adx", "wma", "dema", "tema", "williams"]:
+        df[name] = frames[name][name]
+    df.index = pd.to_datetime(df.index)
+    return df
+
+
+def run_current(indicators) -> pd.DataFrame:
+    return HelperMethods.merge_indicator_data(indicators)
+
+
+def timed(function, indicators, repeat: int):
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        df = function(indicators)
+    return df, (time.perf_counter() - start_time) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    indicators = build_responses(args.days)
+    previous_df, previous_seconds = timed(run_previous, indicators, args.repeat)
+    current_df, current_seconds = timed(run_current, indicators, args.repeat)
+
+    print(f"Bars: {args.days} | Indicators: {len(indicators)}")
+    print(f"Previous merge: {previous_seconds * 1000:.2f} ms")
+    print(f"Current merge:  {current_seconds * 1000:.2f} ms")
+    print(f"Speed-up:       {previous_seconds / current_seconds:.1f}x")
+    print(
+        f"Non-null ema values: previous {previous_df['ema'].notna().sum()}, "
+        f"current {current_df['ema'].notna().sum()}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Compare decoding OHLCV responses whole versus streaming them.
+
+Bodies below STREAM_THRESHOLD_BYTES are parsed with json.loads by
+OhlcvParser.from_bytes; the streamed figures are what larger bodies pay.
+
+Usage: python -m src.benchmarks.ohlcv_parse_benchmark --days 20000
+"""
+
+import argparse
+import io
+import json
+import time
+import tracemalloc
+
+import ijson
+import pandas as pd
+
+from src.benchmarks.synthetic_data import SyntheticMarket
+from src.services.ohlcv_parser import ITEM_PREFIX, OhlcvParser
+
+
+def build_payload(days: int) -> bytes:
+    """historical-price-full body with FMP's extra fields, newest bar first."""
+    frame = SyntheticMarket.ohlcv_frame("BENCH", days, seed=7)
+    historical = [
+        {
+            "date": str(day.date()),
+            "open": row.open,
+            "high": row.high,
+            "low": row.low,
+            "close": row.close,
+            "adjClose": row.close,
+            "volume": int(row.volume),
+            "unadjustedVolume": int(row.volume),
+            "change": row.close - row.open,
+            "changePercent": (row.close - row.open) / row.open * 100,
+            "vwap": (row.high + row.low + row.close) / 3,
+            "label": day.strftime("%B %d, %y"),
+            "changeOverTime": (row.close - row.open) / row.open,
+        }
+        for day, row in frame.iloc[::-1].iterrows()
+    ]
+    return json.dumps({"symbol": "BENCH", "historical": historical}).encode()
+
+
+def run_decoded(body: bytes) -> pd.DataFrame:
+    historical_data = json.loads(body)["historical"]
+    filtered_data = [
+        entry
+        for entry in historical_data
+        if entry["volume"] > 0
+        and not (entry["open"] == entry["high"] == entry["low"] == entry["close"])
+    ]
+    df = pd.DataFrame(filtered_data)
+    df["date"] = pd.to_datetime(df["date"])
+    df.set_index("date", inplace=True)
+    return df[["open", "high", "low", "close", "volume"]].sort_index()
+
+
+def run_streamed(body: bytes) -> pd.DataFrame:
+    return OhlcvParser.from_bars(
+        ijson.items(io.BytesIO(body), ITEM_PREFIX, use_float=True)
+    )
+
+
+def run_parser(body: bytes) -> pd.DataFrame:
+    return OhlcvParser.from_bytes(body)
+
+
+def measure(function, body: bytes):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    df = function(body)
+    seconds = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return df, seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=20000)
+    args = parser.parse_args()
+
+    body = build_payload(args.days)
+    decoded_df, decoded_seconds, decoded_peak = measure(run_decoded, body)
+    streamed_df, streamed_seconds, streamed_peak = measure(run_streamed, body)
+    parser_df, parser_seconds, parser_peak = measure(run_parser, body)
+
+    print(f"Bars: {args.days} | Body: {len(body) / 1024**2:.1f} MiB")
+    print(
+        f"json.loads + DataFrame: {decoded_seconds:.3f}s | "
+        f"peak {decoded_peak / 1024**2:.1f} MiB"
+    )
+    print(
+        f"Streaming parser:       {streamed_seconds:.3f}s | "
+        f"peak {streamed_peak / 1024**2:.1f} MiB"
+    )
+    print(
+        f"OhlcvParser.from_bytes: {parser_seconds:.3f}s | "
+        f"peak {parser_peak / 1024**2:.1f} MiB"
+    )
+    print(f"Peak memory reduction:  {decoded_peak / streamed_peak:.1f}x")
+    for df in (streamed_df, parser_df):
+        pd.testing.assert_frame_equal(
+            decoded_df,
+            df,
+            check_dtype=False,
+            check_index_type=False,
+            check_freq=False,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Measure the persistence stage against the local SQLite stand-in.
+
+Usage: python -m src.benchmarks.persistence_benchmark --tickers 200 --days 2520
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.benchmarks.sqlite_sink import SqliteSink
+from src.benchmarks.synthetic_data import SyntheticMarket
+from src.model.persistence_writer import HISTORICAL_RECORDS, PersistenceWriter
+from src.services.helper import HelperMethods
+from src.services.technical_indicators import TechnicalIndicators
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--database", default=":memory:")
+    args = parser.parse_args()
+
+    frames = SyntheticMarket.universe(tickers=args.tickers, days=args.days)
+    for ticker, frame in frames.items():
+        frame["sma_50"] = TechnicalIndicators.compute_sma(frame, 50)
+        frame["sma_200"] = TechnicalIndicators.compute_sma(frame, 200)
+        frames[ticker] = frame.join(TechnicalIndicators.compute_local_indicators(frame))
+
+    sink = SqliteSink(path=args.database)
+    app_config = {"PERSISTENCE": {"CHUNK_SIZE": args.chunk_size}}
+
+    def produce(writer, ticker, frame):
+        records = HelperMethods.frame_to_records(
+            frame, symbol=ticker, columns=writer.historical_columns
+        )
+        writer.submit(HISTORICAL_RECORDS, records)
+
+    start_time = time.perf_counter()
+    with PersistenceWriter(app_config, sinks=sink.sinks()) as writer:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            for ticker, frame in frames.items():
+                executor.submit(produce, writer, ticker, frame)
+    elapsed = time.perf_counter() - start_time
+
+    rows = sink.count("historical_data")
+    print(f"Rows: {rows} | Chunk size: {args.chunk_size}")
+    print(f"End to end: {elapsed:.2f}s ({rows / elapsed:.0f} rows/s)")
+    print(f"Writer: {writer.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Screen the universe from the SignalIndex against re-scanning every frame.
+
+Builds the index of the default SCREENER.RULES for a synthetic universe,
+then times each rule over the whole history both ways and checks they agree.
+
+Usage: python -m src.benchmarks.screener_benchmark --tickers 4000 --days 2520
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from src.benchmarks.synthetic_data import SyntheticMarket
+from src.model.frame_schema import FrameSchema
+from src.services.indicator_engine import IndicatorEngine
+from src.services.screener import DEFAULT_RULES, Screener, SignalIndexBuilder
+from src.services.technical_indicators import TechnicalIndicators
+
+
+def build_frame(ticker: str, days: int, seed: int) -> pd.DataFrame:
+    """Canonical frame with the columns the default rules read."""
+    df = SyntheticMarket.ohlcv_frame(ticker, days, seed=seed)
+    df["sma_50"] = TechnicalIndicators.compute_sma(df, 50)
+    df["sma_200"] = TechnicalIndicators.compute_sma(df, 200)
+    df["rsi"] = IndicatorEngine.rsi(df["close"], 14)
+    return FrameSchema.conform(df)
+
+
+def rescan(frames: Dict[str, pd.DataFrame], name: str) -> Dict[str, List[str]]:
+    """The default rules evaluated frame by frame with pandas."""
+    matches: Dict[str, List[str]] = {}
+    for ticker, df in frames.items():
+        if name == "oversold_uptrend":
+            hits = (df["rsi"] < 30) & (df["close"] > df["sma_200"])
+        else:
+            spread = df["sma_50"].astype("float64") - df["sma_200"]
+            hits = (spread > 0) & (spread.shift(1) <= 0)
+        for day in df.index[hits.to_numpy()]:
+            matches.setdefault(str(day.date()), []).append(ticker)
+    return matches
+
+
+def best_of(repeat: int, function, *args):
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        result = function(*args)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=4000)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = {
+        f"T{number:05d}": build_frame(f"T{number:05d}", args.days, seed=number)
+        for number in range(args.tickers)
+    }
+    app_config = {
+        "SCREENER": {"INDEX_PATH": os.path.join(tempfile.mkdtemp(), "signal_index.npz")}
+    }
+
+    start_time = time.perf_counter()
+    builder = SignalIndexBuilder(app_config)
+    for ticker, df in frames.items():
+        builder.add(ticker, df)
+    builder.close()
+    build_seconds = time.perf_counter() - start_time
+    index_bytes = os.path.getsize(app_config["SCREENER"]["INDEX_PATH"])
+
+    print(f"Tickers: {args.tickers} | Days: {args.days}")
+    print(
+        f"Index build: {build_seconds:.2f}s | "
+        f"{index_bytes / 1024**2:.1f} MiB on disk"
+    )
+    screener = Screener.get_screener(app_config)
+    for name in DEFAULT_RULES:
+        index_seconds, from_index = best_of(args.repeat, screener.screen, name)
+        rescan_seconds, from_frames = best_of(1, rescan, frames, name)
+        latest_seconds, _ = best_of(args.repeat, screener.latest, name)
+        agree = {day: sorted(tickers) for day, tickers in from_index.items()} == {
+            day: sorted(tickers) for day, tickers in from_frames.items()
+        }
+        print(
+            f"{name:<18} matches: {sum(map(len, from_index.values())):>7} | "
+            f"index: {index_seconds * 1000:8.1f} ms | "
+            f"latest date: {latest_seconds * 1000:6.2f} ms | "
+            f"rescan: {rescan_seconds * 1000:8.1f} ms | same result: {agree}"
+        )
+
+
+if __name__ == "__main__":
+    main()
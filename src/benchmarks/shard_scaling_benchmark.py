@@ -0,0 +1,76 @@
+"""Scaling of the CPU-bound ticker pipeline over 1, 2, 4 and 8 shard processes.
+
+Each shard parses synthetic historical-price-full bodies with OhlcvParser,
+computes the local indicators and conforms the frame, i.e. everything a
+ticker costs apart from waiting on the network.
+
+Usage: python -m src.benchmarks.shard_scaling_benchmark --tickers 400 --days 2520
+"""
+
+import argparse
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from src.benchmarks.ohlcv_parse_benchmark import build_payload
+from src.model.frame_schema import FrameSchema
+from src.services.data_collector import DataCollector
+from src.services.ohlcv_parser import OhlcvParser
+from src.services.technical_indicators import TechnicalIndicators
+from src.stock_analyser.shard_runner import ShardRunner
+
+
+def run_shard(tickers: List[str], payload: bytes) -> int:
+    bars = 0
+    for ticker in tickers:
+        ohlcv = OhlcvParser.from_stream(io.BytesIO(payload))
+        df = DataCollector.build_ohlcv_frame(ticker=ticker, ohlcv=ohlcv)
+        df = FrameSchema.conform(
+            df.join(TechnicalIndicators.compute_local_indicators(df))
+        )
+        bars += len(df)
+    return bars
+
+
+def run(tickers: List[str], payload: bytes, processes: int) -> float:
+    shards = [[] for _ in range(processes)]
+    for ticker in tickers:
+        shards[ShardRunner.shard_for(ticker, processes)].append(ticker)
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+        # Start the workers first so interpreter start-up is not timed
+        list(pool.map(abs, range(processes)))
+        start_time = time.perf_counter()
+        list(pool.map(run_shard, shards, [payload] * processes))
+        return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=400)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    tickers = [f"T{number:05d}" for number in range(args.tickers)]
+    payload = build_payload(args.days)
+    print(
+        f"Tickers: {args.tickers} | Days: {args.days} | "
+        f"CPUs: {multiprocessing.cpu_count()}"
+    )
+    baseline = None
+    for processes in args.processes:
+        seconds = run(tickers, payload, processes)
+        baseline = baseline or seconds
+        print(
+            f"{processes} processes: {seconds:.2f}s | "
+            f"{args.tickers / seconds:.1f} tickers/s | "
+            f"speed-up {baseline / seconds:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
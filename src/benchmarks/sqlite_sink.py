@@ -0,0 +1,73 @@
+import sqlite3
+import threading
+from typing import Callable, Dict, List
+
+from src.model.persistence_writer import (
+    DEFAULT_HISTORICAL_COLUMNS,
+    HISTORICAL_RECORDS,
+    STOCK_RECORDS,
+)
+
+STOCK_COLUMNS = ["symbol", "name", "sector", "industry", "market_cap"]
+
+
+class SqliteSink:
+    """Local SQLite stand-in for the stock_analyser_lib repositories.
+
+    Exposes the same bulk upsert entry points as StockDataHelper and
+    HistoricalDataHelper so the persistence stage can be exercised and
+    benchmarked without the production database.
+    """
+
+    def __init__(
+        self, path: str = ":memory:", historical_columns: List[str] = None
+    ) -> None:
+        self.historical_columns = ["symbol", "date"] + (
+            historical_columns or DEFAULT_HISTORICAL_COLUMNS
+        )
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS stocks ({', '.join(STOCK_COLUMNS)}, "
+            "PRIMARY KEY (symbol))"
+        )
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS historical_data "
+            f"({', '.join(self.historical_columns)}, PRIMARY KEY (symbol, date))"
+        )
+        self.connection.commit()
+
+    def upsert(self, table: str, columns: List[str], records: List[Dict]) -> None:
+        placeholders = ", ".join(f":{column}" for column in columns)
+        with self._lock:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({placeholders})",
+                (
+                    (
+                        {**record, "date": str(record["date"])}
+                        if "date" in record
+                        else record
+                    )
+                    for record in records
+                ),
+            )
+            self.connection.commit()
+
+    def persist_bulk_stock_data(self, stock_data: List[Dict]) -> None:
+        self.upsert("stocks", STOCK_COLUMNS, stock_data)
+
+    def persist_bulk_historical_data(self, data: List[Dict]) -> None:
+        self.upsert("historical_data", self.historical_columns, data)
+
+    def sinks(self) -> Dict[str, Callable[[List], None]]:
+        return {
+            STOCK_RECORDS: self.persist_bulk_stock_data,
+            HISTORICAL_RECORDS: self.persist_bulk_historical_data,
+        }
+
+    def count(self, table: str) -> int:
+        with self._lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[
+                0
+            ]
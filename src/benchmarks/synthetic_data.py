@@ -0,0 +1,51 @@
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+
+class SyntheticMarket:
+    """Deterministic random-walk OHLCV data used by the offline benchmarks."""
+
+    @staticmethod
+    def ohlcv_frame(ticker: str, days: int, seed: int = None) -> pd.DataFrame:
+        rng = np.random.default_rng(
+            seed if seed is not None else abs(hash(ticker)) % 2**32
+        )
+        dates = pd.bdate_range(end="2024-12-31", periods=days, name="date")
+        close = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+        open_ = close * (1 + rng.normal(0, 0.005, days))
+        high = np.maximum(open_, close) * (1 + rng.random(days) * 0.01)
+        low = np.minimum(open_, close) * (1 - rng.random(days) * 0.01)
+        volume = rng.integers(10_000, 5_000_000, days)
+        return pd.DataFrame(
+            {
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+            },
+            index=dates,
+        )
+
+    @staticmethod
+    def universe(tickers: int, days: int) -> Dict[str, pd.DataFrame]:
+        return {
+            f"T{number:05d}": SyntheticMarket.ohlcv_frame(
+                f"T{number:05d}", days, seed=number
+            )
+            for number in range(tickers)
+        }
+
+    @staticmethod
+    def ragged_universe(
+        tickers: int, days: int, missing: float = 0.02
+    ) -> Dict[str, pd.DataFrame]:
+        """Universe whose tickers list on different dates and miss some bars."""
+        rng = np.random.default_rng(tickers)
+        frames = SyntheticMarket.universe(tickers=tickers, days=days)
+        for ticker, frame in frames.items():
+            listed = np.arange(len(frame)) >= rng.integers(0, days // 4 + 1)
+            traded = rng.random(len(frame)) >= missing
+            frames[ticker] = frame[listed & traded]
+        return frames
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class TickerStatus(Enum):
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
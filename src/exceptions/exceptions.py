@@ -1,3 +1,6 @@
+from typing import List, Optional
+
+
 class CustomException(Exception):
     def __init__(self, message) -> None:
         self.message = message
@@ -5,5 +8,32 @@ class CustomException(Exception):
 
 
 class HttpErrorException(CustomException):
-    def __init__(self, message):
+    def __init__(
+        self,
+        message,
+        status_code: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ):
+        self.status_code = status_code
+        self.retry_after = retry_after
         super().__init__(message)
+
+    @property
+    def retryable(self) -> bool:
+        # No status code means the request never got a response (timeout, reset)
+        return (
+            self.status_code is None
+            or self.status_code == 429
+            or self.status_code >= 500
+        )
+
+
+class RateLimitException(HttpErrorException):
+    def __init__(self, message, retry_after: Optional[float] = None):
+        super().__init__(message, status_code=429, retry_after=retry_after)
+
+
+class InvalidConfigException(CustomException):
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("Invalid app config: " + "; ".join(errors))
@@ -1,14 +1,121 @@
-from settings.shared import set_app_config, get_app_config
-from stock_analyser.stock_processor import StockAnalyser
-from settings.shared import logger
+import argparse
+import os
+
+from src.exceptions.exceptions import CustomException, InvalidConfigException
+from src.settings.shared import set_app_config, get_app_config
+from src.settings.shared import logger
+
+# Everything else, pandas and requests included, is imported in main() once
+# the config is known to be valid and the run actually needs it.
+
+
+def parse_args(argv: list = None):
+    parser = argparse.ArgumentParser(description="Fetch and persist NASDAQ stock data.")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the latest run, skipping the tickers it already completed.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Split the universe into this many shards, one process each. "
+        "Not combined with --shard-index/--shard-count.",
+    )
+    # Containers of the same image each take one shard, set via the environment
+    parser.add_argument(
+        "--shard-index", type=int, default=int(os.environ.get("SHARD_INDEX", 0))
+    )
+    parser.add_argument(
+        "--shard-count", type=int, default=int(os.environ.get("SHARD_COUNT", 1))
+    )
+    parser.add_argument(
+        "--check-config",
+        action="store_true",
+        help="Validate the config and exit.",
+    )
+    parser.add_argument(
+        "--list-tickers",
+        action="store_true",
+        help="Print the universe of the run, or of its shard, and exit.",
+    )
+    parser.add_argument(
+        "--screen",
+        metavar="RULE",
+        help="Print the tickers matching a SCREENER.RULES name or a rule "
+        "expression on the latest indexed date, and exit.",
+    )
+    args = parser.parse_args(argv)
+    if not 0 <= args.shard_index < args.shard_count:
+        parser.error("--shard-index must be in [0, --shard-count)")
+    # The shards of --processes always cover the whole universe; an argparse
+    # group would miss a shard set via the environment
+    if args.processes > 1 and args.shard_count > 1:
+        parser.error("--processes cannot be combined with --shard-index/--shard-count")
+    return args
+
+
+def list_tickers(app_config: dict) -> list:
+    from src.model.universe_index import UniverseIndex
+    from src.stock_analyser.shard_runner import ShardRunner
+
+    universe = UniverseIndex.get_index(app_config)
+    if universe is not None and not universe.is_stale():
+        stock_list = universe.select()
+    else:
+        from src.services.data_collector import DataCollector
+
+        stock_list = DataCollector.fetch_nasdaq_tickers_list(
+            app_config=app_config, universe=universe
+        )
+    if universe is not None:
+        universe.close()
+    return ShardRunner.select_shard(stock_list or [], app_config)
 
 
 def main():
+    args = parse_args()
     logger.info("Start processing")
-    set_app_config()
+    try:
+        set_app_config()
+    except InvalidConfigException as error:
+        logger.error(str(error))
+        raise SystemExit(2)
+    if args.check_config:
+        logger.info("Config is valid.")
+        return
     app_config = get_app_config()
+
+    if args.screen:
+        from src.services.screener import Screener
+
+        try:
+            print("\n".join(Screener.get_screener(app_config).latest(args.screen)))
+        except CustomException as error:
+            logger.error(str(error))
+            raise SystemExit(1)
+        return
+
+    from src.stock_analyser.shard_runner import ShardRunner
+
+    shard_config = ShardRunner.shard_config(
+        app_config, shard_index=args.shard_index, shard_count=args.shard_count
+    )
+    if args.list_tickers:
+        print("\n".join(list_tickers(shard_config)))
+        return
+
+    if args.processes > 1:
+        ShardRunner.run(
+            app_config=app_config, processes=args.processes, resume=args.resume
+        )
+        return
+
+    from src.stock_analyser.stock_processor import StockAnalyser
+
     analyser = StockAnalyser()
-    analyser.start_process(app_config=app_config)
+    analyser.start_process(app_config=shard_config, resume=args.resume)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+from typing import Dict
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ["open", "high", "low", "close"]
+VOLUME_COLUMN = "volume"
+INDICATOR_COLUMNS = [
+    "sma_50",
+    "sma_200",
+    "rsi",
+    "ema",
+    "adx",
+    "wma",
+    "dema",
+    "tema",
+    "williams",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+    "bollinger_upper",
+    "bollinger_middle",
+    "bollinger_lower",
+]
+FRAME_COLUMNS = PRICE_COLUMNS + [VOLUME_COLUMN] + INDICATOR_COLUMNS
+# Prices keep float64 so stored quotes round-trip exactly; indicators are
+# derived values whose float32 error (~1e-7 relative) is far below their noise
+FRAME_DTYPES = {
+    **{column: "float64" for column in PRICE_COLUMNS},
+    VOLUME_COLUMN: "int64",
+    **{column: "float32" for column in INDICATOR_COLUMNS},
+}
+SYMBOL_COLUMN = "symbol"
+
+
+class FrameSchema:
+    """Canonical layout of the merged per-ticker frame.
+
+    Every frame leaving DataCollector has exactly FRAME_COLUMNS, in that
+    order, with FRAME_DTYPES and a datetime64[ns] index named `date`. Columns
+    the source does not provide are present as NaN; anything else, such as
+    the leftover FMP fields, is dropped.
+    """
+
+    @staticmethod
+    def conform(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Returns `df` in the canonical column set, order and dtypes.
+
+        Args:
+            df (pd.DataFrame): Merged OHLCV and indicator frame indexed by date.
+
+        Returns:
+            pd.DataFrame: New frame; indicators are computed in float64 upstream
+            and only narrowed here.
+        """
+        frame = df.reindex(columns=FRAME_COLUMNS)
+        frame[VOLUME_COLUMN] = frame[VOLUME_COLUMN].fillna(0)
+        frame = frame.astype(FRAME_DTYPES)
+        frame.index = pd.DatetimeIndex(frame.index, name="date").as_unit("ns")
+        return frame
+
+    @staticmethod
+    def universe_frame(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Stacks conformed per-ticker frames into one long frame.
+
+        Args:
+            frames (Dict[str, pd.DataFrame]): Conformed frame per ticker.
+
+        Returns:
+            pd.DataFrame: Rows of all tickers indexed by date, with a
+            categorical `symbol` column (one small code per row instead of a
+            Python string).
+        """
+        symbols = sorted(frames)
+        if not symbols:
+            return pd.DataFrame(columns=[SYMBOL_COLUMN] + FRAME_COLUMNS).astype(
+                FRAME_DTYPES
+            )
+
+        df = pd.concat([frames[symbol] for symbol in symbols])
+        codes = np.repeat(
+            np.arange(len(symbols), dtype=np.int32),
+            [len(frames[symbol]) for symbol in symbols],
+        )
+        df.insert(
+            0,
+            SYMBOL_COLUMN,
+            pd.Categorical.from_codes(codes, categories=symbols),
+        )
+        return df
@@ -0,0 +1,169 @@
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Set
+
+from src.settings.shared import logger
+from src.utils.metrics import Metrics
+
+STOCK_RECORDS = "stock"
+HISTORICAL_RECORDS = "historical"
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_HISTORICAL_COLUMNS = [
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "sma_50",
+    "sma_200",
+    "rsi",
+    "macd",
+    "ema",
+    "adx",
+    "wma",
+    "dema",
+    "tema",
+    "williams",
+    "bollinger_upper",
+    "bollinger_lower",
+]
+_STOP = object()
+_CHECKPOINT = object()
+
+
+class PersistenceWriter:
+    """Dedicated thread that upserts records in chunks, fed by a bounded queue.
+
+    Fetch workers hand over records with `submit` and go back to the network
+    while this thread writes, so fetching and database writes overlap. When the
+    writer falls behind, the full queue makes `submit` block and slows the
+    producers down instead of buffering without limit.
+
+    Configured by the PERSISTENCE section: CHUNK_SIZE, QUEUE_SIZE and
+    HISTORICAL_COLUMNS. `sinks` maps a record kind to the bulk function that
+    stores it, the stock_analyser_lib repositories by default.
+
+    The symbols of every chunk a sink rejected are kept in `failed_symbols`
+    and handed to each checkpoint, so nothing of them is reported as stored.
+    """
+
+    def __init__(
+        self, app_config: Dict = None, sinks: Dict[str, Callable[[List], None]] = None
+    ) -> None:
+        persistence_config = (app_config or {}).get("PERSISTENCE", {})
+        self.chunk_size = persistence_config.get("CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+        self.historical_columns = persistence_config.get(
+            "HISTORICAL_COLUMNS", DEFAULT_HISTORICAL_COLUMNS
+        )
+        if not sinks:
+            # stock_analyser_lib and its database driver load only when needed
+            from src.model.persistor import StockDataHelper, HistoricalDataHelper
+
+            sinks = {
+                STOCK_RECORDS: StockDataHelper.persist_bulk_stock_data,
+                HISTORICAL_RECORDS: HistoricalDataHelper.persist_bulk_historical_data,
+            }
+        self.sinks = sinks
+        self.queue = queue.Queue(
+            maxsize=persistence_config.get("QUEUE_SIZE", DEFAULT_QUEUE_SIZE)
+        )
+        self.buffers = {kind: [] for kind in self.sinks}
+        self.stats = {"rows": 0, "failed_rows": 0, "chunks": 0, "write_seconds": 0.0}
+        self.failed_symbols: Set[str] = set()
+        self.thread = threading.Thread(
+            target=self.run, name="persistence-writer", daemon=True
+        )
+
+    def __enter__(self) -> "PersistenceWriter":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self.thread.start()
+
+    def submit(self, kind: str, records: List[Dict]) -> None:
+        if records:
+            self.queue.put((kind, records))
+
+    def checkpoint(self, callback: Callable[[Set[str]], None]) -> None:
+        """Call `callback` on the writer thread once everything submitted so
+        far has been written, flushing partial chunks if needed. It receives
+        the symbols of the chunks that failed to persist so far."""
+        self.queue.put((_CHECKPOINT, callback))
+
+    def close(self) -> None:
+        """Flush everything still queued and stop the writer thread."""
+        self.queue.put(_STOP)
+        self.thread.join()
+        self.elapsed = time.perf_counter() - self.started_at
+        self.log_stats()
+
+    def run(self) -> None:
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                for kind in self.buffers:
+                    self.flush(kind, force=True)
+                return
+            kind, records = item
+            if kind is _CHECKPOINT:
+                for buffered_kind in self.buffers:
+                    self.flush(buffered_kind, force=True)
+                self.run_checkpoint(records)
+                continue
+            self.buffers[kind].extend(records)
+            self.flush(kind)
+
+    def run_checkpoint(self, callback: Callable[[Set[str]], None]) -> None:
+        try:
+            callback(set(self.failed_symbols))
+        except Exception as error:
+            logger.error(f"Persistence checkpoint failed. Reason {error}")
+
+    def flush(self, kind: str, force: bool = False) -> None:
+        buffer = self.buffers[kind]
+        while len(buffer) >= self.chunk_size or (force and buffer):
+            chunk = buffer[: self.chunk_size]
+            del buffer[: self.chunk_size]
+            self.write(kind, chunk)
+
+    def write(self, kind: str, chunk: List[Dict]) -> None:
+        start_time = time.perf_counter()
+        try:
+            self.sinks[kind](chunk)
+            self.stats["rows"] += len(chunk)
+            self.stats["chunks"] += 1
+            Metrics.increment("persisted_rows_total", len(chunk), kind=kind)
+        except Exception as error:
+            self.stats["failed_rows"] += len(chunk)
+            self.failed_symbols.update(record.get("symbol") for record in chunk)
+            Metrics.increment("persist_failed_rows_total", len(chunk), kind=kind)
+            logger.error(f"Failed to persist {len(chunk)} {kind} rows. Reason {error}")
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self.stats["write_seconds"] += elapsed
+            Metrics.observe("stage_seconds", elapsed, stage="persist", kind=kind)
+
+    def get_stats(self) -> Dict:
+        write_seconds = self.stats["write_seconds"]
+        return {
+            **self.stats,
+            "rows_per_second": (
+                self.stats["rows"] / write_seconds if write_seconds else 0.0
+            ),
+        }
+
+    def log_stats(self) -> None:
+        stats = self.get_stats()
+        logger.info(
+            f"Persisted {stats['rows']} rows in {stats['chunks']} chunks "
+            f"({stats['failed_rows']} failed). "
+            f"{stats['rows_per_second']:.0f} rows/s while writing, "
+            f"{stats['write_seconds']:.2f}s writing over {self.elapsed:.2f}s total."
+        )
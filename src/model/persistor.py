@@ -1,8 +1,13 @@
+from datetime import date
+from typing import Optional
+
 from stock_analyser_lib.repositories.stock_repo import StockRepository
 from stock_analyser_lib.repositories.historical_data_repo import (
     HistoricalDataRepository,
 )
 
+from src.settings.shared import logger
+
 
 class StockDataHelper:
     @staticmethod
@@ -15,6 +20,8 @@ class StockDataHelper:
 
 
 class HistoricalDataHelper:
+    _warned_latest_date = False
+
     @staticmethod
     def persist_historical_data(data: dict):
         HistoricalDataRepository.add_historical_data(**data)
@@ -22,3 +29,29 @@ class HistoricalDataHelper:
     @staticmethod
     def persist_bulk_historical_data(data: list):
         HistoricalDataRepository.bulk_upsert_historical_data(data)
+
+    @staticmethod
+    def supports_latest_date() -> bool:
+        """
+        Whether the repository can tell the latest stored date of a symbol.
+
+        HistoricalDataRepository.get_latest_date is not part of every
+        stock_analyser_lib release (the pinned 0.0.10 lacks it); incremental
+        runs then take the last date of the warm-up window instead.
+        """
+        supported = hasattr(HistoricalDataRepository, "get_latest_date")
+        if not supported and not HistoricalDataHelper._warned_latest_date:
+            HistoricalDataHelper._warned_latest_date = True
+            logger.warning(
+                "stock_analyser_lib has no HistoricalDataRepository."
+                "get_latest_date; incremental runs start after the last bar of "
+                "the warm-up windows."
+            )
+        return supported
+
+    @staticmethod
+    def get_latest_date(symbol: str) -> Optional[date]:
+        """Date of the most recent bar persisted for `symbol`, if any."""
+        if not HistoricalDataHelper.supports_latest_date():
+            return None
+        return HistoricalDataRepository.get_latest_date(symbol=symbol)
@@ -0,0 +1,164 @@
+import os
+import threading
+from typing import Dict, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.model.frame_schema import FRAME_COLUMNS, FRAME_DTYPES, FrameSchema
+from src.settings.shared import logger
+from src.utils.metrics import Metrics
+
+DEFAULT_SNAPSHOT_PATH = "data/snapshots"
+SNAPSHOT_COLUMNS = FRAME_COLUMNS
+ARROW_TYPES = {"float32": pa.float32(), "float64": pa.float64(), "int64": pa.int64()}
+PARTITIONING = ds.partitioning(
+    pa.schema([("symbol", pa.string()), ("year", pa.int32())]), flavor="hive"
+)
+
+
+class SnapshotStore:
+    """Columnar Parquet store of the merged historical and indicator frames.
+
+    Files are partitioned by symbol and year (hive layout, e.g.
+    symbol=AAPL/year=2024/part-0.parquet) under SNAPSHOT.PATH, so a read for a
+    few symbols or a date range only opens the matching partitions and skips
+    row groups using the date statistics.
+    """
+
+    def __init__(self, app_config: Dict = None) -> None:
+        snapshot_config = (app_config or {}).get("SNAPSHOT", {})
+        self.path = snapshot_config.get("PATH", DEFAULT_SNAPSHOT_PATH)
+        self.schema = pa.schema(
+            [("date", pa.timestamp("ns"))]
+            + [
+                (column, ARROW_TYPES[FRAME_DTYPES[column]])
+                for column in SNAPSHOT_COLUMNS
+            ]
+            + [("symbol", pa.string()), ("year", pa.int32())]
+        )
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def lock_for(self, ticker: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(ticker, threading.Lock())
+
+    def to_table(self, ticker: str, df: pd.DataFrame) -> pa.Table:
+        frame = FrameSchema.conform(df)
+        frame.insert(0, "date", frame.index)
+        frame["symbol"] = ticker
+        frame["year"] = frame["date"].dt.year.astype("int32")
+        return pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False)
+
+    def write(self, ticker: str, df: pd.DataFrame) -> None:
+        """
+        Writes the merged frame of one ticker, replacing the rows of the same dates.
+
+        Year partitions touched by `df` are merged with what is already stored,
+        so an incremental run that only brings the latest days keeps the
+        earlier days of the year.
+        """
+        if df is None or df.empty:
+            return
+        table = self.to_table(ticker, df)
+        years = pc.unique(table["year"]).to_pylist()
+
+        with self.lock_for(ticker), Metrics.timer("snapshot_write"):
+            existing = self.read_ticker(ticker, years=years)
+            if not existing.empty:
+                existing = existing[~existing.index.isin(df.index)]
+                table = pa.concat_tables(
+                    [self.to_table(ticker, existing), table]
+                ).sort_by("date")
+
+            ds.write_dataset(
+                table,
+                self.path,
+                format="parquet",
+                partitioning=PARTITIONING,
+                existing_data_behavior="delete_matching",
+                basename_template="part-{i}.parquet",
+            )
+
+    def read_ticker(self, ticker: str, years: List[int]) -> pd.DataFrame:
+        """Stored rows of one ticker, reading only its own partition directory.
+
+        Other tickers may be written concurrently, so the dataset root is not
+        scanned here.
+        """
+        ticker_path = os.path.join(self.path, f"symbol={ticker}")
+        if not os.path.isdir(ticker_path):
+            return pd.DataFrame()
+        table = pq.read_table(
+            ticker_path,
+            filters=[("year", "in", list(years))],
+            partitioning=ds.partitioning(
+                pa.schema([("year", pa.int32())]), flavor="hive"
+            ),
+            memory_map=True,
+        )
+        return table.to_pandas().drop(columns="year").set_index("date")
+
+    def read(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        symbols: List[str] = None,
+        columns: List[str] = None,
+        years: List[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Loads snapshots with predicate pushdown on symbol and date.
+
+        Args:
+            start_date (str): First date to load, inclusive.
+            end_date (str): Last date to load, inclusive.
+            symbols (List[str]): Symbols to load, all when omitted.
+            columns (List[str]): Value columns to load, all when omitted.
+            years (List[int]): Year partitions to load, derived from the dates
+                when omitted.
+
+        Returns:
+            pd.DataFrame: Rows indexed by date with a categorical `symbol` column.
+        """
+        if not os.path.isdir(self.path):
+            return pd.DataFrame()
+
+        filters = []
+        if symbols:
+            filters.append(("symbol", "in", list(symbols)))
+        if years:
+            filters.append(("year", "in", list(years)))
+        if start_date:
+            filters.append(("year", ">=", pd.Timestamp(start_date).year))
+            filters.append(("date", ">=", pd.Timestamp(start_date)))
+        if end_date:
+            filters.append(("year", "<=", pd.Timestamp(end_date).year))
+            filters.append(("date", "<=", pd.Timestamp(end_date)))
+
+        try:
+            table = pq.read_table(
+                self.path,
+                columns=(
+                    ["date", "symbol"] + list(columns) if columns is not None else None
+                ),
+                filters=filters or None,
+                partitioning=PARTITIONING,
+                # Known up front, so no file is opened to infer it and the
+                # filters prune partitions before any is read
+                schema=self.schema,
+                memory_map=True,
+            )
+        except (FileNotFoundError, pa.ArrowInvalid) as error:
+            logger.warning(f"No snapshot data could be read from {self.path}: {error}")
+            return pd.DataFrame()
+
+        df = table.to_pandas()
+        if "year" in df.columns:
+            df.drop(columns="year", inplace=True)
+        df["symbol"] = df["symbol"].astype(str).astype("category")
+        return df.set_index("date").sort_index()
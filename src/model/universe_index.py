@@ -0,0 +1,303 @@
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from src.exceptions.exceptions import CustomException
+from src.settings.shared import logger
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_UNIVERSE_PATH = "state/universe.sqlite"
+DEFAULT_REFRESH_SECONDS = 24 * 3600
+DEFAULT_EXCHANGE = "NASDAQ"
+# Share of the active symbols a single refresh may delist
+DEFAULT_MAX_SHRINK = 0.2
+# About a month of sessions
+ACTIVITY_WINDOW_BARS = 20
+
+
+@dataclass
+class UniverseDiff:
+    version: int
+    listed: List[str] = field(default_factory=list)
+    delisted: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.listed or self.delisted)
+
+
+class UniverseIndex:
+    """Local, versioned index of the FMP ticker universe.
+
+    Configured by the UNIVERSE section: ENABLED, PATH, REFRESH_SECONDS and the
+    selection criteria EXCHANGE, TYPES, MIN_PRICE and MIN_VOLUME. The
+    /stock/list payload is only downloaded when the latest version is older
+    than REFRESH_SECONDS; a run otherwise selects its tickers with an indexed
+    query on exchange, type and activity.
+
+    Every refresh that lists or delists a symbol creates a new version and
+    records the changes, so a run can tell new listings and delistings apart
+    from the rest of the universe. Activity is the average daily volume,
+    taken from the payload when it carries one and otherwise from the bars
+    fetched by the runs themselves.
+
+    A payload without any valid entry, or one that would delist more than
+    MAX_SHRINK of the active symbols at once, is rejected and the previous
+    version stays in use, so a truncated or broken /stock/list response
+    never empties the universe.
+    """
+
+    def __init__(self, app_config: Dict = None) -> None:
+        universe_config = (app_config or {}).get("UNIVERSE", {})
+        self.path = universe_config.get("PATH", DEFAULT_UNIVERSE_PATH)
+        self.refresh_seconds = universe_config.get(
+            "REFRESH_SECONDS", DEFAULT_REFRESH_SECONDS
+        )
+        self.exchange = universe_config.get("EXCHANGE", DEFAULT_EXCHANGE)
+        self.types = universe_config.get("TYPES")
+        self.min_price = universe_config.get("MIN_PRICE")
+        self.min_volume = universe_config.get("MIN_VOLUME")
+        self.max_shrink = universe_config.get("MAX_SHRINK", DEFAULT_MAX_SHRINK)
+        self.pending_volumes: Dict[str, float] = {}
+        self.diff: Optional[UniverseDiff] = None
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit, so refresh can take the write lock up front with
+        # BEGIN IMMEDIATE when several shard processes share the file
+        self.connection = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS versions (
+                version INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at REAL NOT NULL,
+                refreshed_at REAL NOT NULL,
+                total INTEGER NOT NULL,
+                listed INTEGER NOT NULL,
+                delisted INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tickers (
+                symbol TEXT PRIMARY KEY,
+                name TEXT,
+                exchange TEXT,
+                exchange_short_name TEXT,
+                type TEXT,
+                price REAL,
+                volume REAL,
+                listed_version INTEGER NOT NULL,
+                delisted_version INTEGER
+            );
+            CREATE INDEX IF NOT EXISTS tickers_selection
+                ON tickers (exchange_short_name, type, delisted_version, volume);
+            CREATE TABLE IF NOT EXISTS changes (
+                version INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                change TEXT NOT NULL,
+                PRIMARY KEY (version, symbol)
+            );
+            """)
+
+    @staticmethod
+    def get_index(app_config: Dict) -> Optional["UniverseIndex"]:
+        """Index for the run, or None when UNIVERSE.ENABLED is false."""
+        if not app_config.get("UNIVERSE", {}).get("ENABLED", True):
+            return None
+        return UniverseIndex(app_config)
+
+    def latest_version(self) -> Optional[tuple]:
+        with self._lock:
+            return self.connection.execute(
+                "SELECT version, refreshed_at FROM versions "
+                "ORDER BY version DESC LIMIT 1"
+            ).fetchone()
+
+    def is_stale(self) -> bool:
+        latest = self.latest_version()
+        return latest is None or time.time() - latest[1] >= self.refresh_seconds
+
+    def refresh(self, payload: List[Dict]) -> UniverseDiff:
+        """
+        Loads a /stock/list payload into the index.
+
+        Args:
+            payload (List[Dict]): Entries with symbol, name, price, exchange,
+                exchangeShortName, type and optionally volume.
+
+        Returns:
+            UniverseDiff: Symbols listed and delisted since the previous
+            version; the version is unchanged when neither happened.
+
+        Raises:
+            CustomException: When the payload has no valid entry or would
+                delist more than MAX_SHRINK of the universe; nothing is stored.
+        """
+        now = time.time()
+        entries = {
+            entry["symbol"]: entry
+            for entry in (payload if isinstance(payload, list) else [])
+            if isinstance(entry, dict)
+            and isinstance(entry.get("symbol"), str)
+            and entry["symbol"]
+        }
+        if not entries:
+            raise CustomException(
+                message="The /stock/list payload has no entry with a symbol."
+            )
+        with self._lock:
+            connection = self.connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                active = {
+                    row[0]
+                    for row in connection.execute(
+                        "SELECT symbol FROM tickers WHERE delisted_version IS NULL"
+                    )
+                }
+                latest = connection.execute(
+                    "SELECT MAX(version) FROM versions"
+                ).fetchone()[0]
+                listed = sorted(set(entries) - active)
+                delisted = sorted(active - set(entries))
+                if active and len(delisted) > self.max_shrink * len(active):
+                    raise CustomException(
+                        message=f"The /stock/list payload would delist "
+                        f"{len(delisted)} of {len(active)} symbols, more than "
+                        f"UNIVERSE.MAX_SHRINK = {self.max_shrink}."
+                    )
+
+                version = latest
+                if latest is None or listed or delisted:
+                    version = connection.execute(
+                        "INSERT INTO versions "
+                        "(created_at, refreshed_at, total, listed, delisted) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (now, now, len(entries), len(listed), len(delisted)),
+                    ).lastrowid
+                else:
+                    connection.execute(
+                        "UPDATE versions SET refreshed_at = ? WHERE version = ?",
+                        (now, version),
+                    )
+
+                connection.executemany(
+                    """
+                    INSERT INTO tickers (symbol, name, exchange, exchange_short_name,
+                        type, price, volume, listed_version)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (symbol) DO UPDATE SET
+                        name = excluded.name,
+                        exchange = excluded.exchange,
+                        exchange_short_name = excluded.exchange_short_name,
+                        type = excluded.type,
+                        price = excluded.price,
+                        volume = COALESCE(excluded.volume, volume),
+                        listed_version = CASE WHEN delisted_version IS NULL
+                            THEN listed_version ELSE excluded.listed_version END,
+                        delisted_version = NULL
+                    """,
+                    [
+                        (
+                            symbol,
+                            entry.get("name"),
+                            entry.get("exchange"),
+                            entry.get("exchangeShortName"),
+                            entry.get("type"),
+                            entry.get("price"),
+                            entry.get("volume"),
+                            version,
+                        )
+                        for symbol, entry in entries.items()
+                    ],
+                )
+                connection.executemany(
+                    "UPDATE tickers SET delisted_version = ? WHERE symbol = ?",
+                    [(version, symbol) for symbol in delisted],
+                )
+                connection.executemany(
+                    "INSERT OR REPLACE INTO changes (version, symbol, change) "
+                    "VALUES (?, ?, ?)",
+                    [(version, symbol, "listed") for symbol in listed]
+                    + [(version, symbol, "delisted") for symbol in delisted],
+                )
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+
+        diff = UniverseDiff(version=version, listed=listed, delisted=delisted)
+        if latest is None:
+            logger.info(
+                f"Universe index created at version {version} "
+                f"with {len(entries)} tickers."
+            )
+            # The first version lists everything, which is not news to a run
+            diff.listed = []
+        elif diff.changed:
+            logger.info(
+                f"Universe index moved to version {version}: "
+                f"{len(listed)} new listings, {len(delisted)} delistings."
+            )
+        self.diff = diff
+        return diff
+
+    def select(self) -> List[str]:
+        """
+        Active symbols matching EXCHANGE, TYPES, MIN_PRICE and MIN_VOLUME.
+
+        Symbols without a known volume pass MIN_VOLUME, so they are fetched
+        once and measured instead of being excluded forever.
+        """
+        clauses = ["delisted_version IS NULL"]
+        parameters: List = []
+        if self.exchange:
+            clauses.append("exchange_short_name = ?")
+            parameters.append(self.exchange)
+        if self.types:
+            clauses.append(f"type IN ({', '.join('?' for _ in self.types)})")
+            parameters.extend(self.types)
+        if self.min_price is not None:
+            clauses.append("price >= ?")
+            parameters.append(self.min_price)
+        if self.min_volume is not None:
+            clauses.append("(volume IS NULL OR volume >= ?)")
+            parameters.append(self.min_volume)
+
+        with self._lock:
+            return [
+                row[0]
+                for row in self.connection.execute(
+                    f"SELECT symbol FROM tickers WHERE {' AND '.join(clauses)} "
+                    "ORDER BY symbol",
+                    parameters,
+                )
+            ]
+
+    def observe(self, ticker: str, df: Optional["pd.DataFrame"]) -> None:
+        """Remember the average daily volume of the latest bars of a ticker."""
+        if df is None or df.empty:
+            return
+        volume = float(df["volume"].tail(ACTIVITY_WINDOW_BARS).mean())
+        with self._lock:
+            self.pending_volumes[ticker] = volume
+
+    def close(self) -> None:
+        """Store the observed volumes and close the connection."""
+        with self._lock:
+            volumes, self.pending_volumes = self.pending_volumes, {}
+            if volumes:
+                self.connection.execute("BEGIN IMMEDIATE")
+                self.connection.executemany(
+                    "UPDATE tickers SET volume = ? WHERE symbol = ?",
+                    [(volume, ticker) for ticker, volume in volumes.items()],
+                )
+                self.connection.execute("COMMIT")
+            self.connection.close()
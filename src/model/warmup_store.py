@@ -0,0 +1,65 @@
+import math
+import os
+from typing import Dict, Optional
+import pandas as pd
+
+from src.settings.shared import logger
+
+DEFAULT_STATE_DIR = "state/warmup"
+# 500 bars cover sma_200 exactly and let EMA/Wilder state from before the
+# window decay below float precision for periods up to ~30
+DEFAULT_WARMUP_BARS = 500
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+# About 252 trading days a year, plus a week of margin for holidays
+TRADING_DAYS_PER_YEAR = 252
+
+
+class WarmupStore:
+    """Per-ticker tail of processed OHLCV bars, used to extend indicators.
+
+    Configured by INCREMENTAL.STATE_DIR and INCREMENTAL.WARMUP_BARS. One CSV
+    file per ticker holds the latest bars so an incremental run only fetches
+    new days yet computes rolling and exponential indicators as if the full
+    history had been downloaded.
+
+    STATE_DIR must be on a volume that outlives the container (the image
+    declares /app/state as one). When a window is lost anyway, the next
+    incremental run refetches the last `calendar_days` to rebuild it instead
+    of the full history.
+    """
+
+    def __init__(self, app_config: Dict = None) -> None:
+        incremental_config = (app_config or {}).get("INCREMENTAL", {})
+        self.state_dir = incremental_config.get("STATE_DIR", DEFAULT_STATE_DIR)
+        self.warmup_bars = incremental_config.get("WARMUP_BARS", DEFAULT_WARMUP_BARS)
+
+    def calendar_days(self) -> int:
+        """Calendar days that hold at least WARMUP_BARS trading days."""
+        return math.ceil(self.warmup_bars * 365 / TRADING_DAYS_PER_YEAR) + 7
+
+    def path_for(self, ticker: str) -> str:
+        return os.path.join(self.state_dir, f"{ticker}.csv")
+
+    def load(self, ticker: str) -> Optional[pd.DataFrame]:
+        path = self.path_for(ticker)
+        if not os.path.exists(path):
+            return None
+        try:
+            return pd.read_csv(path, index_col="date", parse_dates=["date"])
+        except (OSError, ValueError) as error:
+            logger.warning(f"Ignoring unreadable warm-up window of {ticker}: {error}")
+            return None
+
+    def save(
+        self, ticker: str, df: pd.DataFrame, previous: pd.DataFrame = None
+    ) -> None:
+        bars = df[OHLCV_COLUMNS]
+        if previous is not None:
+            bars = pd.concat([previous[OHLCV_COLUMNS], bars])
+        bars = bars[~bars.index.duplicated(keep="last")].tail(self.warmup_bars)
+
+        os.makedirs(self.state_dir, exist_ok=True)
+        path = self.path_for(ticker)
+        # Write then rename so a crash never leaves a truncated window behind
+        bars.to_csv(f"{path}.tmp", index_label="date")
+        os.replace(f"{path}.tmp", path)
@@ -0,0 +1,257 @@
+import asyncio
+from typing import Dict, List, Optional
+import pandas as pd
+
+from src.exceptions.exceptions import HttpErrorException, CustomException
+from src.model.universe_index import UniverseIndex
+from src.settings.shared import logger
+from src.services.data_collector import DataCollector
+from src.services.helper import HelperMethods
+from src.services.ohlcv_parser import OhlcvParser
+from src.services.profile_batcher import ProfileBatcher, AsyncProfileBatcher
+from src.services.technical_indicators import (
+    TechnicalIndicators,
+    INDICATORS_TO_FETCH,
+)
+from src.utils.async_apis_call_handler import AsyncApisHandler
+from src.utils.metrics import Metrics
+
+
+class AsyncTechnicalIndicators:
+    """asyncio variant of the fetching half of TechnicalIndicators."""
+
+    @staticmethod
+    async def get_ohlcv_data(
+        client: AsyncApisHandler,
+        base_url: str,
+        ticker: str,
+        api_token: str,
+        date_range: str = None,
+    ) -> List:
+        historical_url = TechnicalIndicators.build_ohlcv_url(
+            base_url, ticker, api_token, date_range
+        )
+        historical_response = await client.get(url=historical_url)
+        return TechnicalIndicators.parse_ohlcv_response(ticker, historical_response)
+
+    @staticmethod
+    async def get_ohlcv_frame(
+        client: AsyncApisHandler,
+        base_url: str,
+        ticker: str,
+        api_token: str,
+        date_range: str = None,
+    ) -> pd.DataFrame:
+        """Counterpart of TechnicalIndicators.get_ohlcv_frame.
+
+        The raw body is parsed with OhlcvParser.from_bytes, which only streams
+        bodies too large to decode whole.
+        """
+        historical_url = TechnicalIndicators.build_ohlcv_url(
+            base_url, ticker, api_token, date_range
+        )
+        body = await client.get_body(url=historical_url)
+        try:
+            with Metrics.timer("ohlcv_parse"):
+                df = OhlcvParser.from_bytes(body)
+        except Exception as error:
+            raise CustomException(
+                message=f"Reading historical data of {ticker} failed, reason {error}"
+            ) from error
+        if df.empty:
+            logger.error(f"No historical data found for {ticker}")
+        return df
+
+    @staticmethod
+    async def get_tech_indicator_data(
+        client: AsyncApisHandler,
+        base_url: str,
+        ticker: str,
+        api_token: str,
+        date_range: str = None,
+        indicator_type: str = None,
+    ) -> List:
+        try:
+            url = TechnicalIndicators.build_indicator_url(
+                base_url, ticker, api_token, date_range, indicator_type
+            )
+            indicator_data = await client.get(url=url)
+            if not indicator_data:
+                logger.error(f"No {indicator_type} data found for {ticker}")
+                return []
+            return indicator_data
+        except HttpErrorException as http_error:
+            logger.error(
+                f"Failed to fetch {indicator_type} data for {ticker}. HTTP Error: {http_error}"
+            )
+        except CustomException as error:
+            logger.error(
+                f"Failed to fetch {indicator_type} data for {ticker}. Error: {error}"
+            )
+        return []
+
+    @staticmethod
+    async def fetch_all_technical_indicator(
+        client: AsyncApisHandler,
+        base_url: str,
+        ticker: str,
+        api_token: str,
+        date_range: str = None,
+    ) -> pd.DataFrame:
+        results = await asyncio.gather(
+            *(
+                AsyncTechnicalIndicators.get_tech_indicator_data(
+                    client,
+                    base_url=base_url,
+                    ticker=ticker,
+                    api_token=api_token,
+                    date_range=date_range,
+                    indicator_type=indicator.value,
+                )
+                for indicator in INDICATORS_TO_FETCH.values()
+            ),
+            return_exceptions=True,
+        )
+
+        indicators = {}
+        for name, result in zip(INDICATORS_TO_FETCH, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Failed to fetch {name} data for {ticker}. Error: {result}"
+                )
+                result = []
+            indicators[name] = result
+
+        with Metrics.timer("indicators_merge"):
+            df = HelperMethods.merge_indicator_data(indicators)
+        if df.empty:
+            logger.warning(f"No technical indicators found for {ticker}.")
+            return df
+        logger.info(f"Successfully fetched technical indicators for {ticker}.")
+        return df
+
+
+class AsyncDataCollector:
+    """asyncio variant of DataCollector with the same return shapes.
+
+    Selected by PROCESSING.ENGINE = "asyncio"; every method takes the
+    AsyncApisHandler of the run as its first argument.
+    """
+
+    @staticmethod
+    async def fetch_nasdaq_tickers_list(
+        client: AsyncApisHandler,
+        app_config: Dict = None,
+        universe: Optional[UniverseIndex] = None,
+    ) -> Optional[List[str]]:
+        if universe is not None and not universe.is_stale():
+            return DataCollector.select_universe(universe)
+
+        fmp_config = app_config.get("API_KEYS", {}).get("FMP", {})
+
+        url = f"{fmp_config.get('URL')}/stock/list?apikey={fmp_config.get('API_TOKEN')}"
+
+        tickers = None
+        try:
+            tickers = await client.get(url=url)
+            logger.info("Fetched NASDAQ tickers successfully.")
+        except HttpErrorException as http_error:
+            logger.error(f"Fetch nasdaq tickers failed. Http Error Reason {http_error}")
+        except CustomException as error:
+            logger.error(f"Fetch nasdaq tickers failed. Reason {error}")
+
+        return DataCollector.build_universe(tickers=tickers, universe=universe)
+
+    @staticmethod
+    async def fetch_stock_metadata(
+        client: AsyncApisHandler,
+        ticker: str,
+        app_config: Dict = None,
+        profile_batcher: Optional[AsyncProfileBatcher] = None,
+    ) -> Optional[Dict]:
+        ticker_data = None
+        try:
+            if profile_batcher is not None:
+                ticker_data = await profile_batcher.get(client, ticker)
+            else:
+                url = ProfileBatcher.build_profile_url(app_config, [ticker])
+                ticker_data = await client.get(url=url)
+        except HttpErrorException as http_error:
+            logger.error(f"Fetch Ticker financial data. Http Error Reason {http_error}")
+            raise
+        except CustomException as error:
+            logger.error(f"Fetch Ticker financial data failed. Reason {error}")
+            raise
+
+        return DataCollector.build_stock_metadata(
+            ticker=ticker, ticker_data=ticker_data
+        )
+
+    @staticmethod
+    async def fetch_historical_and_technical_indicators(
+        client: AsyncApisHandler,
+        app_config: Dict,
+        ticker: str,
+        start_date: str = None,
+        end_date: str = None,
+        warmup: pd.DataFrame = None,
+    ) -> Optional[pd.DataFrame]:
+        fmp_config = app_config.get("API_KEYS", {}).get("FMP", {})
+        base_url = fmp_config.get("URL")
+        api_token = fmp_config.get("API_TOKEN")
+        date_range = DataCollector.build_date_range(start_date, end_date)
+
+        logger.info(f"Get historical data for ticker {ticker} ...")
+        try:
+            ohlcv = await AsyncTechnicalIndicators.get_ohlcv_frame(
+                client,
+                base_url=base_url,
+                ticker=ticker,
+                api_token=api_token,
+                date_range=date_range,
+            )
+
+            df = DataCollector.build_ohlcv_frame(
+                ticker=ticker, ohlcv=ohlcv, warmup=warmup, app_config=app_config
+            )
+            if df is None:
+                return None
+
+            if DataCollector.uses_local_indicators(app_config):
+                indicators_df = TechnicalIndicators.compute_local_indicators(
+                    df, app_config=app_config
+                )
+                return DataCollector.finalize_frame(
+                    HelperMethods.join_indicators(df, indicators_df), warmup
+                )
+
+            indicators_df = (
+                await AsyncTechnicalIndicators.fetch_all_technical_indicator(
+                    client, base_url, ticker, api_token, date_range
+                )
+            )
+            if indicators_df.empty:
+                logger.warning(
+                    f"No technical indicators found for {ticker}. Using only OHLCV data."
+                )
+                return DataCollector.finalize_frame(df, warmup)
+
+            merged_df = DataCollector.finalize_frame(
+                HelperMethods.join_indicators(df, indicators_df), warmup
+            )
+
+            logger.info(
+                f"Fetched and formatted historical data for {ticker} from {start_date} to {end_date}."
+            )
+            return merged_df
+
+        except HttpErrorException as http_error:
+            logger.error(
+                f"Failed to fetch historical data for {ticker}. HTTP Error: {http_error}"
+            )
+            raise
+        except CustomException as error:
+            logger.error(
+                f"Failed to fetch historical data for {ticker}. Error: {error}"
+            )
+            raise
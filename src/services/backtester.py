@@ -0,0 +1,341 @@
+import functools
+import itertools
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.exceptions.exceptions import CustomException
+from src.services.batch_indicators import BatchTechnicalIndicators
+from src.settings.shared import logger
+from src.utils.metrics import Metrics
+
+DEFAULT_COST_BPS = 5.0
+DEFAULT_TRADING_DAYS = 252
+DEFAULT_TRAIN_DAYS = 504
+DEFAULT_TEST_DAYS = 126
+METRIC_COLUMNS = [
+    "total_return",
+    "annual_return",
+    "sharpe",
+    "max_drawdown",
+    "turnover",
+    "exposure",
+]
+
+
+class SeriesCache:
+    """Date x ticker matrices of a universe, derived once and reused.
+
+    Frame columns are pivoted on first use and derived series, such as the
+    SMA of a window, are computed once per distinct argument, so a parameter
+    sweep over (fast, slow) SMA pairs computes each window once instead of
+    once per grid point.
+
+    The matrices span the union of the dates of every ticker. Derived series
+    are computed over the bars each ticker traded, as
+    BatchTechnicalIndicators does, so a missing bar never breaks a window.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]) -> None:
+        self.frames = frames
+        self.series: Dict[Tuple, np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
+        self.dates = functools.reduce(
+            pd.Index.union, (frame.index for frame in frames.values())
+        )
+        self.tickers = list(frames)
+
+    def get(self, key: Tuple, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        series = self.series.get(key)
+        if series is None:
+            self.misses += 1
+            series = self.series[key] = compute()
+        else:
+            self.hits += 1
+        return series
+
+    def column(self, name: str) -> np.ndarray:
+        return self.get(
+            ("column", name),
+            lambda: pd.DataFrame(
+                {ticker: frame[name] for ticker, frame in self.frames.items()}
+            )
+            .reindex(index=self.dates, columns=self.tickers)
+            .to_numpy(dtype=np.float64),
+        )
+
+    def traded(self) -> np.ndarray:
+        """Mask of the bars each ticker traded."""
+        return self.get(("traded",), lambda: ~np.isnan(self.column("close")))
+
+    def per_ticker(self, compute: Callable[[pd.DataFrame], pd.DataFrame]) -> np.ndarray:
+        """`compute` applied to the close of every ticker over its traded bars only."""
+        compacted, rows, traded = BatchTechnicalIndicators.compact(
+            {"close": pd.DataFrame(self.column("close"))}
+        )
+        return BatchTechnicalIndicators.scatter(
+            compute(compacted["close"]), rows, traded, compacted["close"].index
+        ).to_numpy()
+
+    def sma(self, window: int) -> np.ndarray:
+        # Same rolling mean as TechnicalIndicators.compute_sma, per ticker
+        return self.get(
+            ("sma", window),
+            lambda: self.per_ticker(lambda close: close.rolling(window=window).mean()),
+        )
+
+    def returns(self) -> np.ndarray:
+        """Returns since the previous traded bar; 0 on the first bar and on
+        the bars a ticker did not trade."""
+        return self.get(
+            ("returns",),
+            lambda: np.nan_to_num(
+                self.per_ticker(lambda close: close.pct_change(fill_method=None)),
+                nan=0.0,
+                posinf=0.0,
+                neginf=0.0,
+            ),
+        )
+
+
+class Strategies:
+    """Long/flat signal strategies; each returns target positions in {0, 1}.
+
+    Positions are decided on the close of a bar and held over the next one.
+    """
+
+    @staticmethod
+    def sma_crossover(cache: SeriesCache, fast: int, slow: int) -> np.ndarray:
+        """Long while SMA(fast) is above SMA(slow)."""
+        with np.errstate(invalid="ignore"):
+            return (cache.sma(fast) > cache.sma(slow)).astype(np.float64)
+
+    @staticmethod
+    def trend(cache: SeriesCache, window: int) -> np.ndarray:
+        """Long while the close is above its SMA(window)."""
+        with np.errstate(invalid="ignore"):
+            return (cache.column("close") > cache.sma(window)).astype(np.float64)
+
+    @staticmethod
+    def rsi_reversion(cache: SeriesCache, lower: float, upper: float) -> np.ndarray:
+        """Buy when RSI drops below `lower`, sell once it rises above `upper`."""
+        rsi = cache.column("rsi")
+        with np.errstate(invalid="ignore"):
+            state = np.where(rsi < lower, 1.0, np.where(rsi > upper, 0.0, np.nan))
+        # Hold the last entry or exit decision until the next one
+        return pd.DataFrame(state).ffill().fillna(0.0).to_numpy()
+
+    @staticmethod
+    def is_valid(strategy: str, params: Dict) -> bool:
+        if strategy == "sma_crossover":
+            return params["fast"] < params["slow"]
+        if strategy == "rsi_reversion":
+            return params["lower"] < params["upper"]
+        return True
+
+
+STRATEGIES = {
+    "sma_crossover": Strategies.sma_crossover,
+    "trend": Strategies.trend,
+    "rsi_reversion": Strategies.rsi_reversion,
+}
+
+
+class Backtester:
+    """Vectorized backtests of signal strategies over a universe of frames.
+
+    Consumes the per-ticker frames built by
+    DataCollector.fetch_historical_and_technical_indicators (or read back
+    from the SnapshotStore) and evaluates a strategy for every ticker at
+    once as date x ticker array operations. Configured by the BACKTEST
+    section: COST_BPS, charged on every change of position, and
+    TRADING_DAYS used to annualize.
+    """
+
+    def __init__(
+        self, frames: Dict[str, pd.DataFrame], app_config: Dict = None
+    ) -> None:
+        if not frames:
+            raise CustomException("Backtester needs at least one frame.")
+        backtest_config = (app_config or {}).get("BACKTEST", {})
+        self.cost = backtest_config.get("COST_BPS", DEFAULT_COST_BPS) / 10_000
+        self.trading_days = backtest_config.get("TRADING_DAYS", DEFAULT_TRADING_DAYS)
+        self.cache = SeriesCache(frames)
+
+    @staticmethod
+    def from_snapshots(
+        snapshot_store, start_date: str = None, end_date: str = None, app_config=None
+    ) -> "Backtester":
+        """Backtester over the frames stored in a SnapshotStore."""
+        df = snapshot_store.read(start_date=start_date, end_date=end_date)
+        if df.empty:
+            raise CustomException(f"No snapshots found in {snapshot_store.path}")
+        frames = {
+            str(symbol): frame.drop(columns="symbol")
+            for symbol, frame in df.groupby("symbol", observed=True)
+        }
+        return Backtester(frames, app_config=app_config)
+
+    @staticmethod
+    def grid_points(strategy: str, grid: Dict[str, List]) -> List[Dict]:
+        if strategy not in STRATEGIES:
+            raise CustomException(
+                f"Unknown strategy '{strategy}', expected one of {list(STRATEGIES)}"
+            )
+        names = list(grid)
+        points = [
+            dict(zip(names, values))
+            for values in itertools.product(*(grid[name] for name in names))
+        ]
+        return [params for params in points if Strategies.is_valid(strategy, params)]
+
+    def positions(self, strategy: str, params: Dict) -> np.ndarray:
+        positions = STRATEGIES[strategy](self.cache, **params)
+        # A position is held over the bars a ticker misses, none before it lists
+        positions = np.where(self.cache.traded(), positions, np.nan)
+        return pd.DataFrame(positions).ffill().fillna(0.0).to_numpy()
+
+    def simulate(
+        self, positions: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Daily net returns of holding `positions`.
+
+        Args:
+            positions (np.ndarray): Date x ticker target positions decided on
+                each close.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Net returns, traded
+            size on each close and held position, all date x ticker.
+        """
+        held = np.zeros_like(positions)
+        held[1:] = positions[:-1]
+        trades = np.abs(np.diff(positions, axis=0, prepend=0.0))
+        net = held * self.cache.returns() - trades * self.cost
+        return net, trades, held
+
+    def metrics(
+        self, net: np.ndarray, trades: np.ndarray, held: np.ndarray
+    ) -> pd.DataFrame:
+        """Per-ticker return, Sharpe, drawdown, turnover and exposure of a period."""
+        traded = self.cache.traded()[-len(net) :]
+        days = np.maximum(traded.sum(axis=0), 1)
+        log_growth = np.log1p(net).sum(axis=0)
+        total_return = np.expm1(log_growth)
+        equity = np.exp(np.cumsum(np.log1p(net), axis=0))
+        drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+        mean = net.sum(axis=0) / days
+        deviation = np.sqrt(np.maximum((net**2).sum(axis=0) / days - mean**2, 0.0))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sharpe = np.where(
+                deviation > 0, mean / deviation * np.sqrt(self.trading_days), 0.0
+            )
+        return pd.DataFrame(
+            {
+                "total_return": total_return,
+                "annual_return": np.expm1(log_growth * self.trading_days / days),
+                "sharpe": sharpe,
+                "max_drawdown": drawdown.min(axis=0),
+                "turnover": trades.sum(axis=0) / days * self.trading_days,
+                "exposure": (held * traded).sum(axis=0) / days,
+            },
+            index=pd.Index(self.cache.tickers, name="ticker"),
+        )
+
+    def sweep(self, strategy: str, grid: Dict[str, List]) -> pd.DataFrame:
+        """
+        Backtests every point of a parameter grid on every ticker.
+
+        Args:
+            strategy (str): Name in STRATEGIES.
+            grid (Dict[str, List]): Values per parameter, e.g.
+                {"fast": [10, 20], "slow": [100, 200]}; invalid combinations
+                such as fast >= slow are skipped.
+
+        Returns:
+            pd.DataFrame: One row per grid point and ticker with the
+            parameters and METRIC_COLUMNS.
+        """
+        results = []
+        with Metrics.timer("backtest_sweep", strategy=strategy):
+            for params in Backtester.grid_points(strategy, grid):
+                net, trades, held = self.simulate(self.positions(strategy, params))
+                results.append(
+                    self.metrics(net, trades, held).reset_index().assign(**params)
+                )
+        logger.info(
+            f"Swept {len(results)} {strategy} grid points over "
+            f"{len(self.cache.tickers)} tickers; series cache "
+            f"{self.cache.hits} hits / {self.cache.misses} misses."
+        )
+        columns = list(grid) + ["ticker"] + METRIC_COLUMNS
+        return pd.concat(results, ignore_index=True)[columns]
+
+    def walk_forward(
+        self,
+        strategy: str,
+        grid: Dict[str, List],
+        train_days: int = DEFAULT_TRAIN_DAYS,
+        test_days: int = DEFAULT_TEST_DAYS,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Walk-forward evaluation: parameters picked in sample, scored out of sample.
+
+        For each test window of `test_days` bars, every ticker trades the grid
+        point with the best Sharpe over the `train_days` bars before it. The
+        out-of-sample positions of all windows are then simulated as one
+        path, so switching parameters between windows pays its costs.
+
+        Returns:
+            Dict[str, pd.DataFrame]: "metrics", the out-of-sample
+            METRIC_COLUMNS per ticker, and "selections", the parameters
+            chosen per window start and ticker.
+        """
+        points = Backtester.grid_points(strategy, grid)
+        dates = self.cache.dates
+        starts = list(range(train_days, len(dates), test_days))
+        if not points or not starts:
+            raise CustomException(
+                f"Walk-forward needs a valid grid and more than {train_days} dates, "
+                f"got {len(points)} grid points and {len(dates)} dates."
+            )
+
+        with Metrics.timer("backtest_walk_forward", strategy=strategy):
+            scores = np.full(
+                (len(points), len(starts), len(self.cache.tickers)), -np.inf
+            )
+            for point, params in enumerate(points):
+                net, _, _ = self.simulate(self.positions(strategy, params))
+                for window, start in enumerate(starts):
+                    train = net[start - train_days : start]
+                    deviation = train.std(axis=0)
+                    with np.errstate(invalid="ignore", divide="ignore"):
+                        sharpe = np.where(
+                            deviation > 0, train.mean(axis=0) / deviation, 0.0
+                        )
+                    scores[point, window] = sharpe
+            selected = scores.argmax(axis=0)
+
+            out_of_sample = np.zeros((len(dates), len(self.cache.tickers)))
+            for point, params in enumerate(points):
+                positions = self.positions(strategy, params)
+                for window, start in enumerate(starts):
+                    chosen = selected[window] == point
+                    end = start + test_days
+                    out_of_sample[start:end, chosen] = positions[start:end, chosen]
+            net, trades, held = self.simulate(out_of_sample)
+
+        first = starts[0]
+        metrics = self.metrics(net[first:], trades[first:], held[first:])
+        selections = pd.DataFrame(
+            [
+                [points[point] for point in selected[window]]
+                for window in range(len(starts))
+            ],
+            index=pd.DatetimeIndex(dates[starts], name="window_start"),
+            columns=self.cache.tickers,
+        )
+        return {"metrics": metrics, "selections": selections}
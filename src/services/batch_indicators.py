@@ -0,0 +1,163 @@
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+from src.services.helper import HelperMethods
+from src.services.indicator_engine import IndicatorEngine
+
+PRICE_FIELDS = ["open", "high", "low", "close", "volume"]
+SMA_WINDOWS = {"sma_50": 50, "sma_200": 200}
+
+
+class BatchTechnicalIndicators:
+    """Indicator computation for many tickers in one vectorized pass.
+
+    Prices are held as wide date x ticker matrices, one per OHLCV field, so
+    each indicator is a single pandas operation over the whole universe
+    instead of one small DataFrame per ticker.
+
+    The matrices span the union of the dates of every ticker, so a ticker
+    has NaN on the dates it did not trade. Indicators are therefore computed
+    on compacted matrices, where each column holds the bars of its ticker
+    one after the other, and scattered back to their dates: a window never
+    spans a missing bar, and every value equals the one of the per-ticker
+    computation.
+    """
+
+    @staticmethod
+    def build_price_matrices(
+        frames: Dict[str, pd.DataFrame],
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Pivots per-ticker OHLCV frames into wide date x ticker matrices.
+
+        Args:
+            frames (Dict[str, pd.DataFrame]): OHLCV frame indexed by date, per ticker.
+
+        Returns:
+            Dict[str, pd.DataFrame]: One matrix per OHLCV field, sorted by date.
+        """
+        return {
+            field: pd.DataFrame(
+                {ticker: frame[field] for ticker, frame in frames.items()}
+            ).sort_index()
+            for field in PRICE_FIELDS
+        }
+
+    @staticmethod
+    def compact(
+        matrices: Dict[str, pd.DataFrame],
+    ) -> Tuple[Dict[str, pd.DataFrame], np.ndarray, np.ndarray]:
+        """
+        Moves the traded bars of every ticker to the top of its column.
+
+        Args:
+            matrices (Dict[str, pd.DataFrame]): Date x ticker matrix per field.
+
+        Returns:
+            Tuple[Dict[str, pd.DataFrame], np.ndarray, np.ndarray]: The
+            compacted matrices, padded with NaN at the bottom, the date row of
+            each compacted cell and the mask of the traded cells.
+        """
+        close = matrices["close"]
+        traded = close.notna().to_numpy()
+        # Stable, so the traded rows keep their date order
+        rows = np.argsort(~traded, axis=0, kind="stable")
+        compacted = {
+            field: pd.DataFrame(
+                np.take_along_axis(matrix.to_numpy(dtype=np.float64), rows, axis=0),
+                columns=close.columns,
+            )
+            for field, matrix in matrices.items()
+        }
+        return compacted, rows, traded
+
+    @staticmethod
+    def scatter(
+        compacted: pd.DataFrame,
+        rows: np.ndarray,
+        traded: np.ndarray,
+        index: pd.Index,
+    ) -> pd.DataFrame:
+        """Puts a compacted matrix back on its dates, NaN where nothing traded."""
+        values = np.empty(compacted.shape)
+        np.put_along_axis(values, rows, compacted.to_numpy(), axis=0)
+        return pd.DataFrame(
+            np.where(traded, values, np.nan), index=index, columns=compacted.columns
+        )
+
+    @staticmethod
+    def compute_matrices(
+        matrices: Dict[str, pd.DataFrame], app_config: Dict = None
+    ) -> Dict[str, pd.DataFrame]:
+        """Computes every indicator as a date x ticker matrix."""
+        compacted, rows, traded = BatchTechnicalIndicators.compact(
+            {field: matrices[field] for field in ("close", "high", "low")}
+        )
+        close = compacted["close"]
+        indicators = {
+            name: close.rolling(window=window).mean()
+            for name, window in SMA_WINDOWS.items()
+        }
+        indicators.update(
+            IndicatorEngine.compute_indicators(
+                close=close,
+                high=compacted["high"],
+                low=compacted["low"],
+                periods=IndicatorEngine.get_periods(app_config),
+            )
+        )
+        index = matrices["close"].index
+        return {
+            name: BatchTechnicalIndicators.scatter(matrix, rows, traded, index)
+            for name, matrix in indicators.items()
+        }
+
+    @staticmethod
+    def to_long_frame(columns: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Flattens aligned date x ticker matrices into one row per symbol and date.
+
+        Rows without a close price (dates on which a ticker did not trade) are
+        dropped.
+        """
+        close = columns["close"]
+        dates = close.index
+        symbols = close.columns
+        long_df = pd.DataFrame(
+            {
+                "symbol": np.tile(symbols.to_numpy(), len(dates)),
+                "date": np.repeat(dates.to_numpy(), len(symbols)),
+                **{
+                    name: matrix.reindex(index=dates, columns=symbols)
+                    .to_numpy()
+                    .ravel()
+                    for name, matrix in columns.items()
+                },
+            }
+        )
+        return long_df[long_df["close"].notna()].reset_index(drop=True)
+
+    @staticmethod
+    def compute(
+        matrices: Dict[str, pd.DataFrame], app_config: Dict = None
+    ) -> pd.DataFrame:
+        """
+        Computes every indicator for all tickers of the price matrices.
+
+        Args:
+            matrices (Dict[str, pd.DataFrame]): Date x ticker matrix per OHLCV field.
+            app_config (Dict): Application config holding INDICATORS.PERIODS.
+
+        Returns:
+            pd.DataFrame: Long-format frame with symbol, date, OHLCV and indicators.
+        """
+        indicators = BatchTechnicalIndicators.compute_matrices(
+            matrices, app_config=app_config
+        )
+        return BatchTechnicalIndicators.to_long_frame({**matrices, **indicators})
+
+    @staticmethod
+    def to_records(long_df: pd.DataFrame) -> List[Dict]:
+        """Records for HistoricalDataHelper.persist_bulk_historical_data."""
+        return HelperMethods.frame_to_records(long_df.set_index("date"))
@@ -1,24 +1,38 @@
 from typing import Dict, List, Optional
 import pandas as pd
 import time
-from datetime import datetime
+from datetime import date, timedelta
 
 from src.utils.apis_call_handler import ApisHandler
 from src.settings.shared import get_app_config
 from src.exceptions.exceptions import HttpErrorException, CustomException
 from src.settings.shared import logger
+from src.services.data_quality import DataQuality
 from src.services.helper import HelperMethods
 from src.utils.decorators import time_execution
-from src.model.persistor import StockDataHelper, HistoricalDataHelper
+from src.utils.metrics import Metrics
+from src.model.frame_schema import FrameSchema
+from src.model.universe_index import UniverseIndex
+from src.model.warmup_store import WarmupStore
 
+from src.services.profile_batcher import ProfileBatcher
 from src.services.technical_indicators import TechnicalIndicators
 
+LOCAL_INDICATOR_SOURCE = "local"
+REMOTE_INDICATOR_SOURCE = "remote"
+DEFAULT_INDICATOR_SOURCE = LOCAL_INDICATOR_SOURCE
+
 
 class DataCollector:
 
     @staticmethod
     @time_execution
-    def fetch_nasdaq_tickers_list(app_config: Dict = None) -> Optional[List[str]]:
+    def fetch_nasdaq_tickers_list(
+        app_config: Dict = None, universe: Optional[UniverseIndex] = None
+    ) -> Optional[List[str]]:
+        if universe is not None and not universe.is_stale():
+            return DataCollector.select_universe(universe)
+
         fmp_config = app_config.get("API_KEYS", {}).get("FMP", {})
 
         url = f"{fmp_config.get('URL')}/stock/list?apikey={fmp_config.get('API_TOKEN')}"
@@ -32,6 +46,38 @@ class DataCollector:
         except CustomException as error:
             logger.error(f"Fetch nasdaq tickers failed. Reason {error}")
 
+        return DataCollector.build_universe(tickers=tickers, universe=universe)
+
+    @staticmethod
+    def build_universe(
+        tickers: Optional[List[Dict]], universe: Optional[UniverseIndex] = None
+    ) -> Optional[List[str]]:
+        """
+        Tickers of the run from a /stock/list payload.
+
+        Args:
+            tickers (Optional[List[Dict]]): Payload, None when the download failed.
+            universe (Optional[UniverseIndex]): Index refreshed with the payload
+                and queried for the selection; the NASDAQ symbols of the
+                payload are returned as is without one.
+
+        Returns:
+            Optional[List[str]]: Selected tickers, None when there are none.
+        """
+        if universe is not None:
+            refreshed = False
+            if tickers:
+                try:
+                    universe.refresh(tickers)
+                    refreshed = True
+                except CustomException as error:
+                    logger.error(f"Universe refresh rejected. Reason {error}")
+            if not refreshed:
+                if universe.latest_version() is None:
+                    return None
+                logger.warning("Using the stale universe index of the previous run.")
+            return DataCollector.select_universe(universe)
+
         nasdaq_tickers = None
         if tickers:
             nasdaq_tickers = HelperMethods.filter_tickers_by_exchange(
@@ -43,20 +89,42 @@ class DataCollector:
         return nasdaq_tickers
 
     @staticmethod
-    @time_execution
-    def fetch_stock_metadata(ticker: str, app_config: Dict = None) -> Optional[Dict]:
-        fmp_config = app_config.get("API_KEYS", {}).get("FMP", {})
-
-        url = f"{fmp_config.get('URL')}/profile/{ticker}?apikey={fmp_config.get('API_TOKEN')}"
+    def select_universe(universe: UniverseIndex) -> List[str]:
+        with Metrics.timer("universe_select"):
+            selected = universe.select()
+        logger.info(
+            f"Selected {len(selected)} tickers from the universe index "
+            f"at {universe.path}"
+        )
+        return selected
 
+    @staticmethod
+    @time_execution
+    def fetch_stock_metadata(
+        ticker: str,
+        app_config: Dict = None,
+        profile_batcher: Optional[ProfileBatcher] = None,
+    ) -> Optional[Dict]:
         ticker_data = None
         try:
-            ticker_data = ApisHandler.get(app_config=app_config, url=url)
+            if profile_batcher is not None:
+                ticker_data = profile_batcher.get(ticker)
+            else:
+                url = ProfileBatcher.build_profile_url(app_config, [ticker])
+                ticker_data = ApisHandler.get(app_config=app_config, url=url)
         except HttpErrorException as http_error:
             logger.error(f"Fetch Ticker financial data. Http Errpr Reason {http_error}")
+            raise
         except CustomException as error:
             logger.error(f"etch Ticker financial data failed. Reason {error}")
+            raise
+
+        return DataCollector.build_stock_metadata(
+            ticker=ticker, ticker_data=ticker_data
+        )
 
+    @staticmethod
+    def build_stock_metadata(ticker: str, ticker_data: List) -> Optional[Dict]:
         if ticker_data and len(ticker_data) > 0:
             stock = ticker_data[0]
 
@@ -76,7 +144,11 @@ class DataCollector:
     @staticmethod
     @time_execution
     def fetch_historical_and_technical_indicators(
-        app_config: Dict, ticker: str, start_date: str = None, end_date: str = None
+        app_config: Dict,
+        ticker: str,
+        start_date: str = None,
+        end_date: str = None,
+        warmup: pd.DataFrame = None,
     ) -> List:
 
         fmp_config = app_config.get("API_KEYS", {}).get("FMP", {})
@@ -84,51 +156,35 @@ class DataCollector:
         api_token = fmp_config.get("API_TOKEN")
 
         # Build the historical URL with date range if specified
-        date_range = ""
-        if start_date and end_date:
-            date_range = f"&from={start_date}&to={end_date}"
+        date_range = DataCollector.build_date_range(start_date, end_date)
 
         logger.info(f"Get historical data for ticker {ticker} ...")
         try:
             # Fetch historical OHLCV data
 
-            historical_data = TechnicalIndicators.get_ohlcv_data(
+            ohlcv = TechnicalIndicators.get_ohlcv_frame(
                 base_url=base_url,
                 ticker=ticker,
                 api_token=api_token,
                 date_range=date_range,
             )
 
-            if not historical_data:
-                logger.warning(f"Failed to fetch historical data for {ticker}.")
+            df = DataCollector.build_ohlcv_frame(
+                ticker=ticker, ohlcv=ohlcv, warmup=warmup, app_config=app_config
+            )
+            if df is None:
                 return None
 
-            # Remove invalid data (zero volume or identical OHLC values)
-            historical_data = [
-                record
-                for record in historical_data
-                if record.get("volume", 0) > 0
-                and not (
-                    record.get("open")
-                    == record.get("high")
-                    == record.get("low")
-                    == record.get("close")
+            if DataCollector.uses_local_indicators(app_config):
+                indicators_df = TechnicalIndicators.compute_local_indicators(
+                    df, app_config=app_config
                 )
-            ]
-
-            if not historical_data:
-                logger.warning(
-                    f"All retrieved OHLCV data for {ticker} was invalid. Skipping."
+                logger.info(
+                    f"Computed technical indicators locally for {ticker} from {start_date} to {end_date}."
+                )
+                return DataCollector.finalize_frame(
+                    HelperMethods.join_indicators(df, indicators_df), warmup
                 )
-                return None
-
-            df = pd.DataFrame(historical_data)
-            df["date"] = pd.to_datetime(df["date"])
-            df.set_index("date", inplace=True)
-
-            # ✅ Step 2: Compute SMA manually
-            df["sma_50"] = TechnicalIndicators.compute_sma(df, 50)
-            df["sma_200"] = TechnicalIndicators.compute_sma(df, 200)
 
             # Fetch Technical Indicators
             indicators_df = TechnicalIndicators.fetch_all_technical_indicator(
@@ -138,10 +194,13 @@ class DataCollector:
                 logger.warning(
                     f"No technical indicators found for {ticker}. Using only OHLCV data."
                 )
-                return df  # Return OHLCV if no indicators are found
+                # Return OHLCV if no indicators are found
+                return DataCollector.finalize_frame(df, warmup)
 
             # Merge OHLCV and Technical Indicators
-            merged_df = df.join(indicators_df, on="date", how="left")
+            merged_df = DataCollector.finalize_frame(
+                HelperMethods.join_indicators(df, indicators_df), warmup
+            )
 
             logger.info(
                 f"Fetched and formatted historical data for {ticker} from {start_date} to {end_date}."
@@ -152,12 +211,159 @@ class DataCollector:
             logger.error(
                 f"Failed to fetch historical data for {ticker}. HTTP Error: {http_error}"
             )
+            raise
         except CustomException as error:
             logger.error(
                 f"Failed to fetch historical data for {ticker}. Error: {error}"
             )
+            raise
 
-        return None
+    @staticmethod
+    def build_date_range(start_date: str = None, end_date: str = None) -> str:
+        if start_date and end_date:
+            return f"&from={start_date}&to={end_date}"
+        return ""
+
+    @staticmethod
+    def uses_local_indicators(app_config: Dict) -> bool:
+        indicator_source = app_config.get("PROCESSING", {}).get(
+            "INDICATOR_SOURCE", DEFAULT_INDICATOR_SOURCE
+        )
+        return indicator_source == LOCAL_INDICATOR_SOURCE
+
+    @staticmethod
+    def build_ohlcv_frame(
+        ticker: str,
+        ohlcv: pd.DataFrame,
+        warmup: pd.DataFrame = None,
+        app_config: Dict = None,
+    ) -> Optional[pd.DataFrame]:
+        """Add sma_50/sma_200 to a cleaned OHLCV frame from OhlcvParser.
+
+        The new bars first go through the DataQuality checks, against the last
+        bar of the `warmup` window when one is given. That window of already
+        processed bars is then put in front of them so rolling indicators
+        continue across the seam.
+        """
+        if ohlcv is not None and not ohlcv.empty:
+            ohlcv = DataQuality.validate(
+                ticker, ohlcv, app_config=app_config, previous=warmup
+            )
+        if ohlcv is None or ohlcv.empty:
+            logger.warning(f"No valid OHLCV data retrieved for {ticker}. Skipping.")
+            return None
+
+        df = ohlcv
+        if warmup is not None:
+            df = pd.concat([warmup, df[df.index > warmup.index.max()]])
+
+        # ✅ Step 2: Compute SMA manually
+        df["sma_50"] = TechnicalIndicators.compute_sma(df, 50)
+        df["sma_200"] = TechnicalIndicators.compute_sma(df, 200)
+        return df
+
+    @staticmethod
+    def finalize_frame(df: pd.DataFrame, warmup: pd.DataFrame = None) -> pd.DataFrame:
+        """Merged frame of the requested dates in the canonical FrameSchema layout."""
+        with Metrics.timer("frame_conform"):
+            return FrameSchema.conform(DataCollector.drop_warmup_rows(df, warmup))
+
+    @staticmethod
+    def drop_warmup_rows(df: pd.DataFrame, warmup: pd.DataFrame = None) -> pd.DataFrame:
+        if warmup is None:
+            return df
+        return df[df.index > warmup.index.max()]
+
+    @staticmethod
+    def drop_stored_rows(
+        df: Optional[pd.DataFrame], last_date: pd.Timestamp = None
+    ) -> Optional[pd.DataFrame]:
+        """Rows of `df` after `last_date`, the ones an incremental run adds.
+
+        A rebuilt warm-up window is fetched along with the new bars; its rows
+        are already stored, with values computed from the full history.
+        """
+        if df is None or last_date is None:
+            return df
+        return df[df.index > last_date]
+
+    @staticmethod
+    def plan_incremental_fetch(
+        app_config: Dict, ticker: str, end_date: str = None
+    ) -> Dict:
+        """
+        Decides which bars an incremental run has to fetch for `ticker`.
+
+        Args:
+            app_config (Dict): Application config holding the INCREMENTAL section.
+            ticker (str): Symbol to plan.
+            end_date (str): Last date to fetch, today when omitted.
+
+        Returns:
+            Dict: `up_to_date` when nothing is missing, otherwise the
+            `start_date`/`end_date` to fetch, the `warmup` window to extend
+            and the `last_date` already stored; only the rows after it are
+            new. Without a stored date, dates, warmup and last_date are None
+            and the full history is fetched. Without a usable warm-up window,
+            e.g. in a new container, the fetch starts early enough to rebuild
+            one and warmup is None.
+        """
+        end_date = end_date or date.today().isoformat()
+        full_history = {
+            "up_to_date": False,
+            "start_date": None,
+            "end_date": None,
+            "warmup": None,
+            "last_date": None,
+        }
+
+        # The repository layer is only imported by runs that use it
+        from src.model.persistor import HistoricalDataHelper
+
+        warmup_store = WarmupStore(app_config)
+        warmup = warmup_store.load(ticker)
+        if HistoricalDataHelper.supports_latest_date():
+            last_date = HistoricalDataHelper.get_latest_date(symbol=ticker)
+        else:
+            # The warm-up window is saved once the rows of a run are submitted
+            last_date = warmup.index.max() if warmup is not None else None
+        if last_date is None:
+            return full_history
+
+        last_date = pd.Timestamp(last_date)
+        start_date = (last_date + timedelta(days=1)).date().isoformat()
+        if warmup is None or warmup.index.max() < last_date:
+            rebuild_date = last_date - timedelta(days=warmup_store.calendar_days())
+            logger.info(
+                f"No usable warm-up window for {ticker}, rebuilding it from "
+                f"{rebuild_date.date()}."
+            )
+            return {
+                "up_to_date": start_date > end_date,
+                "start_date": rebuild_date.date().isoformat(),
+                "end_date": end_date,
+                "warmup": None,
+                "last_date": last_date,
+            }
+
+        return {
+            "up_to_date": start_date > end_date,
+            "start_date": start_date,
+            "end_date": end_date,
+            "warmup": warmup[warmup.index <= last_date],
+            "last_date": last_date,
+        }
+
+    @staticmethod
+    def save_warmup(
+        app_config: Dict,
+        ticker: str,
+        df: pd.DataFrame,
+        warmup: pd.DataFrame = None,
+    ) -> None:
+        """Keep the latest bars of `ticker` as the warm-up of its next run."""
+        with Metrics.timer("warmup_save"):
+            WarmupStore(app_config).save(ticker, df, previous=warmup)
 
     @staticmethod
     def merge_technical_indicator_into_historical_data(
@@ -168,50 +374,35 @@ class DataCollector:
         sma_data: List,
         bollinger_data: List,
     ) -> List:
-
-        # Prepare the list for formatted historical data
-        formatted_historical_data = []
-
-        # Merge technical indicators into historical data
-        for i, record in enumerate(historical_data):
-            formatted_record = {
-                "symbol": ticker,
-                "date": datetime.strptime(record["date"], "%Y-%m-%d").date(),
-                "open": float(record.get("open", 0)),
-                "high": float(record.get("high", 0)),
-                "low": float(record.get("low", 0)),
-                "close": float(record.get("close", 0)),
-                "volume": int(record.get("volume", 0)),
-                "rsi": (
-                    float(rsi_data[i].get("rsi", 0))
-                    if rsi_data and i < len(rsi_data)
-                    else None
-                ),
-                "macd": (
-                    float(macd_data[i].get("macd", 0))
-                    if macd_data and i < len(macd_data)
-                    else None
-                ),
-                "sma_50": (
-                    float(sma_data[i].get("sma_50", 0))
-                    if sma_data and i < len(sma_data)
-                    else None
-                ),
-                "sma_200": (
-                    float(sma_data[i].get("sma_200", 0))
-                    if sma_data and i < len(sma_data)
-                    else None
-                ),
-                "bollinger_upper": (
-                    float(bollinger_data[i].get("bollinger_upper", 0))
-                    if bollinger_data and i < len(bollinger_data)
-                    else None
-                ),
-                "bollinger_lower": (
-                    float(bollinger_data[i].get("bollinger_lower", 0))
-                    if bollinger_data and i < len(bollinger_data)
-                    else None
-                ),
+        df = pd.DataFrame(historical_data)
+        df["date"] = pd.to_datetime(df["date"].str[:10]).dt.as_unit("ns")
+        df.set_index("date", inplace=True)
+        indicators_df = HelperMethods.merge_indicator_data(
+            {
+                "rsi": rsi_data,
+                "macd": macd_data,
+                "sma_50": sma_data,
+                "sma_200": sma_data,
+                "bollinger_upper": bollinger_data,
+                "bollinger_lower": bollinger_data,
             }
-
-            formatted_historical_data.append(formatted_record)
+        )
+        df = HelperMethods.join_indicators(df, indicators_df)
+
+        return HelperMethods.frame_to_records(
+            df,
+            symbol=ticker,
+            columns=[
+                "open",
+                "high",
+                "low",
+                "close",
+                "volume",
+                "rsi",
+                "macd",
+                "sma_50",
+                "sma_200",
+                "bollinger_upper",
+                "bollinger_lower",
+            ],
+        )
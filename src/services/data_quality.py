@@ -0,0 +1,285 @@
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.model.frame_schema import PRICE_COLUMNS, VOLUME_COLUMN
+from src.settings.shared import logger
+from src.utils.metrics import Metrics
+
+DEFAULT_MAX_GAP_DAYS = 7
+DEFAULT_MAX_JUMP = 0.4
+# A close-to-close ratio within this of n or 1/n reads as an n-for-1 split
+SPLIT_TOLERANCE = 0.03
+SPLIT_FACTORS = np.arange(2, 21, dtype=np.float64)
+# Bars on each side of a split whose mean volumes must confirm it
+SPLIT_VOLUME_BARS = 5
+COUNTED_CHECKS = (
+    "duplicate_dates",
+    "bad_prices",
+    "repaired_ranges",
+    "gaps",
+    "jumps",
+)
+
+
+@dataclass
+class QualityReport:
+    bars: int = 0
+    duplicate_dates: int = 0
+    bad_prices: int = 0
+    high_below_low: int = 0
+    repaired_ranges: int = 0
+    gaps: int = 0
+    max_gap_days: int = 0
+    jumps: int = 0
+    splits: int = 0
+    unconfirmed_splits: int = 0
+    splits_adjusted: int = 0
+
+    @property
+    def dropped(self) -> int:
+        return self.duplicate_dates + self.bad_prices
+
+    @property
+    def issues(self) -> int:
+        return self.dropped + self.repaired_ranges + self.gaps + self.jumps
+
+
+class DataQuality:
+    """Vectorized checks of the OHLCV bars of a ticker before any indicator.
+
+    Configured by the DATA_QUALITY section: ENABLED, MAX_GAP_DAYS, MAX_JUMP
+    and ADJUST_SPLITS. Every check is one array operation over the whole
+    frame:
+
+    - duplicate dates: the last bar of a date is kept, the others dropped;
+    - bad prices: bars with a missing, zero or negative price are dropped;
+    - inconsistent ranges: high below low, or open/close outside [low, high],
+      are repaired by widening high and low to the extremes of the bar;
+    - gaps: more than MAX_GAP_DAYS calendar days between bars are flagged;
+    - jumps: close-to-close moves beyond MAX_JUMP are flagged. Those at an
+      n-for-1 or 1-for-n ratio are counted as unadjusted splits when the
+      volume confirms them, moving the other way by at least the square root
+      of n between the bars before and after; the others are only counted as
+      unconfirmed. With ADJUST_SPLITS set, the bars before a confirmed split
+      are back-adjusted.
+
+    In an incremental run the last bar already processed is passed as
+    `previous`, so the gap and jump between it and the first new bar are
+    checked as well. ADJUST_SPLITS is rejected with INCREMENTAL by the config
+    validation, since the stored bars before a split would stay unadjusted.
+
+    The report of each ticker is kept until the run picks it up with
+    `pop_report`, and the counts of every check add to the
+    data_quality_issues_total counter.
+    """
+
+    _lock = threading.Lock()
+    _reports: Dict[str, QualityReport] = {}
+
+    @staticmethod
+    def reset() -> None:
+        with DataQuality._lock:
+            DataQuality._reports = {}
+
+    @staticmethod
+    def pop_report(ticker: str) -> Optional[Dict]:
+        with DataQuality._lock:
+            report = DataQuality._reports.pop(ticker, None)
+        return asdict(report) if report is not None else None
+
+    @staticmethod
+    def validate(
+        ticker: str,
+        df: pd.DataFrame,
+        app_config: Dict = None,
+        previous: pd.DataFrame = None,
+    ) -> pd.DataFrame:
+        """
+        Checks and repairs the bars of a cleaned OHLCV frame.
+
+        Args:
+            ticker (str): Symbol of the frame, for the report.
+            df (pd.DataFrame): OHLCV frame from OhlcvParser, ascending dates.
+            app_config (Dict): Application config holding DATA_QUALITY.
+            previous (pd.DataFrame): Bars already processed, e.g. the warm-up
+                window of an incremental run; its last bar is checked against
+                the first bar of `df` and left out of the result.
+
+        Returns:
+            pd.DataFrame: `df` itself when nothing had to change, otherwise a
+            new frame without the dropped bars and with repaired values.
+        """
+        quality_config = (app_config or {}).get("DATA_QUALITY", {})
+        if not quality_config.get("ENABLED", True) or df.empty:
+            return df
+
+        seam = None
+        if previous is not None and not previous.empty:
+            seam = previous[PRICE_COLUMNS + [VOLUME_COLUMN]].iloc[-1:]
+            df = pd.concat([seam, df[df.index > seam.index[-1]]])
+
+        with Metrics.timer("data_quality"):
+            df, report = DataQuality.check(
+                df,
+                max_gap_days=quality_config.get("MAX_GAP_DAYS", DEFAULT_MAX_GAP_DAYS),
+                max_jump=quality_config.get("MAX_JUMP", DEFAULT_MAX_JUMP),
+                adjust_splits=quality_config.get("ADJUST_SPLITS", False),
+            )
+        if seam is not None:
+            # Checked and valid in its own run, so still the first bar
+            df = df.iloc[1:]
+            report.bars -= 1
+
+        with DataQuality._lock:
+            DataQuality._reports[ticker] = report
+        if report.issues:
+            for check in COUNTED_CHECKS:
+                count = getattr(report, check)
+                if count:
+                    Metrics.increment("data_quality_issues_total", count, check=check)
+            logger.warning(
+                f"Data quality of {ticker}: dropped {report.dropped} of "
+                f"{report.bars} bars, repaired {report.repaired_ranges} ranges, "
+                f"{report.gaps} gaps, {report.jumps} jumps "
+                f"({report.splits} splits, {report.splits_adjusted} adjusted, "
+                f"{report.unconfirmed_splits} unconfirmed by volume)."
+            )
+        return df
+
+    @staticmethod
+    def check(
+        df: pd.DataFrame,
+        max_gap_days: int = DEFAULT_MAX_GAP_DAYS,
+        max_jump: float = DEFAULT_MAX_JUMP,
+        adjust_splits: bool = False,
+    ) -> Tuple[pd.DataFrame, QualityReport]:
+        report = QualityReport(bars=len(df))
+        if not df.index.is_monotonic_increasing:
+            df = df.sort_index(kind="stable")
+        dates = df.index.to_numpy()
+        prices = {column: df[column].to_numpy() for column in PRICE_COLUMNS}
+
+        drop = np.zeros(len(df), dtype=bool)
+        # Dates are sorted, so a duplicate is equal to the next date
+        drop[:-1] = dates[1:] == dates[:-1]
+        report.duplicate_dates = int(drop.sum())
+        # NaN compares False, so it is caught with the non-positive prices
+        positive = np.logical_and.reduce(
+            [prices[column] > 0 for column in PRICE_COLUMNS]
+        )
+        report.bad_prices = int((~positive & ~drop).sum())
+        drop |= ~positive
+
+        if drop.any():
+            keep = ~drop
+            df = df[keep]
+            dates = dates[keep]
+            prices = {column: values[keep] for column, values in prices.items()}
+
+        high, low = prices["high"], prices["low"]
+        top = np.maximum.reduce([prices[column] for column in PRICE_COLUMNS])
+        bottom = np.minimum.reduce([prices[column] for column in PRICE_COLUMNS])
+        broken = (high < top) | (low > bottom)
+        report.high_below_low = int((high < low).sum())
+        report.repaired_ranges = int(broken.sum())
+
+        if len(dates) > 1:
+            gap_days = np.diff(dates).astype("timedelta64[D]").astype(np.int64)
+            report.gaps = int((gap_days > max_gap_days).sum())
+            report.max_gap_days = int(gap_days.max())
+
+            close = prices["close"]
+            ratios = close[1:] / close[:-1]
+            jumped = (ratios > 1 + max_jump) | (ratios < 1 / (1 + max_jump))
+            report.jumps = int(jumped.sum())
+            candidates = DataQuality.split_factors(ratios, jumped)
+            splits = np.where(
+                DataQuality.volume_confirms(
+                    df[VOLUME_COLUMN].to_numpy(dtype=np.float64), candidates
+                ),
+                candidates,
+                1.0,
+            )
+            report.splits = int((splits != 1).sum())
+            report.unconfirmed_splits = int((candidates != 1).sum()) - report.splits
+        else:
+            splits = np.ones(0)
+
+        adjust = adjust_splits and report.splits > 0
+        if not (report.repaired_ranges or adjust):
+            return df, report
+
+        df = df.copy()
+        if report.repaired_ranges:
+            df["high"] = top
+            df["low"] = bottom
+        if adjust:
+            # Bars before a split get the factors of every split after them
+            factors = np.ones(len(df))
+            factors[:-1] = np.cumprod(splits[::-1])[::-1]
+            for column in PRICE_COLUMNS:
+                df[column] = df[column].to_numpy() * factors
+            df[VOLUME_COLUMN] = np.rint(df[VOLUME_COLUMN].to_numpy() / factors).astype(
+                df[VOLUME_COLUMN].dtype
+            )
+            report.splits_adjusted = report.splits
+        return df, report
+
+    @staticmethod
+    def split_factors(ratios: np.ndarray, jumped: np.ndarray) -> np.ndarray:
+        """Per close-to-close ratio, the split it matches, 1 where none does.
+
+        An n-for-1 split divides the price by n, so its ratio is about 1/n
+        and the bars before it are multiplied by 1/n to adjust them.
+        """
+        factors = np.ones(len(ratios))
+        candidates = np.flatnonzero(jumped)
+        if not len(candidates):
+            return factors
+        # Reverse splits multiply the price, so compare both ratio and inverse
+        ratio = ratios[candidates]
+        size = np.where(ratio < 1, 1 / ratio, ratio)
+        nearest = SPLIT_FACTORS[
+            np.abs(size[:, None] - SPLIT_FACTORS[None, :]).argmin(axis=1)
+        ]
+        matched = np.abs(size / nearest - 1) <= SPLIT_TOLERANCE
+        factors[candidates[matched]] = np.where(
+            ratio[matched] < 1, 1 / nearest[matched], nearest[matched]
+        )
+        return factors
+
+    @staticmethod
+    def volume_confirms(volume: np.ndarray, factors: np.ndarray) -> np.ndarray:
+        """Per split candidate, whether the volume moved with it.
+
+        An n-for-1 split multiplies the share count, and so the volume, by n.
+        The mean volume over the SPLIT_VOLUME_BARS bars after a candidate
+        must differ from the one over the bars up to it by at least sqrt(n),
+        in the direction of the split.
+        """
+        confirmed = np.zeros(len(factors), dtype=bool)
+        candidates = np.flatnonzero(factors != 1)
+        if not len(candidates):
+            return confirmed
+        totals = np.concatenate([[0.0], np.cumsum(np.nan_to_num(volume))])
+        # Ratio i sits between bar i and bar i + 1
+        before_start = np.maximum(candidates + 1 - SPLIT_VOLUME_BARS, 0)
+        after_end = np.minimum(candidates + 1 + SPLIT_VOLUME_BARS, len(volume))
+        before = (totals[candidates + 1] - totals[before_start]) / (
+            candidates + 1 - before_start
+        )
+        after = (totals[after_end] - totals[candidates + 1]) / (
+            after_end - candidates - 1
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Expected log change of the volume, log(n) for an n-for-1 split
+            expected = -np.log(factors[candidates])
+            moved = np.log(after / before)
+            confirmed[candidates] = np.isfinite(moved) & (
+                moved * np.sign(expected) >= np.abs(expected) / 2
+            )
+        return confirmed
@@ -5,36 +5,74 @@ import pandas as pd
 
 class HelperMethods:
     @staticmethod
-    def merge_indicator_data(indicators: Dict = {}):
-        # Convert all indicator lists to DataFrames
-        df_rsi = pd.DataFrame(indicators["rsi"])
-        # df_macd = pd.DataFrame(indicators["macd"])
-        df_sma = pd.DataFrame(indicators["sma"])
-        # df_bollinger = pd.DataFrame(indicators["bollinger"])
-        df_ema = pd.DataFrame(indicators["ema"])
-        df_adx = pd.DataFrame(indicators["adx"])
-        df_wma = pd.DataFrame(indicators["wma"])
-        df_dema = pd.DataFrame(indicators["dema"])
-        df_tema = pd.DataFrame(indicators["tema"])
-        df_williams = pd.DataFrame(indicators["williams"])
-
-        # Merge all indicators into one DataFrame using "date" as index
-        df = df_rsi.rename(columns={"rsi": "rsi"}).set_index("date")
-        # df["macd"] = df_macd["macd"] if not df_macd.empty else None
-        # df["sma_50"] = df_sma["sma_50"] if not df_sma.empty else None
-        # df["sma_200"] = df_sma["sma_200"] if not df_sma.empty else None
-        # df["bollinger_upper"] = df_bollinger["bollinger_upper"] if not df_bollinger.empty else None
-        # df["bollinger_lower"] = df_bollinger["bollinger_lower"] if not df_bollinger.empty else None
-        df["ema"] = df_ema["ema"] if not df_ema.empty else None
-        df["adx"] = df_adx["adx"] if not df_adx.empty else None
-        df["wma"] = df_wma["wma"] if not df_wma.empty else None
-        df["dema"] = df_dema["dema"] if not df_dema.empty else None
-        df["tema"] = df_tema["tema"] if not df_tema.empty else None
-        df["williams"] = df_williams["williams"] if not df_williams.empty else None
-
-        # Convert index to datetime format
-        df.index = pd.to_datetime(df.index)
-        return df
+    def merge_indicator_data(indicators: Dict = {}) -> pd.DataFrame:
+        """
+        Merges indicator responses into one frame keyed by date.
+
+        Args:
+            indicators (Dict): Indicator name to the list returned by the API;
+                the value of each entry is read from the key of the same name.
+
+        Returns:
+            pd.DataFrame: One column per indicator, indexed by the union of
+            the dates. Indicators that failed or came back empty are NaN; the
+            frame is empty when none came back.
+        """
+        columns = {}
+        for name, indicator_data in indicators.items():
+            if not indicator_data:
+                continue
+            # Dates are only parsed once, after all columns are aligned on
+            # the raw day strings
+            columns[name] = pd.Series(
+                {
+                    entry["date"][:10]: entry.get(name)
+                    for entry in indicator_data
+                    if entry.get("date")
+                },
+                dtype="float64",
+            )
+        if not columns:
+            return pd.DataFrame()
+
+        df = pd.DataFrame(columns).reindex(columns=list(indicators))
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.index), name="date").as_unit("ns")
+        return df.sort_index()
+
+    @staticmethod
+    def join_indicators(df: pd.DataFrame, indicators_df: pd.DataFrame) -> pd.DataFrame:
+        """Left-joins indicator columns onto a date-indexed OHLCV frame.
+
+        Columns already in `df` are kept from `df`, so a source that echoes
+        the prices back cannot clash with them.
+        """
+        return df.join(
+            indicators_df.drop(columns=df.columns, errors="ignore"), how="left"
+        )
+
+    @staticmethod
+    def frame_to_records(
+        df: pd.DataFrame, symbol: str = None, columns: List[str] = None
+    ) -> List[Dict]:
+        """
+        Converts a date-indexed frame into records for the bulk persistors.
+
+        Args:
+            df (pd.DataFrame): Frame indexed by date.
+            symbol (str): Symbol added to every record; omitted when the frame
+                already holds a `symbol` column.
+            columns (List[str]): Columns to keep, missing ones are set to None.
+
+        Returns:
+            List[Dict]: One dict per row with Python scalars, NaN as None and
+            `date` as datetime.date.
+        """
+        frame = df if columns is None else df.reindex(columns=columns)
+        frame = frame.astype(object).where(frame.notna(), None)
+        frame.insert(0, "date", pd.DatetimeIndex(df.index).date)
+        if symbol is not None:
+            frame.insert(0, "symbol", symbol)
+        return frame.to_dict(orient="records")
 
     @staticmethod
     def filter_tickers_by_exchange(exchange_name: str = "", tickers: List = []):
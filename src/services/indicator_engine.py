@@ -0,0 +1,218 @@
+from typing import Dict, Union
+import numpy as np
+import pandas as pd
+
+from src.enums.stock_indicator import StockTechnicalIndicator
+
+# Series for one ticker, or a date x ticker frame for many tickers at once
+PriceData = Union[pd.Series, pd.DataFrame]
+
+DEFAULT_PERIODS = {
+    StockTechnicalIndicator.RSI.name: 14,
+    StockTechnicalIndicator.SMA.name: 14,
+    StockTechnicalIndicator.EMA.name: 14,
+    StockTechnicalIndicator.ADX.name: 14,
+    StockTechnicalIndicator.WMA.name: 14,
+    StockTechnicalIndicator.DOUBLE_EMA.name: 14,
+    StockTechnicalIndicator.TRIPLE_EMA.name: 14,
+    StockTechnicalIndicator.WILLIAMS.name: 14,
+    StockTechnicalIndicator.BOLLINGER.name: 20,
+    "BOLLINGER_STD": 2,
+    "MACD_FAST": 12,
+    "MACD_SLOW": 26,
+    "MACD_SIGNAL": 9,
+}
+
+
+class IndicatorEngine:
+    """Local computation of the technical indicators served by FMP.
+
+    Every method accepts either a Series (one ticker) or a date x ticker
+    DataFrame (many tickers) and works column-wise, so the same maths is used
+    by the per-ticker pipeline and by batch computations. Input must be sorted
+    by ascending date.
+
+    Exponential averages are seeded with the simple average of their first
+    `period` values, as FMP and TA-Lib do, so the values match the ones FMP
+    serves from the first bar on which an indicator is defined.
+    """
+
+    @staticmethod
+    def get_periods(app_config: Dict = None) -> Dict:
+        """Indicator periods from INDICATORS.PERIODS, keyed by indicator name."""
+        configured = (app_config or {}).get("INDICATORS", {}).get("PERIODS", {})
+        return {**DEFAULT_PERIODS, **configured}
+
+    @staticmethod
+    def seeded_ewm(data: PriceData, alpha: float, period: int) -> PriceData:
+        """
+        Exponential average seeded with the SMA of the first `period` values.
+
+        Leading NaN are skipped, so an average of an average (DEMA, TEMA, ADX)
+        is seeded from the first values of its input that are defined.
+        """
+        seed = data.rolling(window=period).mean()
+        defined = seed.notna()
+        start = defined & (defined.cumsum() == 1)
+        after = start.cumsum().astype(bool) & ~start
+        return data.where(after, seed).ewm(alpha=alpha, adjust=False).mean()
+
+    @staticmethod
+    def wilder(data: PriceData, period: int) -> PriceData:
+        """Wilder's smoothing, an EMA with alpha = 1 / period."""
+        return IndicatorEngine.seeded_ewm(data, 1 / period, period)
+
+    @staticmethod
+    def ema(close: PriceData, period: int) -> PriceData:
+        return IndicatorEngine.seeded_ewm(close, 2 / (period + 1), period)
+
+    @staticmethod
+    def dema(close: PriceData, period: int) -> PriceData:
+        ema = IndicatorEngine.ema(close, period)
+        return 2 * ema - IndicatorEngine.ema(ema, period)
+
+    @staticmethod
+    def tema(close: PriceData, period: int) -> PriceData:
+        ema = IndicatorEngine.ema(close, period)
+        ema_of_ema = IndicatorEngine.ema(ema, period)
+        return 3 * ema - 3 * ema_of_ema + IndicatorEngine.ema(ema_of_ema, period)
+
+    @staticmethod
+    def wma(close: PriceData, period: int) -> PriceData:
+        """Linearly weighted moving average, the latest bar weighing `period`."""
+        weighted = sum((period - lag) * close.shift(lag) for lag in range(period))
+        return weighted / (period * (period + 1) / 2)
+
+    @staticmethod
+    def rsi(close: PriceData, period: int) -> PriceData:
+        delta = close.diff()
+        average_gain = IndicatorEngine.wilder(delta.clip(lower=0), period)
+        average_loss = IndicatorEngine.wilder(-delta.clip(upper=0), period)
+        relative_strength = average_gain / average_loss
+        return 100 - 100 / (1 + relative_strength)
+
+    @staticmethod
+    def williams(
+        high: PriceData, low: PriceData, close: PriceData, period: int
+    ) -> PriceData:
+        highest_high = high.rolling(window=period).max()
+        lowest_low = low.rolling(window=period).min()
+        price_range = (highest_high - lowest_low).replace(0, np.nan)
+        return -100 * (highest_high - close) / price_range
+
+    @staticmethod
+    def adx(
+        high: PriceData, low: PriceData, close: PriceData, period: int
+    ) -> PriceData:
+        up_move = high.diff()
+        down_move = -low.diff()
+        # The first bar has no previous one, so no move nor true range
+        first_bar = up_move.isna()
+        plus_dm = up_move.where((up_move > down_move) & (up_move > 0), 0.0)
+        minus_dm = down_move.where((down_move > up_move) & (down_move > 0), 0.0)
+
+        previous_close = close.shift(1)
+        true_range = np.fmax(
+            high - low,
+            np.fmax((high - previous_close).abs(), (low - previous_close).abs()),
+        )
+        plus_dm = plus_dm.mask(first_bar)
+        minus_dm = minus_dm.mask(first_bar)
+        true_range = true_range.mask(first_bar)
+
+        average_true_range = IndicatorEngine.wilder(true_range, period)
+        plus_di = 100 * IndicatorEngine.wilder(plus_dm, period) / average_true_range
+        minus_di = 100 * IndicatorEngine.wilder(minus_dm, period) / average_true_range
+        di_sum = (plus_di + minus_di).replace(0, np.nan)
+        directional_index = 100 * (plus_di - minus_di).abs() / di_sum
+        return IndicatorEngine.wilder(directional_index, period)
+
+    @staticmethod
+    def macd(
+        close: PriceData, fast: int, slow: int, signal: int
+    ) -> Dict[str, PriceData]:
+        macd = IndicatorEngine.ema(close, fast) - IndicatorEngine.ema(close, slow)
+        macd_signal = IndicatorEngine.ema(macd, signal)
+        return {
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_hist": macd - macd_signal,
+        }
+
+    @staticmethod
+    def bollinger(
+        close: PriceData, period: int, num_std: float
+    ) -> Dict[str, PriceData]:
+        rolling = close.rolling(window=period)
+        middle = rolling.mean()
+        deviation = rolling.std(ddof=0) * num_std
+        return {
+            "bollinger_upper": middle + deviation,
+            "bollinger_middle": middle,
+            "bollinger_lower": middle - deviation,
+        }
+
+    @staticmethod
+    def compute_indicators(
+        close: PriceData, high: PriceData, low: PriceData, periods: Dict
+    ) -> Dict[str, PriceData]:
+        """Compute every indicator, returning one Series/DataFrame per column."""
+        indicators = {
+            "rsi": IndicatorEngine.rsi(
+                close, periods[StockTechnicalIndicator.RSI.name]
+            ),
+            "ema": IndicatorEngine.ema(
+                close, periods[StockTechnicalIndicator.EMA.name]
+            ),
+            "adx": IndicatorEngine.adx(
+                high, low, close, periods[StockTechnicalIndicator.ADX.name]
+            ),
+            "wma": IndicatorEngine.wma(
+                close, periods[StockTechnicalIndicator.WMA.name]
+            ),
+            "dema": IndicatorEngine.dema(
+                close, periods[StockTechnicalIndicator.DOUBLE_EMA.name]
+            ),
+            "tema": IndicatorEngine.tema(
+                close, periods[StockTechnicalIndicator.TRIPLE_EMA.name]
+            ),
+            "williams": IndicatorEngine.williams(
+                high, low, close, periods[StockTechnicalIndicator.WILLIAMS.name]
+            ),
+        }
+        indicators.update(
+            IndicatorEngine.macd(
+                close,
+                periods["MACD_FAST"],
+                periods["MACD_SLOW"],
+                periods["MACD_SIGNAL"],
+            )
+        )
+        indicators.update(
+            IndicatorEngine.bollinger(
+                close,
+                periods[StockTechnicalIndicator.BOLLINGER.name],
+                periods["BOLLINGER_STD"],
+            )
+        )
+        return indicators
+
+    @staticmethod
+    def compute_all(df: pd.DataFrame, app_config: Dict = None) -> pd.DataFrame:
+        """
+        Computes all technical indicators of one ticker from its OHLCV data.
+
+        Args:
+            df (pd.DataFrame): OHLCV data indexed by ascending date.
+            app_config (Dict): Application config holding INDICATORS.PERIODS.
+
+        Returns:
+            pd.DataFrame: One column per indicator, indexed like `df`.
+        """
+        indicators = IndicatorEngine.compute_indicators(
+            close=df["close"],
+            high=df["high"],
+            low=df["low"],
+            periods=IndicatorEngine.get_periods(app_config),
+        )
+        return pd.DataFrame(indicators, index=df.index)
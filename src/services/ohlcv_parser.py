@@ -0,0 +1,116 @@
+import io
+import json
+from array import array
+from datetime import date
+from typing import BinaryIO, Dict, Iterable
+import numpy as np
+import pandas as pd
+import ijson
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+ITEM_PREFIX = "historical.item"
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Bodies in memory below this size are decoded whole with json.loads, which is
+# faster than ijson; above it the per-bar dicts would cost more memory than
+# the speed is worth (about 40 years of daily bars)
+STREAM_THRESHOLD_BYTES = 4 * 1024**2
+
+
+class OhlcvParser:
+    """Builds typed, cleaned OHLCV frames from FMP historical-price-full data.
+
+    `from_stream` decodes the `historical` array incrementally with ijson and
+    appends each bar straight into compact typed buffers (8 bytes per value),
+    so the list of per-bar dicts is never materialized. The result is indexed
+    by ascending date, with float64 prices and int64 volume, and has the
+    zero-volume and flat bars removed.
+
+    ijson is about 60% slower than json.loads, so a body that is already in
+    memory and smaller than STREAM_THRESHOLD_BYTES is decoded with json.loads
+    by `from_bytes`; only larger bodies and live sockets pay for streaming.
+    """
+
+    @staticmethod
+    def from_stream(stream: BinaryIO) -> pd.DataFrame:
+        """
+        Parses a historical-price-full JSON body without loading it whole.
+
+        Args:
+            stream (BinaryIO): File-like object positioned at the JSON body.
+
+        Returns:
+            pd.DataFrame: Cleaned OHLCV frame, empty when there are no bars.
+        """
+        if isinstance(stream, io.BytesIO):
+            # Served from memory (response cache), the size is known
+            return OhlcvParser.from_bytes(stream.getvalue())
+        # Only one bar dict is alive at a time, unlike json.loads of the body
+        return OhlcvParser.from_bars(ijson.items(stream, ITEM_PREFIX, use_float=True))
+
+    @staticmethod
+    def from_bytes(body: bytes) -> pd.DataFrame:
+        """
+        Parses a historical-price-full JSON body held in memory.
+
+        Args:
+            body (bytes): The JSON body.
+
+        Returns:
+            pd.DataFrame: Cleaned OHLCV frame, empty when there are no bars.
+        """
+        if len(body) >= STREAM_THRESHOLD_BYTES:
+            return OhlcvParser.from_bars(
+                ijson.items(io.BytesIO(body), ITEM_PREFIX, use_float=True)
+            )
+        decoded = json.loads(body)
+        bars = decoded.get("historical") if isinstance(decoded, dict) else None
+        return OhlcvParser.from_bars(bars if isinstance(bars, list) else [])
+
+    @staticmethod
+    def from_bars(bars: Iterable[Dict]) -> pd.DataFrame:
+        """Cleaned OHLCV frame from historical-price-full bars, in any order."""
+        dates = array("q")
+        volumes = array("q")
+        prices = {field: array("d") for field in PRICE_FIELDS}
+
+        for bar in bars:
+            if not isinstance(bar, dict) or "date" not in bar:
+                continue
+            dates.append(
+                date.fromisoformat(bar["date"][:10]).toordinal() - EPOCH_ORDINAL
+            )
+            volumes.append(int(bar.get("volume") or 0))
+            for field in PRICE_FIELDS:
+                price = bar.get(field)
+                prices[field].append(np.nan if price is None else price)
+
+        index = pd.DatetimeIndex(
+            np.frombuffer(dates, dtype=np.int64)
+            .astype("datetime64[D]")
+            .astype("datetime64[ns]"),
+            name="date",
+        )
+        df = pd.DataFrame(
+            {
+                **{
+                    field: np.frombuffer(values, dtype=np.float64)
+                    for field, values in prices.items()
+                },
+                "volume": np.frombuffer(volumes, dtype=np.int64),
+            },
+            index=index,
+            copy=False,
+        )
+        return OhlcvParser.clean(df)
+
+    @staticmethod
+    def clean(df: pd.DataFrame) -> pd.DataFrame:
+        # Remove invalid data (zero volume or identical OHLC values)
+        flat = (
+            (df["open"] == df["high"])
+            & (df["high"] == df["low"])
+            & (df["low"] == df["close"])
+        )
+        valid = (df["volume"] > 0) & ~flat
+        # FMP returns the newest bar first, rolling windows need oldest first
+        return df[valid].sort_index()
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Union
+
+from src.exceptions.exceptions import HttpErrorException, CustomException
+from src.settings.shared import logger
+from src.utils.apis_call_handler import ApisHandler
+from src.utils.metrics import Metrics
+
+DEFAULT_PROFILE_BATCH_SIZE = 100
+
+
+class ProfileBatcher:
+    """Coalesces per-ticker /profile calls into comma-separated batch requests.
+
+    The run's tickers are cut into fixed batches of PROCESSING.PROFILE_BATCH_SIZE
+    up front. The first `get` of a ticker loads its whole batch; concurrent
+    callers of the same batch wait for that single request instead of sending
+    their own. Profiles are handed out once and dropped, and a batch that
+    fails falls back to the single-symbol call of the ticker asked for.
+    """
+
+    def __init__(self, app_config: Dict, tickers: List[str], batch_size: int) -> None:
+        self.app_config = app_config
+        self.batches = [
+            tickers[start : start + batch_size]
+            for start in range(0, len(tickers), batch_size)
+        ]
+        self.batch_of = {
+            ticker: index
+            for index, batch in enumerate(self.batches)
+            for ticker in batch
+        }
+        self.loads: Dict[int, Union[Future, asyncio.Task]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build_profile_url(app_config: Dict, symbols: List[str]) -> str:
+        fmp_config = app_config.get("API_KEYS", {}).get("FMP", {})
+        return (
+            f"{fmp_config.get('URL')}/profile/{','.join(symbols)}"
+            f"?apikey={fmp_config.get('API_TOKEN')}"
+        )
+
+    @staticmethod
+    def get_batch_size(app_config: Dict) -> int:
+        return app_config.get("PROCESSING", {}).get(
+            "PROFILE_BATCH_SIZE", DEFAULT_PROFILE_BATCH_SIZE
+        )
+
+    @staticmethod
+    def get_batcher(app_config: Dict, tickers: List[str]) -> Optional["ProfileBatcher"]:
+        """Batcher for the run, or None when PROCESSING.PROFILE_BATCH_SIZE <= 1."""
+        batch_size = ProfileBatcher.get_batch_size(app_config)
+        if batch_size <= 1:
+            return None
+        return ProfileBatcher(app_config, tickers, batch_size)
+
+    @staticmethod
+    def split_profiles(profiles: List[Dict]) -> Dict[str, Dict]:
+        return {
+            profile.get("symbol"): profile
+            for profile in profiles or []
+            if isinstance(profile, dict)
+        }
+
+    def load(self, index: int) -> Dict[str, Dict]:
+        url = ProfileBatcher.build_profile_url(self.app_config, self.batches[index])
+        Metrics.increment("profile_batches_total")
+        profiles = ApisHandler.get(app_config=self.app_config, url=url)
+        return self.split_profiles(profiles)
+
+    def get(self, ticker: str) -> List:
+        """
+        Profile of `ticker` in the shape of a single-symbol /profile response.
+
+        Args:
+            ticker (str): Symbol to look up.
+
+        Returns:
+            List: `[profile]`, or an empty list when FMP has no profile for it.
+
+        Raises:
+            HttpErrorException, CustomException: When the single-symbol
+            fallback fails as well.
+        """
+        index = self.batch_of.get(ticker)
+        if index is not None:
+            with self._lock:
+                load = self.loads.get(index)
+                owner = load is None
+                if owner:
+                    load = self.loads[index] = Future()
+            if owner:
+                try:
+                    load.set_result(self.load(index))
+                except Exception as error:
+                    load.set_exception(error)
+            try:
+                profiles = load.result()
+                profile = profiles.pop(ticker, None)
+                return [profile] if profile is not None else []
+            except (HttpErrorException, CustomException) as error:
+                logger.warning(
+                    f"Profile batch of {ticker} failed, fetching it alone. Reason {error}"
+                )
+
+        Metrics.increment("profile_single_requests_total")
+        url = ProfileBatcher.build_profile_url(self.app_config, [ticker])
+        return ApisHandler.get(app_config=self.app_config, url=url)
+
+
+class AsyncProfileBatcher(ProfileBatcher):
+    """asyncio counterpart of ProfileBatcher, sharing one task per batch."""
+
+    @staticmethod
+    def get_batcher(
+        app_config: Dict, tickers: List[str]
+    ) -> Optional["AsyncProfileBatcher"]:
+        batch_size = ProfileBatcher.get_batch_size(app_config)
+        if batch_size <= 1:
+            return None
+        return AsyncProfileBatcher(app_config, tickers, batch_size)
+
+    async def load(self, client, index: int) -> Dict[str, Dict]:
+        Metrics.increment("profile_batches_total")
+        profiles = await client.get(
+            url=ProfileBatcher.build_profile_url(self.app_config, self.batches[index])
+        )
+        return ProfileBatcher.split_profiles(profiles)
+
+    async def get(self, client, ticker: str) -> List:
+        index = self.batch_of.get(ticker)
+        if index is not None:
+            load = self.loads.get(index)
+            if load is None:
+                load = self.loads[index] = asyncio.ensure_future(
+                    self.load(client, index)
+                )
+            try:
+                profiles = await asyncio.shield(load)
+                profile = profiles.pop(ticker, None)
+                return [profile] if profile is not None else []
+            except (HttpErrorException, CustomException) as error:
+                logger.warning(
+                    f"Profile batch of {ticker} failed, fetching it alone. Reason {error}"
+                )
+
+        Metrics.increment("profile_single_requests_total")
+        return await client.get(
+            url=ProfileBatcher.build_profile_url(self.app_config, [ticker])
+        )
@@ -0,0 +1,399 @@
+import ast
+import operator
+import threading
+from typing import Dict, List, Optional, Set, Union
+
+import numpy as np
+import pandas as pd
+
+from src.exceptions.exceptions import CustomException
+from src.model.frame_schema import FRAME_COLUMNS
+from src.model.signal_index import (
+    DEFAULT_SIGNAL_INDEX_PATH,
+    DEFINED_SIGNAL,
+    PRESENT_SIGNAL,
+    SignalIndex,
+)
+from src.settings.shared import logger
+from src.utils.metrics import Metrics
+
+DEFAULT_RULES = {
+    "oversold_uptrend": "rsi < 30 and close > sma_200",
+    "golden_cross": "cross_above(sma_50, sma_200)",
+}
+COMPARISONS = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+}
+ARITHMETIC = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+}
+CROSSES = ("cross_above", "cross_below")
+
+# Column values of a whole frame, or of its previous bar
+Values = Dict[str, Union[np.ndarray, float]]
+
+
+class ScreenRule:
+    """Declarative screening rule such as "rsi < 30 and close > sma_200".
+
+    A rule combines signals with `and`, `or` and `not`. A signal is either a
+    comparison (<, <=, >, >=) between arithmetic expressions of frame
+    columns and numbers, e.g. "close > 1.05 * sma_200", or
+    cross_above(a, b) / cross_below(a, b), true on the bar where `a` moves
+    above (below) `b`. Signals are evaluated per ticker and stored in the
+    SignalIndex; the rule itself is only evaluated on their bitmaps.
+
+    A comparison with NaN is false, and so is its negation: `not` only holds
+    where every column under it is defined, so a ticker still in warm-up
+    (e.g. NaN sma_200) never matches "not close > sma_200".
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        try:
+            self.tree = ast.parse(expression, mode="eval").body
+        except SyntaxError as error:
+            raise CustomException(f"Invalid screen rule '{expression}': {error}")
+        self.signals: Dict[str, ast.expr] = {}
+        self.negated_columns: Set[str] = set()
+        self.validate(self.tree)
+
+    def fail(self, message: str) -> None:
+        raise CustomException(f"Invalid screen rule '{self.expression}': {message}")
+
+    def validate(self, node: ast.expr) -> None:
+        """Checks `node` is a combination of signals and collects the signals."""
+        if isinstance(node, ast.BoolOp):
+            for value in node.values:
+                self.validate(value)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            self.validate(node.operand)
+            self.negated_columns.update(ScreenRule.columns_of(node.operand))
+        elif isinstance(node, ast.Compare):
+            if len(node.ops) != 1 or type(node.ops[0]) not in COMPARISONS:
+                self.fail("comparisons take a single <, <=, > or >=")
+            self.validate_operand(node.left)
+            self.validate_operand(node.comparators[0])
+            self.signals[ast.unparse(node)] = node
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in CROSSES:
+                self.fail(f"only {' and '.join(CROSSES)} can be called")
+            if len(node.args) != 2 or node.keywords:
+                self.fail(f"{node.func.id} takes two arguments")
+            for argument in node.args:
+                self.validate_operand(argument)
+            self.signals[ast.unparse(node)] = node
+        else:
+            self.fail(f"'{ast.unparse(node)}' is not a signal")
+
+    def validate_operand(self, node: ast.expr) -> None:
+        if isinstance(node, ast.BinOp) and type(node.op) in ARITHMETIC:
+            self.validate_operand(node.left)
+            self.validate_operand(node.right)
+        elif isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            self.validate_operand(node.operand)
+        elif isinstance(node, ast.Name):
+            if node.id not in FRAME_COLUMNS:
+                self.fail(f"unknown column '{node.id}'")
+        elif not (
+            isinstance(node, ast.Constant)
+            and isinstance(node.value, (int, float))
+            and not isinstance(node.value, bool)
+        ):
+            self.fail(f"'{ast.unparse(node)}' is not a column, number or arithmetic")
+
+    @property
+    def bitmap_names(self) -> List[str]:
+        """Index bitmaps `combine` reads: the signals and the defined columns."""
+        return list(self.signals) + [
+            DEFINED_SIGNAL.format(column=column)
+            for column in sorted(self.negated_columns)
+        ]
+
+    @staticmethod
+    def columns_of(node: ast.expr) -> List[str]:
+        return sorted(
+            {child.id for child in ast.walk(node) if isinstance(child, ast.Name)}
+            - set(CROSSES)
+        )
+
+    @staticmethod
+    def value(node: ast.expr, values: Values):
+        if isinstance(node, ast.BinOp):
+            return ARITHMETIC[type(node.op)](
+                ScreenRule.value(node.left, values),
+                ScreenRule.value(node.right, values),
+            )
+        if isinstance(node, ast.UnaryOp):
+            return -ScreenRule.value(node.operand, values)
+        if isinstance(node, ast.Name):
+            return values[node.id]
+        return node.value
+
+    @staticmethod
+    def evaluate_signal(
+        node: ast.expr, values: Values, previous: Optional[Values] = None
+    ) -> np.ndarray:
+        """
+        Signal `node` on every bar of a frame.
+
+        Args:
+            node (ast.expr): Comparison or cross collected by `validate`.
+            values (Values): Column arrays of the frame, oldest bar first.
+            previous (Optional[Values]): Column values of the bar before the
+                frame; without it a cross is false on the first bar.
+
+        Returns:
+            np.ndarray: One bool per bar; comparisons with NaN are false.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if isinstance(node, ast.Compare):
+                return np.asarray(
+                    COMPARISONS[type(node.ops[0])](
+                        ScreenRule.value(node.left, values),
+                        ScreenRule.value(node.comparators[0], values),
+                    ),
+                    dtype=bool,
+                )
+
+            first, second = node.args
+            spread = np.asarray(
+                ScreenRule.value(first, values) - ScreenRule.value(second, values),
+                dtype=np.float64,
+            )
+            previous_spread = np.empty_like(spread)
+            previous_spread[1:] = spread[:-1]
+            previous_spread[:1] = (
+                ScreenRule.value(first, previous) - ScreenRule.value(second, previous)
+                if previous is not None
+                else np.nan
+            )
+            if node.func.id == "cross_above":
+                return (spread > 0) & (previous_spread <= 0)
+            return (spread < 0) & (previous_spread >= 0)
+
+    def combine(self, bitmaps: Dict[str, np.ndarray]) -> np.ndarray:
+        """Bitmap of the rule from the bitmaps of its signals."""
+
+        def evaluate(node: ast.expr) -> np.ndarray:
+            if isinstance(node, ast.BoolOp):
+                combine = (
+                    np.bitwise_and if isinstance(node.op, ast.And) else np.bitwise_or
+                )
+                return combine.reduce([evaluate(value) for value in node.values])
+            if isinstance(node, ast.UnaryOp):
+                # Padding bits past the last ticker flip too; unpack ignores them
+                negated = np.invert(evaluate(node.operand))
+                for column in ScreenRule.columns_of(node.operand):
+                    negated &= bitmaps[DEFINED_SIGNAL.format(column=column)]
+                return negated
+            return bitmaps[ast.unparse(node)]
+
+        return evaluate(self.tree)
+
+
+class SignalIndexBuilder:
+    """Evaluates the signals of SCREENER.RULES on each processed frame.
+
+    Configured by the SCREENER section: ENABLED, INDEX_PATH and RULES, a
+    mapping of rule name to expression. `add` runs on the worker threads
+    right after a ticker's frame is built, `close` merges the run into the
+    stored SignalIndex once all tickers are done.
+    """
+
+    def __init__(self, app_config: Dict = None) -> None:
+        screener_config = (app_config or {}).get("SCREENER", {})
+        self.path = screener_config.get("INDEX_PATH", DEFAULT_SIGNAL_INDEX_PATH)
+        self.rules = {
+            name: ScreenRule(expression)
+            for name, expression in screener_config.get("RULES", DEFAULT_RULES).items()
+        }
+        self.signals: Dict[str, ast.expr] = {}
+        for rule in self.rules.values():
+            self.signals.update(rule.signals)
+        self.columns = sorted(
+            {
+                column
+                for node in self.signals.values()
+                for column in ScreenRule.columns_of(node)
+            }
+        )
+        self.index = SignalIndex.load(self.path)
+        self.updates = {}
+        self.last_rows = {}
+        self._lock = threading.Lock()
+
+        new_signals = [
+            signal
+            for signal in list(self.signals)
+            + [DEFINED_SIGNAL.format(column=column) for column in self.columns]
+            if signal not in self.index.bitmaps
+        ]
+        if len(self.index.dates) and new_signals:
+            logger.warning(
+                f"Signals {new_signals} are new to {self.path}; they are only set "
+                "on the dates fetched from now on."
+            )
+
+    @staticmethod
+    def get_builder(app_config: Dict) -> Optional["SignalIndexBuilder"]:
+        """Builder for the run, or None when SCREENER.ENABLED is false."""
+        screener_config = app_config.get("SCREENER", {})
+        if not screener_config.get("ENABLED", True):
+            return None
+        if not screener_config.get("RULES", DEFAULT_RULES):
+            return None
+        return SignalIndexBuilder(app_config)
+
+    def add(self, ticker: str, df: Optional[pd.DataFrame]) -> None:
+        if df is None or df.empty:
+            return
+        with Metrics.timer("signal_evaluation"):
+            dates = df.index.values.astype("datetime64[D]")
+            values = {
+                column: df[column].to_numpy(dtype=np.float64) for column in self.columns
+            }
+            previous = self.index.last_rows.get(ticker)
+            if previous is not None and (
+                # A full re-fetch, not a continuation of the stored bars
+                np.datetime64(previous["date"]) >= dates[0]
+                or any(column not in previous for column in self.columns)
+            ):
+                previous = None
+            signals = {
+                signal: ScreenRule.evaluate_signal(node, values, previous)
+                for signal, node in self.signals.items()
+            }
+            for column in self.columns:
+                signals[DEFINED_SIGNAL.format(column=column)] = ~np.isnan(
+                    values[column]
+                )
+            signals[PRESENT_SIGNAL] = np.ones(len(dates), dtype=bool)
+            last_row = {column: float(values[column][-1]) for column in self.columns}
+            last_row["date"] = str(dates[-1])
+        with self._lock:
+            self.updates[ticker] = (dates, signals)
+            self.last_rows[ticker] = last_row
+
+    def add_index(self, index: SignalIndex) -> None:
+        """Queue every ticker of another index, e.g. a shard's, as an update."""
+        if not index.tickers or PRESENT_SIGNAL not in index.bitmaps:
+            return
+        unpacked = {
+            signal: index.unpack(bitmap) for signal, bitmap in index.bitmaps.items()
+        }
+        present = unpacked[PRESENT_SIGNAL]
+        with self._lock:
+            for column, ticker in enumerate(index.tickers):
+                rows = present[:, column]
+                self.updates[ticker] = (
+                    index.dates[rows],
+                    {
+                        signal: matrix[rows, column]
+                        for signal, matrix in unpacked.items()
+                    },
+                )
+                if ticker in index.last_rows:
+                    self.last_rows[ticker] = index.last_rows[ticker]
+
+    def close(self) -> Dict[str, List[str]]:
+        """
+        Stores the signals of the run and screens every rule on the latest date.
+
+        Returns:
+            Dict[str, List[str]]: Tickers matching each rule on the latest date
+            of the index.
+        """
+        with self._lock:
+            updates, self.updates = self.updates, {}
+            last_rows, self.last_rows = self.last_rows, {}
+        if not updates:
+            return {}
+        with Metrics.timer("signal_index_merge"):
+            index = self.index.merge(updates)
+            index.last_rows = {**self.index.last_rows, **last_rows}
+            index.save(self.path)
+        self.index = index
+        logger.info(
+            f"Signal index at {self.path} updated: {len(updates)} tickers, "
+            f"{len(index.tickers)} indexed over {len(index.dates)} dates."
+        )
+
+        screener = Screener(index, self.rules)
+        results = {name: screener.latest(name) for name in self.rules}
+        for name, tickers in results.items():
+            logger.info(f"Screen {name} on {index.dates[-1]}: {len(tickers)} tickers")
+        return results
+
+
+class Screener:
+    """Runs screening rules on a SignalIndex.
+
+    Usage:
+        screener = Screener.get_screener(app_config)
+        screener.screen("rsi < 30 and close > sma_200", start_date="2024-01-01")
+    """
+
+    def __init__(self, index: SignalIndex, rules: Dict[str, ScreenRule] = None) -> None:
+        self.index = index
+        self.rules = rules or {}
+
+    @staticmethod
+    def get_screener(app_config: Dict) -> "Screener":
+        screener_config = app_config.get("SCREENER", {})
+        return Screener(
+            SignalIndex.load(
+                screener_config.get("INDEX_PATH", DEFAULT_SIGNAL_INDEX_PATH)
+            ),
+            {
+                name: ScreenRule(expression)
+                for name, expression in screener_config.get(
+                    "RULES", DEFAULT_RULES
+                ).items()
+            },
+        )
+
+    def rule(self, name_or_expression: str) -> ScreenRule:
+        return self.rules.get(name_or_expression) or ScreenRule(name_or_expression)
+
+    def screen(
+        self,
+        name_or_expression: str,
+        start_date: str = None,
+        end_date: str = None,
+    ) -> Dict[str, List[str]]:
+        """
+        Tickers matching a rule, per date.
+
+        Args:
+            name_or_expression (str): Name of a SCREENER.RULES entry, or an
+                expression whose signals are all in the index.
+            start_date (str): First date to report, the whole index when omitted.
+            end_date (str): Last date to report.
+
+        Returns:
+            Dict[str, List[str]]: ISO date to matching tickers, dates without
+            matches left out.
+
+        Raises:
+            CustomException: When the rule is invalid or uses a signal the
+                index does not hold.
+        """
+        rule = self.rule(name_or_expression)
+        with Metrics.timer("screen"):
+            bitmaps = {name: self.index.bitmap(name) for name in rule.bitmap_names}
+            bitmap = rule.combine(bitmaps) & self.index.bitmap(PRESENT_SIGNAL)
+            return self.index.matches(bitmap, start_date, end_date)
+
+    def latest(self, name_or_expression: str) -> List[str]:
+        """Tickers matching a rule on the latest indexed date."""
+        if not len(self.index.dates):
+            return []
+        latest = str(self.index.dates[-1])
+        return self.screen(name_or_expression, start_date=latest).get(latest, [])
@@ -1,11 +1,35 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict
 import pandas as pd
 
 from src.exceptions.exceptions import HttpErrorException, CustomException
 from src.utils.apis_call_handler import ApisHandler
 from src.enums.stock_indicator import StockTechnicalIndicator
-from src.settings.shared import logger
+from src.settings.shared import logger, get_app_config
 from src.services.helper import HelperMethods
+from src.services.indicator_engine import IndicatorEngine
+from src.services.ohlcv_parser import OhlcvParser
+from src.utils.decorators import time_execution
+from src.utils.metrics import Metrics
+
+DEFAULT_INDICATOR_WORKERS = 32
+
+# MACD and Bollinger are only computed by the local IndicatorEngine. SMA is
+# not fetched either: FrameSchema only keeps sma_50/sma_200, which
+# DataCollector computes from the OHLCV bars
+INDICATORS_TO_FETCH = {
+    "rsi": StockTechnicalIndicator.RSI,
+    "ema": StockTechnicalIndicator.EMA,
+    "adx": StockTechnicalIndicator.ADX,
+    "wma": StockTechnicalIndicator.WMA,
+    "dema": StockTechnicalIndicator.DOUBLE_EMA,
+    "tema": StockTechnicalIndicator.TRIPLE_EMA,
+    "williams": StockTechnicalIndicator.WILLIAMS,
+}
+
+_indicator_executor = None
+_indicator_executor_lock = threading.Lock()
 
 
 class TechnicalIndicators:
@@ -14,15 +38,67 @@ class TechnicalIndicators:
         base_url: str, ticker: str, api_token: str, date_range: str = None
     ) -> List:
         # Fetch historical OHLCV data
-        historical_url = (
-            f"{base_url}/historical-price-full/{ticker}?apikey={api_token}{date_range}"
+        historical_url = TechnicalIndicators.build_ohlcv_url(
+            base_url, ticker, api_token, date_range
         )
         historical_response = ApisHandler.get(url=historical_url)
-        historical_data = historical_response.get("historical", [])
+        return TechnicalIndicators.parse_ohlcv_response(ticker, historical_response)
+
+    @staticmethod
+    def get_ohlcv_frame(
+        base_url: str, ticker: str, api_token: str, date_range: str = None
+    ) -> pd.DataFrame:
+        """
+        Fetches historical OHLCV data, decoding the response as it streams in.
+
+        Args:
+            base_url (str): FMP base URL.
+            ticker (str): Symbol to fetch.
+            api_token (str): FMP API key.
+            date_range (str): Optional `&from=...&to=...` query suffix.
+
+        Returns:
+            pd.DataFrame: Cleaned OHLCV frame indexed by ascending date.
+        """
+        historical_url = TechnicalIndicators.build_ohlcv_url(
+            base_url, ticker, api_token, date_range
+        )
+        with ApisHandler.get_stream(url=historical_url) as stream:
+            try:
+                with Metrics.timer("ohlcv_parse"):
+                    df = OhlcvParser.from_stream(stream)
+            except Exception as error:
+                raise CustomException(
+                    message=f"Reading historical data of {ticker} failed, reason {error}"
+                ) from error
+        if df.empty:
+            logger.error(f"No historical data found for {ticker}")
+        return df
+
+    @staticmethod
+    def build_ohlcv_url(
+        base_url: str, ticker: str, api_token: str, date_range: str = None
+    ) -> str:
+        return f"{base_url}/historical-price-full/{ticker}?apikey={api_token}{date_range or ''}"
+
+    @staticmethod
+    def parse_ohlcv_response(ticker: str, historical_response: Dict) -> List:
+        historical_data = (historical_response or {}).get("historical", [])
         if not historical_data:
             logger.error(f"No historical data found for {ticker}")
             return []
-        return historical_response.get("historical", [])
+        return historical_data
+
+    @staticmethod
+    def build_indicator_url(
+        base_url: str,
+        ticker: str,
+        api_token: str,
+        date_range: str = None,
+        indicator_type: str = None,
+    ) -> str:
+        period = TechnicalIndicators.get_indicator_period(indicator_type)
+        return f"{base_url}/technical_indicator/1day/{ticker}?type={indicator_type}&period={period}&apikey={api_token}{date_range or ''}"
 
     @staticmethod
     def compute_sma(df: pd.DataFrame, window: int) -> pd.Series:
@@ -38,6 +114,28 @@ class TechnicalIndicators:
         """
         return df["close"].rolling(window=window).mean()
 
+    @staticmethod
+    def compute_local_indicators(
+        df: pd.DataFrame, app_config: Dict = None
+    ) -> pd.DataFrame:
+        """
+        Computes the technical indicators locally instead of calling FMP.
+
+        Args:
+            df (pd.DataFrame): OHLCV data indexed by ascending date.
+            app_config (Dict): Application config holding INDICATORS.PERIODS.
+
+        Returns:
+            pd.DataFrame: One column per indicator, indexed like `df`.
+        """
+        with Metrics.timer("indicators_local"):
+            return IndicatorEngine.compute_all(df, app_config=app_config)
+
+    @staticmethod
+    def get_indicator_period(indicator_type: str) -> int:
+        periods = IndicatorEngine.get_periods(get_app_config())
+        return periods[StockTechnicalIndicator(indicator_type).name]
+
     @staticmethod
     def get_tech_indicator_data(
         base_url: str,
@@ -47,7 +145,9 @@ class TechnicalIndicators:
         indicator_type: str = None,
     ) -> List:
         try:
-            url = f"{base_url}/technical_indicator/1day/{ticker}?type={indicator_type}&period=14&apikey={api_token}{date_range}"
+            url = TechnicalIndicators.build_indicator_url(
+                base_url, ticker, api_token, date_range, indicator_type
+            )
             indicator_data = ApisHandler.get(url=url)
             if not indicator_data:
                 logger.error(f"No {indicator_type} data found for {ticker}")
@@ -64,94 +164,52 @@ class TechnicalIndicators:
         return []
 
     @staticmethod
+    def get_indicator_executor() -> ThreadPoolExecutor:
+        """Executor shared by every ticker to issue indicator requests in parallel."""
+        global _indicator_executor
+        with _indicator_executor_lock:
+            if _indicator_executor is None:
+                max_workers = (
+                    get_app_config()
+                    .get("PROCESSING", {})
+                    .get("INDICATOR_WORKERS", DEFAULT_INDICATOR_WORKERS)
+                )
+                _indicator_executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="indicator"
+                )
+            return _indicator_executor
+
+    @staticmethod
+    @time_execution
     def fetch_all_technical_indicator(
         base_url: str, ticker: str, api_token: str, date_range: str = None
     ) -> pd.DataFrame:
-        # Fetch technical indicators
-
-        rsi_data = TechnicalIndicators.get_tech_indicator_data(
-            base_url=base_url,
-            ticker=ticker,
-            api_token=api_token,
-            date_range=date_range,
-            indicator_type=StockTechnicalIndicator.RSI.value,
-        )
-        # macd_data = TechnicalIndicators.get_tech_indicator_data(
-        #     base_url=base_url,
-        #     ticker=ticker,
-        #     api_token=api_token,
-        #     date_range=date_range,
-        #     indicator_type=StockTechnicalIndicator.MACD.value
-        # )
-        sma_data = TechnicalIndicators.get_tech_indicator_data(
-            base_url=base_url,
-            ticker=ticker,
-            api_token=api_token,
-            date_range=date_range,
-            indicator_type=StockTechnicalIndicator.SMA.value,
-        )
-        # bollinger_data = TechnicalIndicators.get_tech_indicator_data(
-        #     base_url=base_url,
-        #     ticker=ticker,
-        #     api_token=api_token,
-        #     date_range=date_range,
-        #     indicator_type=StockTechnicalIndicator.BOLLINGER.value
-        # )
-        ema = TechnicalIndicators.get_tech_indicator_data(
-            base_url=base_url,
-            ticker=ticker,
-            api_token=api_token,
-            date_range=date_range,
-            indicator_type=StockTechnicalIndicator.EMA.value,
-        )
-        adx = TechnicalIndicators.get_tech_indicator_data(
-            base_url=base_url,
-            ticker=ticker,
-            api_token=api_token,
-            date_range=date_range,
-            indicator_type=StockTechnicalIndicator.ADX.value,
-        )
-        wma = TechnicalIndicators.get_tech_indicator_data(
-            base_url=base_url,
-            ticker=ticker,
-            api_token=api_token,
-            date_range=date_range,
-            indicator_type=StockTechnicalIndicator.WMA.value,
-        )
-        dema = TechnicalIndicators.get_tech_indicator_data(
-            base_url=base_url,
-            ticker=ticker,
-            api_token=api_token,
-            date_range=date_range,
-            indicator_type=StockTechnicalIndicator.DOUBLE_EMA.value,
-        )
-        tema = TechnicalIndicators.get_tech_indicator_data(
-            base_url=base_url,
-            ticker=ticker,
-            api_token=api_token,
-            date_range=date_range,
-            indicator_type=StockTechnicalIndicator.TRIPLE_EMA.value,
-        )
-        williams = TechnicalIndicators.get_tech_indicator_data(
-            base_url=base_url,
-            ticker=ticker,
-            api_token=api_token,
-            date_range=date_range,
-            indicator_type=StockTechnicalIndicator.WILLIAMS.value,
-        )
-
-        indicators = {
-            "rsi": rsi_data,
-            "sma": sma_data,
-            "ema": ema,
-            "adx": adx,
-            "wma": wma,
-            "dema": dema,
-            "tema": tema,
-            "williams": williams,
+        # Fetch technical indicators concurrently, one request per indicator
+        executor = TechnicalIndicators.get_indicator_executor()
+        futures = {
+            name: executor.submit(
+                TechnicalIndicators.get_tech_indicator_data,
+                base_url=base_url,
+                ticker=ticker,
+                api_token=api_token,
+                date_range=date_range,
+                indicator_type=indicator.value,
+            )
+            for name, indicator in INDICATORS_TO_FETCH.items()
         }
 
-        df = HelperMethods.merge_indicator_data(indicators)
+        indicators = {}
+        for name, future in futures.items():
+            try:
+                indicators[name] = future.result()
+            except Exception as error:
+                logger.error(
+                    f"Failed to fetch {name} data for {ticker}. Error: {error}"
+                )
+                indicators[name] = []
+
+        with Metrics.timer("indicators_merge"):
+            df = HelperMethods.merge_indicator_data(indicators)
         if df.empty:
             logger.warning(f"No technical indicators found for {ticker}.")
             return df
@@ -1,5 +1,9 @@
 import logging
 import json
+from numbers import Number
+from typing import Dict, List
+
+from src.exceptions.exceptions import InvalidConfigException
 
 # Create logget with a stdout handler and a formater
 logger = logging.getLogger("stock_analyser")
@@ -16,12 +20,116 @@ logger.addHandler(console)
 logger.setLevel(logging.INFO)
 app_config = {}
 
+# Kept here instead of imported from the modules that read them, so that a
+# bad config is rejected before pandas, requests or the repository layer load
+REQUIRED_KEYS = [("API_KEYS", "FMP", "URL"), ("API_KEYS", "FMP", "API_TOKEN")]
+CHOICES = {
+    ("PROCESSING", "ENGINE"): ("threads", "asyncio"),
+    ("PROCESSING", "INDICATOR_SOURCE"): ("local", "remote"),
+    ("CACHE", "MODE"): ("online", "offline"),
+}
+POSITIVE_NUMBERS = [
+    ("API_KEYS", "FMP", "RATE_LIMIT_PER_MINUTE"),
+    ("API_KEYS", "FMP", "RATE_LIMIT_BURST"),
+    ("API_KEYS", "FMP", "POOL_SIZE"),
+    ("PROCESSING", "MAX_WORKERS"),
+    ("PROCESSING", "MAX_CONCURRENCY"),
+    ("PROCESSING", "INDICATOR_WORKERS"),
+    ("PROCESSING", "SHARD_COUNT"),
+    ("PERSISTENCE", "CHUNK_SIZE"),
+    ("PERSISTENCE", "QUEUE_SIZE"),
+    ("CHECKPOINT", "FLUSH_EVERY"),
+    ("INCREMENTAL", "WARMUP_BARS"),
+    ("CACHE", "MAX_BYTES"),
+    ("SCHEDULER", "DAILY_QUOTA"),
+    ("SCHEDULER", "MAX_STALENESS_DAYS"),
+    ("SCHEDULER", "FAILURE_DECAY"),
+    ("DATA_QUALITY", "MAX_GAP_DAYS"),
+    ("DATA_QUALITY", "MAX_JUMP"),
+    ("UNIVERSE", "MAX_SHRINK"),
+]
+
+
+def lookup(config: Dict, path: tuple):
+    value = config
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def validate_app_config(config: Dict) -> List[str]:
+    """
+    Checks the keys a run cannot do without and the values it would only
+    reject once tickers are being processed.
+
+    Args:
+        config (Dict): Application config to check.
 
-def set_app_config(config_file_path: str = "config/config.json"):
+    Returns:
+        List[str]: One message per problem, empty when the config is valid.
+    """
+    if not isinstance(config, dict):
+        return ["the config must be a JSON object"]
+
+    errors = []
+    for path in REQUIRED_KEYS:
+        if not lookup(config, path):
+            errors.append(f"{'.'.join(path)} is required")
+    for path, choices in CHOICES.items():
+        value = lookup(config, path)
+        if value is not None and value not in choices:
+            errors.append(f"{'.'.join(path)} must be one of {', '.join(choices)}")
+    for path in POSITIVE_NUMBERS:
+        value = lookup(config, path)
+        if value is not None and (
+            isinstance(value, bool) or not isinstance(value, Number) or value <= 0
+        ):
+            errors.append(f"{'.'.join(path)} must be a positive number")
+
+    if lookup(config, ("DATA_QUALITY", "ADJUST_SPLITS")) and lookup(
+        config, ("INCREMENTAL", "ENABLED")
+    ):
+        # The stored bars before a split would stay unadjusted
+        errors.append(
+            "DATA_QUALITY.ADJUST_SPLITS cannot be combined with INCREMENTAL.ENABLED"
+        )
+    shard_index = lookup(config, ("PROCESSING", "SHARD_INDEX")) or 0
+    shard_count = lookup(config, ("PROCESSING", "SHARD_COUNT")) or 1
+    if not (
+        isinstance(shard_index, int)
+        and isinstance(shard_count, int)
+        and 0 <= shard_index < shard_count
+    ):
+        errors.append(
+            f"PROCESSING.SHARD_INDEX must be in [0, {shard_count}), got {shard_index}"
+        )
+    return errors
+
+
+def set_app_config(config_file_path: str = "config/config.json", config: dict = None):
+    """
+    Loads and validates the app config.
+
+    Raises:
+        InvalidConfigException: When the file cannot be read or the config
+            fails `validate_app_config`, before any heavy module is imported.
+    """
     global app_config
 
-    with open(config_file_path) as f:
-        app_config = json.load(f)
+    # An already loaded config, e.g. handed to a shard process
+    if config is None:
+        try:
+            with open(config_file_path) as f:
+                config = json.load(f)
+        except (OSError, ValueError) as error:
+            raise InvalidConfigException([f"cannot read {config_file_path}: {error}"])
+
+    errors = validate_app_config(config)
+    if errors:
+        raise InvalidConfigException(errors)
+    app_config = config
 
 
 def get_app_config():
@@ -0,0 +1,278 @@
+import math
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from src.enums.ticker_status import TickerStatus
+from src.settings.shared import logger
+from src.stock_analyser.run_summary import TickerResult
+
+DEFAULT_SCHEDULE_PATH = "state/schedule.sqlite"
+DEFAULT_MAX_STALENESS_DAYS = 30
+DEFAULT_FAILURE_DECAY = 0.5
+
+
+@dataclass
+class ScheduleForecast:
+    budget: Optional[int]
+    spent_today: int
+    calls_per_ticker: float
+    calls_needed: int
+    calls_scheduled: int
+    tickers_scheduled: int
+    tickers_deferred: int
+
+    @property
+    def fits(self) -> bool:
+        return self.budget is None or self.calls_needed <= self.budget
+
+
+class QuotaScheduler:
+    """Orders a run's tickers by refresh value and fits them in the FMP quota.
+
+    Configured by the SCHEDULER section: ENABLED, PATH, DAILY_QUOTA,
+    MAX_STALENESS_DAYS and FAILURE_DECAY. Per ticker it keeps when the data
+    was last refreshed, its market cap and its consecutive failures; the
+    value of refreshing it is
+
+        min(days since refresh, MAX_STALENESS_DAYS)
+            * (1 + log10(1 + market_cap))
+            * FAILURE_DECAY ** failures
+
+    so stale large caps come first and tickers that keep failing sink
+    without being dropped. Tickers never refreshed count as MAX_STALENESS_DAYS
+    stale, with the median market cap when theirs is unknown.
+
+    The calls sent by every run are recorded per UTC day. A run gets what is
+    left of DAILY_QUOTA today and only schedules the tickers that fit in it,
+    at the calls per ticker measured on the previous run, or estimated from
+    the config before there is one. The others are deferred to the next run.
+    """
+
+    def __init__(self, app_config: Dict = None) -> None:
+        self.app_config = app_config or {}
+        scheduler_config = self.app_config.get("SCHEDULER", {})
+        self.path = scheduler_config.get("PATH", DEFAULT_SCHEDULE_PATH)
+        self.daily_quota = scheduler_config.get("DAILY_QUOTA")
+        self.max_staleness_days = scheduler_config.get(
+            "MAX_STALENESS_DAYS", DEFAULT_MAX_STALENESS_DAYS
+        )
+        self.failure_decay = scheduler_config.get(
+            "FAILURE_DECAY", DEFAULT_FAILURE_DECAY
+        )
+        self.forecast: Optional[ScheduleForecast] = None
+        self.started_at = time.time()
+        self.pending_results: List[TickerResult] = []
+        self.pending_market_caps: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS ticker_state (
+                symbol TEXT PRIMARY KEY,
+                refreshed_at REAL,
+                market_cap REAL,
+                failures INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                started_at REAL PRIMARY KEY,
+                day TEXT NOT NULL,
+                tickers INTEGER NOT NULL,
+                calls INTEGER NOT NULL
+            );
+            """)
+        self.connection.commit()
+
+    @staticmethod
+    def get_scheduler(app_config: Dict) -> Optional["QuotaScheduler"]:
+        """Scheduler for the run, or None when SCHEDULER.ENABLED is not set."""
+        if not app_config.get("SCHEDULER", {}).get("ENABLED", False):
+            return None
+        return QuotaScheduler(app_config)
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(timezone.utc).date().isoformat()
+
+    @staticmethod
+    def estimate_calls_per_ticker(app_config: Dict) -> float:
+        """FMP calls of one ticker as configured: profile, history, indicators."""
+        # Only needed to plan, and they pull in requests and pandas
+        from src.services.profile_batcher import ProfileBatcher
+        from src.services.technical_indicators import INDICATORS_TO_FETCH
+
+        batch_size = ProfileBatcher.get_batch_size(app_config)
+        calls = 1 / batch_size if batch_size > 1 else 1
+        calls += 1
+        indicator_source = app_config.get("PROCESSING", {}).get(
+            "INDICATOR_SOURCE", "local"
+        )
+        if indicator_source == "remote":
+            calls += len(INDICATORS_TO_FETCH)
+        return calls
+
+    def calls_per_ticker(self) -> float:
+        with self._lock:
+            previous = self.connection.execute(
+                "SELECT tickers, calls FROM runs WHERE tickers > 0 "
+                "ORDER BY started_at DESC LIMIT 1"
+            ).fetchone()
+        if previous is not None and previous[1] > 0:
+            return previous[1] / previous[0]
+        return QuotaScheduler.estimate_calls_per_ticker(self.app_config)
+
+    def spent_today(self) -> int:
+        with self._lock:
+            return self.connection.execute(
+                "SELECT COALESCE(SUM(calls), 0) FROM runs WHERE day = ?",
+                (QuotaScheduler.today(),),
+            ).fetchone()[0]
+
+    def priorities(self, tickers: List[str]) -> Dict[str, float]:
+        """Refresh value of every ticker, higher first."""
+        with self._lock:
+            states = {
+                row[0]: row[1:]
+                for row in self.connection.execute(
+                    "SELECT symbol, refreshed_at, market_cap, failures FROM ticker_state"
+                )
+            }
+        known_caps = [
+            math.log10(1 + state[1])
+            for state in states.values()
+            if state[1] is not None and state[1] > 0
+        ]
+        default_size = statistics.median(known_caps) if known_caps else 0.0
+
+        now = time.time()
+        priorities = {}
+        for ticker in tickers:
+            refreshed_at, market_cap, failures = states.get(ticker, (None, None, 0))
+            staleness = self.max_staleness_days
+            if refreshed_at is not None:
+                staleness = min((now - refreshed_at) / 86400, staleness)
+            size = (
+                math.log10(1 + market_cap)
+                if market_cap is not None and market_cap > 0
+                else default_size
+            )
+            priorities[ticker] = staleness * (1 + size) * self.failure_decay**failures
+        return priorities
+
+    def plan(self, tickers: List[str]) -> List[str]:
+        """
+        Tickers of the run, most valuable first and within today's quota.
+
+        Args:
+            tickers (List[str]): Tickers the run would process.
+
+        Returns:
+            List[str]: The scheduled ones in priority order; `forecast` holds
+            the calls they need against the budget.
+        """
+        priorities = self.priorities(tickers)
+        ordered = sorted(tickers, key=lambda ticker: (-priorities[ticker], ticker))
+        calls_per_ticker = self.calls_per_ticker()
+        spent_today = self.spent_today()
+
+        budget = None
+        scheduled = ordered
+        if self.daily_quota is not None:
+            budget = max(0, int(self.daily_quota - spent_today))
+            scheduled = ordered[: int(budget // calls_per_ticker)]
+
+        self.forecast = ScheduleForecast(
+            budget=budget,
+            spent_today=spent_today,
+            calls_per_ticker=round(calls_per_ticker, 3),
+            calls_needed=math.ceil(len(ordered) * calls_per_ticker),
+            calls_scheduled=math.ceil(len(scheduled) * calls_per_ticker),
+            tickers_scheduled=len(scheduled),
+            tickers_deferred=len(ordered) - len(scheduled),
+        )
+        if self.forecast.fits:
+            logger.info(
+                f"Forecast: {self.forecast.calls_needed} FMP calls for "
+                f"{len(ordered)} tickers ({calls_per_ticker:.2f} per ticker), "
+                f"budget {budget if budget is not None else 'unlimited'}."
+            )
+        else:
+            logger.warning(
+                f"Forecast: {self.forecast.calls_needed} FMP calls for "
+                f"{len(ordered)} tickers exceed the {budget} left of today's "
+                f"quota ({spent_today} spent); scheduling the "
+                f"{len(scheduled)} most valuable, deferring "
+                f"{self.forecast.tickers_deferred}."
+            )
+        return scheduled
+
+    def observe(self, ticker: str, stock_metadata: Optional[Dict]) -> None:
+        """Remember the market cap of a ticker from its profile."""
+        if not stock_metadata or not stock_metadata.get("market_cap"):
+            return
+        with self._lock:
+            self.pending_market_caps[ticker] = float(stock_metadata["market_cap"])
+
+    def record(self, result: TickerResult) -> None:
+        with self._lock:
+            self.pending_results.append(result)
+
+    def close(self, calls: int) -> None:
+        """
+        Store the outcomes of the run and the calls it sent, then close.
+
+        A skipped ticker counts as refreshed, since there was nothing more to
+        fetch for it, and a failed one adds to its consecutive failures.
+        """
+        now = time.time()
+        with self._lock:
+            results, self.pending_results = self.pending_results, []
+            market_caps, self.pending_market_caps = self.pending_market_caps, {}
+            connection = self.connection
+            connection.executemany(
+                """
+                INSERT INTO ticker_state (symbol, refreshed_at, failures)
+                VALUES (?, ?, 0)
+                ON CONFLICT (symbol) DO UPDATE SET
+                    refreshed_at = excluded.refreshed_at, failures = 0
+                """,
+                [
+                    (result.ticker, now)
+                    for result in results
+                    if result.status != TickerStatus.FAILED
+                ],
+            )
+            connection.executemany(
+                """
+                INSERT INTO ticker_state (symbol, failures) VALUES (?, 1)
+                ON CONFLICT (symbol) DO UPDATE SET failures = failures + 1
+                """,
+                [
+                    (result.ticker,)
+                    for result in results
+                    if result.status == TickerStatus.FAILED
+                ],
+            )
+            connection.executemany(
+                """
+                INSERT INTO ticker_state (symbol, market_cap) VALUES (?, ?)
+                ON CONFLICT (symbol) DO UPDATE SET market_cap = excluded.market_cap
+                """,
+                list(market_caps.items()),
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO runs (started_at, day, tickers, calls) "
+                "VALUES (?, ?, ?, ?)",
+                (self.started_at, QuotaScheduler.today(), len(results), calls),
+            )
+            connection.commit()
+            connection.close()
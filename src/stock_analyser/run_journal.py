@@ -0,0 +1,228 @@
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import replace
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
+
+from src.enums.ticker_status import TickerStatus
+from src.settings.shared import logger
+from src.stock_analyser.run_summary import TickerResult
+
+if TYPE_CHECKING:
+    from src.model.persistence_writer import PersistenceWriter
+
+DEFAULT_JOURNAL_PATH = "state/run_journal.sqlite"
+DEFAULT_FLUSH_EVERY = 200
+COMPLETED_STATUSES = (TickerStatus.SUCCEEDED.value, TickerStatus.SKIPPED.value)
+# A skip only completes a ticker when FMP had no data for it, i.e. without error
+COMPLETED_QUERY = (
+    "SELECT ticker FROM ticker_results WHERE run_id = ? "
+    "AND (status = ? OR (status = ? AND error IS NULL))"
+)
+
+
+class RunJournal:
+    """SQLite checkpoint of a universe run, used to resume it after a crash.
+
+    Configured by the CHECKPOINT section: ENABLED, PATH and FLUSH_EVERY. Each
+    ticker outcome is kept in memory and committed in batches of FLUSH_EVERY
+    results, so recording costs a list append in the hot loop. With a
+    PersistenceWriter attached, a batch is only committed once the writer has
+    stored every record submitted before it, and a ticker whose records the
+    writer failed to store is committed as failed, so a ticker marked
+    succeeded in the journal is never missing from the database.
+
+    A resumed run reuses the latest run of the journal and its dates, skips
+    the tickers that succeeded or were skipped for lack of data, and
+    processes the others again, including every ticker that failed.
+    """
+
+    def __init__(self, app_config: Dict = None) -> None:
+        checkpoint_config = (app_config or {}).get("CHECKPOINT", {})
+        self.path = checkpoint_config.get("PATH", DEFAULT_JOURNAL_PATH)
+        self.flush_every = checkpoint_config.get("FLUSH_EVERY", DEFAULT_FLUSH_EVERY)
+        self.run_id = None
+        self.start_date = None
+        self.end_date = None
+        self.writer: Optional["PersistenceWriter"] = None
+        self.pending: List[TickerResult] = []
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                start_date TEXT,
+                end_date TEXT,
+                started_at REAL NOT NULL,
+                finished_at REAL
+            )
+            """)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS ticker_results (
+                run_id TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                status TEXT NOT NULL,
+                elapsed REAL NOT NULL,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 1,
+                recorded_at REAL NOT NULL,
+                PRIMARY KEY (run_id, ticker)
+            )
+            """)
+        self.connection.commit()
+
+    @staticmethod
+    def get_journal(app_config: Dict) -> Optional["RunJournal"]:
+        """Journal for the run, or None when CHECKPOINT.ENABLED is false."""
+        if not app_config.get("CHECKPOINT", {}).get("ENABLED", True):
+            return None
+        return RunJournal(app_config)
+
+    def begin(
+        self,
+        tickers: List[str],
+        start_date: str = None,
+        end_date: str = None,
+        resume: bool = False,
+    ) -> List[str]:
+        """
+        Opens a new run, or reopens the latest one when `resume` is set.
+
+        Args:
+            tickers (List[str]): Universe of the run.
+            start_date (str): First date to fetch; a resumed run keeps its own
+                dates when this is omitted.
+            end_date (str): Last date to fetch, same rule as `start_date`.
+            resume (bool): Continue the latest run instead of starting over.
+
+        Returns:
+            List[str]: Tickers still to process, in their original order.
+        """
+        latest = self.connection.execute(
+            "SELECT run_id, start_date, end_date FROM runs "
+            "ORDER BY started_at DESC LIMIT 1"
+        ).fetchone()
+
+        if resume and latest is not None:
+            self.run_id = latest[0]
+            self.start_date = start_date or latest[1]
+            self.end_date = end_date or latest[2]
+            completed = {
+                row[0]
+                for row in self.connection.execute(
+                    COMPLETED_QUERY, (self.run_id, *COMPLETED_STATUSES)
+                )
+            }
+            remaining = [ticker for ticker in tickers if ticker not in completed]
+            logger.info(
+                f"Resuming run {self.run_id}: {len(tickers) - len(remaining)} "
+                f"tickers already done, {len(remaining)} to process."
+            )
+            return remaining
+
+        if resume:
+            logger.warning(f"No run to resume in {self.path}, starting a new one.")
+        self.run_id = uuid.uuid4().hex
+        self.start_date, self.end_date = start_date, end_date
+        self.connection.execute(
+            "INSERT INTO runs (run_id, start_date, end_date, started_at) "
+            "VALUES (?, ?, ?, ?)",
+            (self.run_id, start_date, end_date, time.time()),
+        )
+        self.connection.commit()
+        logger.info(f"Started run {self.run_id}, journal at {self.path}")
+        return tickers
+
+    def attach(self, writer: Optional["PersistenceWriter"]) -> None:
+        self.writer = writer
+
+    def record(self, result: TickerResult) -> None:
+        with self._lock:
+            self.pending.append(result)
+            if len(self.pending) < self.flush_every:
+                return
+            batch, self.pending = self.pending, []
+
+        if self.writer is not None:
+            self.writer.checkpoint(
+                lambda failed_symbols: self.commit(batch, failed_symbols)
+            )
+        else:
+            self.commit(batch)
+
+    @staticmethod
+    def mark_unpersisted(
+        batch: List[TickerResult], failed_symbols: Set[str]
+    ) -> List[TickerResult]:
+        """Results of `batch`, failed for the tickers the writer could not store."""
+        if not failed_symbols:
+            return batch
+        return [
+            (
+                replace(
+                    result,
+                    status=TickerStatus.FAILED,
+                    error="Persisting the records of the ticker failed.",
+                )
+                if result.status == TickerStatus.SUCCEEDED
+                and result.ticker in failed_symbols
+                else result
+            )
+            for result in batch
+        ]
+
+    def commit(
+        self, batch: List[TickerResult], failed_symbols: Set[str] = None
+    ) -> None:
+        batch = RunJournal.mark_unpersisted(batch, failed_symbols)
+        now = time.time()
+        with self._lock:
+            self.connection.executemany(
+                """
+                INSERT INTO ticker_results
+                    (run_id, ticker, status, elapsed, error, recorded_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (run_id, ticker) DO UPDATE SET
+                    status = excluded.status,
+                    elapsed = excluded.elapsed,
+                    error = excluded.error,
+                    attempts = attempts + 1,
+                    recorded_at = excluded.recorded_at
+                """,
+                [
+                    (
+                        self.run_id,
+                        result.ticker,
+                        result.status.value,
+                        result.elapsed,
+                        result.error,
+                        now,
+                    )
+                    for result in batch
+                ],
+            )
+            self.connection.commit()
+
+    def close(self) -> None:
+        """Commit what is left; call after the writer has been closed."""
+        failed_symbols = self.writer.failed_symbols if self.writer else None
+        self.writer = None
+        with self._lock:
+            batch, self.pending = self.pending, []
+        if batch:
+            self.commit(batch, failed_symbols)
+        with self._lock:
+            self.connection.execute(
+                "UPDATE runs SET finished_at = ? WHERE run_id = ?",
+                (time.time(), self.run_id),
+            )
+            self.connection.commit()
+            self.connection.close()
@@ -0,0 +1,79 @@
+import math
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.enums.ticker_status import TickerStatus
+from src.settings.shared import logger
+
+
+@dataclass
+class TickerResult:
+    ticker: str
+    status: TickerStatus
+    elapsed: float
+    error: Optional[str] = None
+    quality: Optional[Dict] = None
+
+
+class RunSummary:
+    """Thread-safe accumulator of per-ticker outcomes for one universe run."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.results: List[TickerResult] = []
+
+    def record(self, result: TickerResult) -> None:
+        with self._lock:
+            self.results.append(result)
+
+    def count(self, status: TickerStatus) -> int:
+        with self._lock:
+            return sum(1 for result in self.results if result.status == status)
+
+    @staticmethod
+    def percentile(values: List[float], rank: float) -> float:
+        """Nearest-rank percentile, rank expressed in [0, 100]."""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = max(0, math.ceil(rank / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            timings = [result.elapsed for result in self.results]
+        return {
+            "total": len(timings),
+            "succeeded": self.count(TickerStatus.SUCCEEDED),
+            "failed": self.count(TickerStatus.FAILED),
+            "skipped": self.count(TickerStatus.SKIPPED),
+            "p50_seconds": self.percentile(timings, 50),
+            "p95_seconds": self.percentile(timings, 95),
+        }
+
+    def per_ticker(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {
+                result.ticker: {
+                    "status": result.status.value,
+                    "seconds": result.elapsed,
+                    "error": result.error,
+                    "quality": result.quality,
+                }
+                for result in self.results
+            }
+
+    def log_summary(self) -> None:
+        summary = self.as_dict()
+        logger.info(
+            f"Run finished. Total: {summary['total']} | "
+            f"Succeeded: {summary['succeeded']} | Failed: {summary['failed']} | "
+            f"Skipped: {summary['skipped']} | "
+            f"p50: {summary['p50_seconds']:.3f}s | p95: {summary['p95_seconds']:.3f}s"
+        )
+        failed = [
+            result for result in self.results if result.status == TickerStatus.FAILED
+        ]
+        for result in failed:
+            logger.error(f"Ticker {result.ticker} failed: {result.error}")
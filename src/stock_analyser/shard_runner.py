@@ -0,0 +1,235 @@
+import copy
+import multiprocessing
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from src.model.signal_index import DEFAULT_SIGNAL_INDEX_PATH, SignalIndex
+from src.services.screener import SignalIndexBuilder
+from src.settings.shared import logger
+from src.stock_analyser.quota_scheduler import DEFAULT_SCHEDULE_PATH
+from src.stock_analyser.run_journal import DEFAULT_JOURNAL_PATH
+from src.stock_analyser.run_summary import RunSummary
+from src.utils.metrics import DEFAULT_JSON_PATH, Metrics
+
+
+class ShardRunner:
+    """Splits the ticker universe into shards processed by separate processes.
+
+    A ticker belongs to shard `crc32(ticker) % shard_count`, so every process,
+    or every container started with the same SHARD_COUNT, agrees on the split
+    without coordination and a ticker always lands in the same shard. Each
+    shard is a regular StockAnalyser run over its own tickers, with its own
+    run journal, signal index and a share of the FMP rate limit. Once every
+    shard is done, their signal indexes are merged into SCREENER.INDEX_PATH.
+    """
+
+    @staticmethod
+    def shard_for(ticker: str, shard_count: int) -> int:
+        return zlib.crc32(ticker.encode()) % shard_count
+
+    @staticmethod
+    def select_shard(stock_list: List[str], app_config: Dict) -> List[str]:
+        """Tickers of PROCESSING.SHARD_INDEX, all of them when not sharded."""
+        processing_config = app_config.get("PROCESSING", {})
+        shard_count = processing_config.get("SHARD_COUNT", 1)
+        if shard_count <= 1:
+            return stock_list
+        shard_index = processing_config.get("SHARD_INDEX", 0)
+        return [
+            stock
+            for stock in stock_list
+            if ShardRunner.shard_for(stock, shard_count) == shard_index
+        ]
+
+    @staticmethod
+    def shard_path(path: str, shard_index: int, shard_count: int) -> str:
+        return f"{path}.shard-{shard_index}-of-{shard_count}"
+
+    @staticmethod
+    def shard_config(app_config: Dict, shard_index: int, shard_count: int) -> Dict:
+        """
+        Copy of `app_config` for one shard.
+
+        Sets PROCESSING.SHARD_INDEX/SHARD_COUNT, gives the shard its own
+        CHECKPOINT.PATH, SCHEDULER.PATH, SCREENER.INDEX_PATH and METRICS
+        report paths, and divides
+        the FMP rate limit and SCHEDULER.DAILY_QUOTA between the shards, since
+        each process has its own token bucket and schedule.
+        """
+        config = copy.deepcopy(app_config)
+        if shard_count <= 1:
+            return config
+        processing_config = config.setdefault("PROCESSING", {})
+        processing_config["SHARD_INDEX"] = shard_index
+        processing_config["SHARD_COUNT"] = shard_count
+
+        checkpoint_config = config.setdefault("CHECKPOINT", {})
+        journal_path = checkpoint_config.get("PATH", DEFAULT_JOURNAL_PATH)
+        checkpoint_config["PATH"] = ShardRunner.shard_path(
+            journal_path, shard_index, shard_count
+        )
+        scheduler_config = config.setdefault("SCHEDULER", {})
+        schedule_path = scheduler_config.get("PATH", DEFAULT_SCHEDULE_PATH)
+        scheduler_config["PATH"] = ShardRunner.shard_path(
+            schedule_path, shard_index, shard_count
+        )
+        if scheduler_config.get("DAILY_QUOTA") is not None:
+            scheduler_config["DAILY_QUOTA"] = (
+                scheduler_config["DAILY_QUOTA"] / shard_count
+            )
+        screener_config = config.setdefault("SCREENER", {})
+        screener_config["INDEX_PATH"] = ShardRunner.shard_path(
+            screener_config.get("INDEX_PATH", DEFAULT_SIGNAL_INDEX_PATH),
+            shard_index,
+            shard_count,
+        )
+        metrics_config = config.setdefault("METRICS", {})
+        for key, default in (
+            ("JSON_PATH", DEFAULT_JSON_PATH),
+            ("PROMETHEUS_PATH", None),
+        ):
+            path = metrics_config.get(key, default)
+            if path:
+                metrics_config[key] = ShardRunner.shard_path(
+                    path, shard_index, shard_count
+                )
+
+        from src.utils.http_client import DEFAULT_RATE_LIMIT_PER_MINUTE
+
+        fmp_config = config.setdefault("API_KEYS", {}).setdefault("FMP", {})
+        rate_limit = fmp_config.get(
+            "RATE_LIMIT_PER_MINUTE", DEFAULT_RATE_LIMIT_PER_MINUTE
+        )
+        fmp_config["RATE_LIMIT_PER_MINUTE"] = rate_limit / shard_count
+        if "RATE_LIMIT_BURST" in fmp_config:
+            fmp_config["RATE_LIMIT_BURST"] = max(
+                1, fmp_config["RATE_LIMIT_BURST"] // shard_count
+            )
+        return config
+
+    @staticmethod
+    def run_shard(
+        app_config: Dict,
+        start_date: str = None,
+        end_date: str = None,
+        resume: bool = False,
+    ) -> Dict:
+        """Entry point of a shard process; returns what the parent merges."""
+        # Imported in the child so the parent never opens sessions or caches
+        from src.settings.shared import set_app_config
+        from src.stock_analyser.stock_processor import StockAnalyser
+
+        set_app_config(config=app_config)
+        analyser = StockAnalyser()
+        summary = analyser.start_process(
+            app_config=app_config,
+            start_date=start_date,
+            end_date=end_date,
+            resume=resume,
+        )
+        return {
+            "results": summary.results if summary is not None else [],
+            # Stats of the threads or asyncio engine, whichever ran the shard
+            "http": analyser.http_stats,
+            "metrics": Metrics.snapshot(),
+        }
+
+    @staticmethod
+    def merge_signal_indexes(
+        app_config: Dict, shard_count: int
+    ) -> Optional[Dict[str, List[str]]]:
+        """
+        Merges the signal index of every shard into SCREENER.INDEX_PATH.
+
+        Args:
+            app_config (Dict): Application config shared by all shards.
+            shard_count (int): Number of shards of the run.
+
+        Returns:
+            Optional[Dict[str, List[str]]]: Tickers matching each rule on the
+            latest date, None when the screener is disabled.
+        """
+        # A single shard runs with the config as is and wrote INDEX_PATH itself
+        builder = (
+            SignalIndexBuilder.get_builder(app_config) if shard_count > 1 else None
+        )
+        if builder is None:
+            return None
+        for shard_index in range(shard_count):
+            builder.add_index(
+                SignalIndex.load(
+                    ShardRunner.shard_path(builder.path, shard_index, shard_count)
+                )
+            )
+        return builder.close()
+
+    @staticmethod
+    def run(
+        app_config: Dict,
+        processes: int,
+        start_date: str = None,
+        end_date: str = None,
+        resume: bool = False,
+    ) -> Optional[RunSummary]:
+        """
+        Runs every shard in its own process and merges their outcomes.
+
+        Args:
+            app_config (Dict): Application config shared by all shards.
+            processes (int): Number of shards, one process each.
+            start_date (str): First date to fetch.
+            end_date (str): Last date to fetch.
+            resume (bool): Resume the latest run of each shard.
+
+        Returns:
+            RunSummary: Outcomes of all tickers of all shards.
+        """
+        logger.info(f"Running the universe in {processes} shard processes ...")
+        start_time = time.perf_counter()
+        # spawn, so children never inherit open sockets or SQLite handles
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as pool:
+            futures = [
+                pool.submit(
+                    ShardRunner.run_shard,
+                    ShardRunner.shard_config(app_config, shard_index, processes),
+                    start_date,
+                    end_date,
+                    resume,
+                )
+                for shard_index in range(processes)
+            ]
+            shard_outputs = [future.result() for future in futures]
+
+        summary = RunSummary()
+        http_stats = {}
+        Metrics.reset()
+        for output in shard_outputs:
+            Metrics.merge(output["metrics"])
+            for result in output["results"]:
+                summary.record(result)
+            for counter, value in output["http"].items():
+                http_stats[counter] = http_stats.get(counter, 0) + value
+
+        screens = ShardRunner.merge_signal_indexes(app_config, processes)
+
+        elapsed = time.perf_counter() - start_time
+        summary.log_summary()
+        logger.info(f"HTTP client stats, all shards: {http_stats}")
+        logger.info(
+            f"{processes} shards processed {summary.as_dict()['total']} tickers "
+            f"in {elapsed:.2f}s"
+        )
+        Metrics.export(
+            app_config,
+            extra={
+                "summary": summary.as_dict(),
+                "http": http_stats,
+                "shards": processes,
+                "screens": screens,
+                "tickers": summary.per_ticker(),
+            },
+        )
+        return summary
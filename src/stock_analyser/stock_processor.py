@@ -1,24 +1,55 @@
-from typing import Dict
+import asyncio
+import time
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, List, Optional
+import pandas as pd
 
 from src.services.data_collector import DataCollector
-from src.services.technical_indicators import TechnicalIndicators
+from src.services.data_quality import DataQuality
+from src.services.helper import HelperMethods
+from src.services.profile_batcher import ProfileBatcher, AsyncProfileBatcher
+from src.services.screener import SignalIndexBuilder
+from src.model.universe_index import UniverseIndex
+from src.model.persistence_writer import (
+    PersistenceWriter,
+    STOCK_RECORDS,
+    HISTORICAL_RECORDS,
+)
+from src.utils.apis_call_handler import ApisHandler
+from src.utils.metrics import Metrics
+from src.utils.response_cache import ResponseCache
 from src.settings.shared import get_app_config
 from src.settings.shared import logger
-from src.services.helper import HelperMethods
+from src.enums.ticker_status import TickerStatus
+from src.exceptions.exceptions import CustomException, HttpErrorException
+from src.stock_analyser.quota_scheduler import QuotaScheduler
+from src.stock_analyser.run_journal import RunJournal
+from src.stock_analyser.run_summary import RunSummary, TickerResult
+from src.stock_analyser.shard_runner import ShardRunner
+
+if TYPE_CHECKING:
+    from src.model.snapshot_store import SnapshotStore
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_CONCURRENCY = 64
+THREADS_ENGINE = "threads"
+ASYNCIO_ENGINE = "asyncio"
 
 
 class StockAnalyser:
     def __init__(self) -> None:
         self.app_config = get_app_config()
+        # HTTP stats of the engine that ran the last process
+        self.http_stats: Dict = {}
 
     def start_process(
-        self, app_config: dict = {}, start_date: str = None, end_date: str = None
-    ):
-        def __init__(self) -> None:
-            self.app_config = get_app_config()
-            self.start_date = start_date
-            self.end_date = end_date
-
+        self,
+        app_config: dict = {},
+        start_date: str = None,
+        end_date: str = None,
+        resume: bool = False,
+    ) -> Optional[RunSummary]:
         # TODO
         # 1. Fetch the list of NASDAQ tickers
         # 2. Persist the list of NASDAQ tickers on my database using stock_analyser_lib
@@ -26,20 +57,498 @@ class StockAnalyser:
         # 4. Persist the financial data on my database using stock_analyser_lib
         # 5. Use visualisation tools to display the data (powerBI, Tableau, elk etc)
 
-        stock_list = DataCollector.fetch_nasdaq_tickers_list(app_config=app_config)
+        app_config = app_config or self.app_config
+        Metrics.reset()
+        DataQuality.reset()
+
+        if app_config.get("PROCESSING", {}).get("ENGINE") == ASYNCIO_ENGINE:
+            return asyncio.run(
+                self.start_process_async(
+                    app_config=app_config,
+                    start_date=start_date,
+                    end_date=end_date,
+                    resume=resume,
+                )
+            )
+
+        # The HttpClient outlives runs, so this run's calls are the difference
+        http_baseline = ApisHandler.get_stats(app_config)
+        universe = UniverseIndex.get_index(app_config)
+        stock_list = DataCollector.fetch_nasdaq_tickers_list(
+            app_config=app_config, universe=universe
+        )
+
+        if not stock_list:
+            logger.error("No stock data found")
+            if universe is not None:
+                universe.close()
+            return None
+
+        stock_list = self.select_tickers(stock_list=stock_list, app_config=app_config)
+        stock_list = ShardRunner.select_shard(stock_list, app_config)
+        journal = RunJournal.get_journal(app_config)
+        if journal is not None:
+            stock_list = journal.begin(
+                stock_list, start_date=start_date, end_date=end_date, resume=resume
+            )
+            start_date, end_date = journal.start_date, journal.end_date
+        scheduler = QuotaScheduler.get_scheduler(app_config)
+        if scheduler is not None:
+            stock_list = scheduler.plan(stock_list)
+        max_workers = app_config.get("PROCESSING", {}).get(
+            "MAX_WORKERS", DEFAULT_MAX_WORKERS
+        )
+        logger.info(
+            f"Processing {len(stock_list)} tickers with {max_workers} workers ..."
+        )
+
+        summary = RunSummary()
+        snapshot_store = self.create_snapshot_store(app_config)
+        profile_batcher = ProfileBatcher.get_batcher(app_config, stock_list)
+        signal_builder = SignalIndexBuilder.get_builder(app_config)
+        writer = self.create_writer(app_config)
+        if journal is not None:
+            journal.attach(writer)
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="ticker"
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        self.process_ticker,
+                        ticker=stock,
+                        app_config=app_config,
+                        start_date=start_date,
+                        end_date=end_date,
+                        writer=writer,
+                        snapshot_store=snapshot_store,
+                        profile_batcher=profile_batcher,
+                        universe=universe,
+                        signal_builder=signal_builder,
+                        scheduler=scheduler,
+                    ): stock
+                    for stock in stock_list
+                }
+                for future in as_completed(futures):
+                    result = future.result()
+                    summary.record(result)
+                    self.observe_result(result)
+                    if journal is not None:
+                        journal.record(result)
+                    if scheduler is not None:
+                        scheduler.record(result)
+            screens = signal_builder.close() if signal_builder is not None else None
+        finally:
+            if writer is not None:
+                writer.close()
+            if journal is not None:
+                journal.close()
+            if universe is not None:
+                universe.close()
+            if scheduler is not None:
+                scheduler.close(
+                    calls=self.stats_since(http_baseline).get("requests", 0)
+                )
+
+        summary.log_summary()
+        http_stats = self.http_stats = self.stats_since(http_baseline)
+        logger.info(f"HTTP client stats: {http_stats}")
+        cache = ResponseCache.get_cache(app_config)
+        if cache is not None:
+            logger.info(f"Response cache stats: {cache.get_stats()}")
+        self.export_metrics(
+            app_config, summary, http_stats, universe, screens, scheduler
+        )
+        return summary
+
+    async def start_process_async(
+        self,
+        app_config: dict,
+        start_date: str = None,
+        end_date: str = None,
+        resume: bool = False,
+    ) -> Optional[RunSummary]:
+        # aiohttp is only needed, and only imported, when this engine is selected
+        from src.services.async_data_collector import AsyncDataCollector
+        from src.utils.async_apis_call_handler import AsyncApisHandler
+
+        async with AsyncApisHandler(app_config) as client:
+            universe = UniverseIndex.get_index(app_config)
+            stock_list = await AsyncDataCollector.fetch_nasdaq_tickers_list(
+                client, app_config=app_config, universe=universe
+            )
+
+            if not stock_list:
+                logger.error("No stock data found")
+                if universe is not None:
+                    universe.close()
+                return None
+
+            stock_list = self.select_tickers(
+                stock_list=stock_list, app_config=app_config
+            )
+            stock_list = ShardRunner.select_shard(stock_list, app_config)
+            journal = RunJournal.get_journal(app_config)
+            if journal is not None:
+                stock_list = journal.begin(
+                    stock_list, start_date=start_date, end_date=end_date, resume=resume
+                )
+                start_date, end_date = journal.start_date, journal.end_date
+            scheduler = QuotaScheduler.get_scheduler(app_config)
+            if scheduler is not None:
+                stock_list = scheduler.plan(stock_list)
+            max_concurrency = app_config.get("PROCESSING", {}).get(
+                "MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY
+            )
+            logger.info(
+                f"Processing {len(stock_list)} tickers with asyncio, "
+                f"{max_concurrency} at a time ..."
+            )
+
+            summary = RunSummary()
+            semaphore = asyncio.Semaphore(max_concurrency)
+            snapshot_store = self.create_snapshot_store(app_config)
+            profile_batcher = AsyncProfileBatcher.get_batcher(app_config, stock_list)
+            signal_builder = SignalIndexBuilder.get_builder(app_config)
+            writer = self.create_writer(app_config)
+            if journal is not None:
+                journal.attach(writer)
+
+            async def bounded(ticker: str) -> None:
+                async with semaphore:
+                    result = await self.process_ticker_async(
+                        client,
+                        ticker=ticker,
+                        app_config=app_config,
+                        start_date=start_date,
+                        end_date=end_date,
+                        writer=writer,
+                        snapshot_store=snapshot_store,
+                        profile_batcher=profile_batcher,
+                        universe=universe,
+                        signal_builder=signal_builder,
+                        scheduler=scheduler,
+                    )
+                    summary.record(result)
+                    self.observe_result(result)
+                    if scheduler is not None:
+                        scheduler.record(result)
+                    if journal is not None:
+                        # a batch commit can wait on the writer queue
+                        await asyncio.to_thread(journal.record, result)
+
+            try:
+                await asyncio.gather(*(bounded(stock) for stock in stock_list))
+                screens = (
+                    await asyncio.to_thread(signal_builder.close)
+                    if signal_builder is not None
+                    else None
+                )
+            finally:
+                if writer is not None:
+                    await asyncio.to_thread(writer.close)
+                if journal is not None:
+                    await asyncio.to_thread(journal.close)
+                if universe is not None:
+                    universe.close()
+                if scheduler is not None:
+                    scheduler.close(calls=client.get_stats().get("requests", 0))
+            http_stats = self.http_stats = client.get_stats()
+
+        summary.log_summary()
+        cache = ResponseCache.get_cache(app_config)
+        if cache is not None:
+            logger.info(f"Response cache stats: {cache.get_stats()}")
+        self.export_metrics(
+            app_config, summary, http_stats, universe, screens, scheduler
+        )
+        return summary
+
+    @staticmethod
+    def stats_since(baseline: Dict) -> Dict:
+        """HttpClient counters accumulated since `baseline` was taken."""
+        return {
+            counter: value - baseline.get(counter, 0)
+            for counter, value in ApisHandler.get_stats().items()
+        }
+
+    @staticmethod
+    def observe_result(result: TickerResult) -> None:
+        Metrics.increment("tickers_total", status=result.status.value)
+        Metrics.observe("ticker_seconds", result.elapsed, status=result.status.value)
+
+    @staticmethod
+    def export_metrics(
+        app_config: Dict,
+        summary: RunSummary,
+        http_stats: Dict,
+        universe: Optional[UniverseIndex] = None,
+        screens: Optional[Dict[str, List[str]]] = None,
+        scheduler: Optional[QuotaScheduler] = None,
+    ) -> Optional[Dict]:
+        """Write the METRICS report of the run, with its summary and per-ticker table."""
+        cache = ResponseCache.get_cache(app_config)
+        diff = universe.diff if universe is not None else None
+        forecast = scheduler.forecast if scheduler is not None else None
+        return Metrics.export(
+            app_config,
+            extra={
+                "summary": summary.as_dict(),
+                "http": http_stats,
+                "cache": cache.get_stats() if cache is not None else None,
+                "universe": asdict(diff) if diff is not None else None,
+                "screens": screens,
+                "schedule": asdict(forecast) if forecast is not None else None,
+                "tickers": summary.per_ticker(),
+            },
+        )
+
+    @staticmethod
+    def create_writer(app_config: Dict) -> Optional[PersistenceWriter]:
+        """Started writer, or None when PERSISTENCE.ENABLED is false."""
+        if not app_config.get("PERSISTENCE", {}).get("ENABLED", True):
+            return None
+        writer = PersistenceWriter(app_config)
+        writer.start()
+        return writer
+
+    @staticmethod
+    def create_snapshot_store(app_config: Dict) -> Optional["SnapshotStore"]:
+        """Store for the run, or None when SNAPSHOT.ENABLED is not set."""
+        if not app_config.get("SNAPSHOT", {}).get("ENABLED", False):
+            return None
+        # pyarrow is only imported by runs that write snapshots
+        from src.model.snapshot_store import SnapshotStore
+
+        return SnapshotStore(app_config)
 
-        if stock_list and len(stock_list) > 0:
+    @staticmethod
+    def build_records(
+        ticker: str,
+        stock_metadata: Dict,
+        historical_data: pd.DataFrame,
+        writer: PersistenceWriter,
+    ) -> Dict[str, List[Dict]]:
+        return {
+            STOCK_RECORDS: [stock_metadata],
+            HISTORICAL_RECORDS: HelperMethods.frame_to_records(
+                historical_data, symbol=ticker, columns=writer.historical_columns
+            ),
+        }
 
-            for stock in stock_list:
-                if stock == "AAPL":
-                    stock_metadata = DataCollector.fetch_stock_metadata(
-                        ticker=stock, app_config=app_config
+    @staticmethod
+    def failed_result(ticker: str, start_time: float, error: Exception) -> TickerResult:
+        return TickerResult(
+            ticker=ticker,
+            status=TickerStatus.FAILED,
+            elapsed=time.perf_counter() - start_time,
+            error=str(error),
+            quality=DataQuality.pop_report(ticker),
+        )
+
+    @staticmethod
+    def select_tickers(stock_list: List[str], app_config: Dict) -> List[str]:
+        """Restrict the universe to PROCESSING.TICKERS when it is configured."""
+        selected = app_config.get("PROCESSING", {}).get("TICKERS")
+        if not selected:
+            return stock_list
+        selected = set(selected)
+        return [stock for stock in stock_list if stock in selected]
+
+    @staticmethod
+    def process_ticker(
+        ticker: str,
+        app_config: Dict,
+        start_date: str = None,
+        end_date: str = None,
+        writer: PersistenceWriter = None,
+        snapshot_store: "SnapshotStore" = None,
+        profile_batcher: ProfileBatcher = None,
+        universe: UniverseIndex = None,
+        signal_builder: SignalIndexBuilder = None,
+        scheduler: QuotaScheduler = None,
+    ) -> TickerResult:
+        """Run the fetch pipeline of a single ticker.
+
+        Any exception is captured in the returned result so that one bad ticker
+        never aborts the rest of the run.
+        """
+        start_time = time.perf_counter()
+        try:
+            stock_metadata = DataCollector.fetch_stock_metadata(
+                ticker=ticker, app_config=app_config, profile_batcher=profile_batcher
+            )
+            if scheduler is not None:
+                scheduler.observe(ticker, stock_metadata)
+            if not stock_metadata:
+                return TickerResult(
+                    ticker=ticker,
+                    status=TickerStatus.SKIPPED,
+                    elapsed=time.perf_counter() - start_time,
+                )
+
+            incremental = app_config.get("INCREMENTAL", {}).get("ENABLED", False)
+            warmup = last_date = None
+            if incremental:
+                plan = DataCollector.plan_incremental_fetch(
+                    app_config=app_config, ticker=ticker, end_date=end_date
+                )
+                if plan["up_to_date"]:
+                    logger.info(f"{ticker} is up to date, nothing to fetch.")
+                    return TickerResult(
+                        ticker=ticker,
+                        status=TickerStatus.SKIPPED,
+                        elapsed=time.perf_counter() - start_time,
                     )
-                    historical_data = (
-                        DataCollector.fetch_historical_and_technical_indicators(
-                            ticker=stock, app_config=app_config
-                        )
+                start_date, end_date = plan["start_date"], plan["end_date"]
+                warmup, last_date = plan["warmup"], plan["last_date"]
+
+            fetched = DataCollector.fetch_historical_and_technical_indicators(
+                ticker=ticker,
+                app_config=app_config,
+                start_date=start_date,
+                end_date=end_date,
+                warmup=warmup,
+            )
+            historical_data = DataCollector.drop_stored_rows(fetched, last_date)
+            if snapshot_store is not None:
+                snapshot_store.write(ticker, historical_data)
+            if universe is not None:
+                universe.observe(ticker, historical_data)
+            if signal_builder is not None:
+                signal_builder.add(ticker, historical_data)
+            if writer is not None and historical_data is not None:
+                records = StockAnalyser.build_records(
+                    ticker, stock_metadata, historical_data, writer
+                )
+                for kind, kind_records in records.items():
+                    writer.submit(kind, kind_records)
+            if incremental and fetched is not None:
+                # Includes a rebuilt window, which the stored rows left out
+                DataCollector.save_warmup(
+                    app_config=app_config,
+                    ticker=ticker,
+                    df=fetched,
+                    warmup=warmup,
+                )
+            status = (
+                TickerStatus.SKIPPED
+                if historical_data is None
+                else TickerStatus.SUCCEEDED
+            )
+            return TickerResult(
+                ticker=ticker,
+                status=status,
+                elapsed=time.perf_counter() - start_time,
+                quality=DataQuality.pop_report(ticker),
+            )
+        except (HttpErrorException, CustomException) as error:
+            # Logged by the collector, an FMP error that outlasted the retries
+            return StockAnalyser.failed_result(ticker, start_time, error)
+        except Exception as error:
+            logger.exception(f"Processing of ticker {ticker} failed")
+            return StockAnalyser.failed_result(ticker, start_time, error)
+
+    @staticmethod
+    async def process_ticker_async(
+        client,
+        ticker: str,
+        app_config: Dict,
+        start_date: str = None,
+        end_date: str = None,
+        writer: PersistenceWriter = None,
+        snapshot_store: "SnapshotStore" = None,
+        profile_batcher: AsyncProfileBatcher = None,
+        universe: UniverseIndex = None,
+        signal_builder: SignalIndexBuilder = None,
+        scheduler: QuotaScheduler = None,
+    ) -> TickerResult:
+        """asyncio counterpart of process_ticker."""
+        from src.services.async_data_collector import AsyncDataCollector
+
+        start_time = time.perf_counter()
+        try:
+            stock_metadata = await AsyncDataCollector.fetch_stock_metadata(
+                client,
+                ticker=ticker,
+                app_config=app_config,
+                profile_batcher=profile_batcher,
+            )
+            if scheduler is not None:
+                scheduler.observe(ticker, stock_metadata)
+            if not stock_metadata:
+                return TickerResult(
+                    ticker=ticker,
+                    status=TickerStatus.SKIPPED,
+                    elapsed=time.perf_counter() - start_time,
+                )
+
+            incremental = app_config.get("INCREMENTAL", {}).get("ENABLED", False)
+            warmup = last_date = None
+            if incremental:
+                # A database query and a CSV read, kept off the event loop
+                plan = await asyncio.to_thread(
+                    DataCollector.plan_incremental_fetch,
+                    app_config=app_config,
+                    ticker=ticker,
+                    end_date=end_date,
+                )
+                if plan["up_to_date"]:
+                    logger.info(f"{ticker} is up to date, nothing to fetch.")
+                    return TickerResult(
+                        ticker=ticker,
+                        status=TickerStatus.SKIPPED,
+                        elapsed=time.perf_counter() - start_time,
                     )
+                start_date, end_date = plan["start_date"], plan["end_date"]
+                warmup, last_date = plan["warmup"], plan["last_date"]
 
-        else:
-            logger.error("No stock data found")
+            fetched = (
+                await AsyncDataCollector.fetch_historical_and_technical_indicators(
+                    client,
+                    ticker=ticker,
+                    app_config=app_config,
+                    start_date=start_date,
+                    end_date=end_date,
+                    warmup=warmup,
+                )
+            )
+            historical_data = DataCollector.drop_stored_rows(fetched, last_date)
+            if snapshot_store is not None:
+                await asyncio.to_thread(snapshot_store.write, ticker, historical_data)
+            if universe is not None:
+                universe.observe(ticker, historical_data)
+            if signal_builder is not None:
+                signal_builder.add(ticker, historical_data)
+            if writer is not None and historical_data is not None:
+                records = StockAnalyser.build_records(
+                    ticker, stock_metadata, historical_data, writer
+                )
+                for kind, kind_records in records.items():
+                    # submit blocks while the writer queue is full
+                    await asyncio.to_thread(writer.submit, kind, kind_records)
+            if incremental and fetched is not None:
+                await asyncio.to_thread(
+                    DataCollector.save_warmup,
+                    app_config=app_config,
+                    ticker=ticker,
+                    df=fetched,
+                    warmup=warmup,
+                )
+            status = (
+                TickerStatus.SKIPPED
+                if historical_data is None
+                else TickerStatus.SUCCEEDED
+            )
+            return TickerResult(
+                ticker=ticker,
+                status=status,
+                elapsed=time.perf_counter() - start_time,
+                quality=DataQuality.pop_report(ticker),
+            )
+        except (HttpErrorException, CustomException) as error:
+            # Logged by the collector, an FMP error that outlasted the retries
+            return StockAnalyser.failed_result(ticker, start_time, error)
+        except Exception as error:
+            logger.exception(f"Processing of ticker {ticker} failed")
+            return StockAnalyser.failed_result(ticker, start_time, error)
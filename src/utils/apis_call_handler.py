@@ -1,21 +1,168 @@
+import io
+import json
 import requests
-from typing import Dict
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import BinaryIO, Dict, Optional, Union
 
-from src.settings.shared import logger
+from src.settings.shared import logger, get_app_config
 from src.utils.decorators import retry
-from src.exceptions.exceptions import HttpErrorException, CustomException
+from src.utils.http_client import HttpClient
+from src.utils.metrics import Metrics
+from src.utils.response_cache import ResponseCache
+from src.exceptions.exceptions import (
+    HttpErrorException,
+    CustomException,
+    RateLimitException,
+)
+
+
+def is_retryable(error: Exception) -> bool:
+    return isinstance(error, HttpErrorException) and error.retryable
+
+
+def count_retry(error: Exception) -> None:
+    HttpClient.get_client().increment("retries")
+    Metrics.increment("http_retries_total")
+
+
+class ResponseStream:
+    """Streaming response body that hands its connection back to the pool on close."""
+
+    def __init__(self, response: requests.Response) -> None:
+        self.response = response
+        response.raw.decode_content = True
+
+    def read(self, size: int = -1) -> bytes:
+        return self.response.raw.read(size)
+
+    def close(self) -> None:
+        self.response.close()
+
+    def __enter__(self) -> "ResponseStream":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 class ApisHandler:
     @staticmethod
+    @retry(times=4, delay=1.0, should_retry=is_retryable, on_retry=count_retry)
     def get(url: str = "", **kwrgs) -> Dict:
+        body = ApisHandler.fetch(url=url, app_config=kwrgs.get("app_config"))
         try:
-            response = requests.get(url=url)
+            with Metrics.timer("json_decode", endpoint=Metrics.endpoint_of(url)):
+                return json.loads(body)
+        except ValueError as error:
+            raise CustomException(message=f"Api Call failed, reason {error}") from error
+
+    @staticmethod
+    @retry(times=4, delay=1.0, should_retry=is_retryable, on_retry=count_retry)
+    def get_stream(url: str = "", **kwrgs) -> BinaryIO:
+        """Response body as a file-like object, to be closed by the caller.
+
+        Without the response cache the body is streamed from the socket; with
+        it the body is read once, stored, and served from memory.
+        """
+        return ApisHandler.fetch(
+            url=url, app_config=kwrgs.get("app_config"), stream=True
+        )
+
+    @staticmethod
+    def fetch(
+        url: str, app_config: Dict = None, stream: bool = False
+    ) -> Union[bytes, BinaryIO]:
+        app_config = app_config or get_app_config()
+        endpoint = Metrics.endpoint_of(url)
+        cache = ResponseCache.get_cache(app_config)
+        cached = None
+        if cache is not None:
+            cached = cache.lookup(url)
+            if cached is not None and (cached.fresh or cache.offline):
+                Metrics.increment("cache_hits_total", endpoint=endpoint)
+                return io.BytesIO(cached.body) if stream else cached.body
+            if cache.offline:
+                raise CustomException(
+                    message=f"Offline mode, no cached response for {cache.normalize_url(url)}"
+                )
+
+        client = HttpClient.get_client(app_config)
+        try:
+            with Metrics.timer("http_request", endpoint=endpoint):
+                response = client.get(
+                    url=url,
+                    headers=(
+                        cached.conditional_headers() if cached is not None else None
+                    ),
+                    stream=stream and cache is None,
+                )
+            Metrics.increment(
+                "http_responses_total", endpoint=endpoint, status=response.status_code
+            )
+            if response.status_code == 304 and cached is not None:
+                cache.refresh(cached)
+                return io.BytesIO(cached.body) if stream else cached.body
             response.raise_for_status()
-            return response.json()
+            if stream and cache is None:
+                return ResponseStream(response)
+
+            with Metrics.timer("http_body", endpoint=endpoint):
+                body = response.content
+            Metrics.increment("http_bytes_total", len(body), endpoint=endpoint)
+            if cache is not None:
+                cache.store(
+                    url,
+                    body,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+            return io.BytesIO(body) if stream else body
         except requests.exceptions.HTTPError as http_error:
+            status_code = http_error.response.status_code
+            retry_after = ApisHandler.parse_retry_after(
+                http_error.response.headers.get("Retry-After")
+            )
+            if status_code == 429:
+                raise RateLimitException(
+                    message=f"Rate limited, reason {http_error}",
+                    retry_after=retry_after,
+                ) from http_error
             raise HttpErrorException(
-                message=f"Http Error, reason {http_error}"
+                message=f"Http Error, reason {http_error}",
+                status_code=status_code,
+                retry_after=retry_after,
             ) from http_error
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ) as network_error:
+            Metrics.increment("http_network_errors_total", endpoint=endpoint)
+            raise HttpErrorException(
+                message=f"Network Error, reason {network_error}"
+            ) from network_error
         except Exception as error:
             raise CustomException(message=f"Api Call failed, reason {error}") from error
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After is either a number of seconds or an HTTP date."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed Retry-After header: {value}")
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    @staticmethod
+    def get_stats(app_config: Dict = None) -> Dict:
+        """Counters of the process-wide HttpClient, since the process started."""
+        return HttpClient.get_client(app_config).get_stats()
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import time
+from typing import Dict, Optional
+
+import aiohttp
+
+from src.settings.shared import logger
+from src.utils.apis_call_handler import ApisHandler, is_retryable
+from src.utils.decorators import async_retry
+from src.utils.metrics import Metrics
+from src.utils.response_cache import CacheEntry, ResponseCache
+from src.utils.http_client import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_RATE_LIMIT_PER_MINUTE,
+    DEFAULT_TIMEOUT,
+)
+from src.exceptions.exceptions import (
+    HttpErrorException,
+    CustomException,
+    RateLimitException,
+)
+
+
+class AsyncTokenBucket:
+    """Token bucket for a single event loop, see http_client.TokenBucket."""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None) -> None:
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(self.rate_per_second)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated_at) * self.rate_per_second,
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait_time = (1 - self.tokens) / self.rate_per_second
+                await asyncio.sleep(wait_time)
+                waited += wait_time
+
+
+class AsyncApisHandler:
+    """aiohttp counterpart of ApisHandler, used as an async context manager.
+
+    Reads the same app_config["API_KEYS"]["FMP"] settings as HttpClient and
+    raises the same exceptions, so callers handle errors identically.
+    """
+
+    def __init__(self, app_config: Dict = None) -> None:
+        fmp_config = (app_config or {}).get("API_KEYS", {}).get("FMP", {})
+        self.pool_size = fmp_config.get("POOL_SIZE", DEFAULT_POOL_SIZE)
+        connect_timeout, read_timeout = fmp_config.get("TIMEOUT", DEFAULT_TIMEOUT)
+        self.timeout = aiohttp.ClientTimeout(
+            sock_connect=connect_timeout, sock_read=read_timeout
+        )
+        self.rate_limiter = AsyncTokenBucket(
+            rate_per_minute=fmp_config.get(
+                "RATE_LIMIT_PER_MINUTE", DEFAULT_RATE_LIMIT_PER_MINUTE
+            ),
+            burst=fmp_config.get("RATE_LIMIT_BURST"),
+        )
+        self.cache = ResponseCache.get_cache(app_config)
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.stats = {"requests": 0, "retries": 0, "throttles": 0, "rate_limited": 0}
+
+    async def __aenter__(self) -> "AsyncApisHandler":
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.pool_size),
+            timeout=self.timeout,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.session.close()
+        logger.info(f"Async HTTP client stats: {self.stats}")
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        self.stats[counter] += value
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats)
+
+    def count_retry(self, error: Exception) -> None:
+        self.increment("retries")
+        Metrics.increment("http_retries_total")
+
+    async def get(self, url: str = "") -> Dict:
+        body = await self.get_body(url)
+        try:
+            with Metrics.timer("json_decode", endpoint=Metrics.endpoint_of(url)):
+                return json.loads(body)
+        except ValueError as error:
+            raise CustomException(message=f"Api Call failed, reason {error}") from error
+
+    async def get_body(self, url: str = "") -> bytes:
+        cached = None
+        if self.cache is not None:
+            # SQLite reads and writes of the cache run off the event loop
+            cached = await asyncio.to_thread(self.cache.lookup, url)
+            if cached is not None and (cached.fresh or self.cache.offline):
+                Metrics.increment("cache_hits_total", endpoint=Metrics.endpoint_of(url))
+                return cached.body
+            if self.cache.offline:
+                raise CustomException(
+                    message=f"Offline mode, no cached response for {self.cache.normalize_url(url)}"
+                )
+
+        @async_retry(
+            times=4,
+            delay=1.0,
+            should_retry=is_retryable,
+            on_retry=self.count_retry,
+        )
+        async def fetch() -> bytes:
+            return await self.fetch_body(url, cached)
+
+        return await fetch()
+
+    async def fetch_body(self, url: str, cached: CacheEntry = None) -> bytes:
+        if await self.rate_limiter.acquire() > 0:
+            self.increment("throttles")
+        self.increment("requests")
+        endpoint = Metrics.endpoint_of(url)
+        headers = cached.conditional_headers() if cached is not None else None
+        start_time = time.perf_counter()
+        try:
+            async with self.session.get(url, headers=headers) as response:
+                Metrics.observe(
+                    "stage_seconds",
+                    time.perf_counter() - start_time,
+                    stage="http_request",
+                    endpoint=endpoint,
+                )
+                Metrics.increment(
+                    "http_responses_total", endpoint=endpoint, status=response.status
+                )
+                if response.status == 304 and cached is not None:
+                    await asyncio.to_thread(self.cache.refresh, cached)
+                    return cached.body
+                if response.status >= 400:
+                    retry_after = ApisHandler.parse_retry_after(
+                        response.headers.get("Retry-After")
+                    )
+                    reason = (
+                        f"{response.status} {response.reason} for url: {response.url}"
+                    )
+                    if response.status == 429:
+                        self.increment("rate_limited")
+                        raise RateLimitException(
+                            message=f"Rate limited, reason {reason}",
+                            retry_after=retry_after,
+                        )
+                    raise HttpErrorException(
+                        message=f"Http Error, reason {reason}",
+                        status_code=response.status,
+                        retry_after=retry_after,
+                    )
+                with Metrics.timer("http_body", endpoint=endpoint):
+                    body = await response.read()
+                Metrics.increment("http_bytes_total", len(body), endpoint=endpoint)
+                if self.cache is not None:
+                    await asyncio.to_thread(
+                        self.cache.store,
+                        url,
+                        body,
+                        etag=response.headers.get("ETag"),
+                        last_modified=response.headers.get("Last-Modified"),
+                    )
+                return body
+        except HttpErrorException:
+            raise
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as network_error:
+            Metrics.increment("http_network_errors_total", endpoint=endpoint)
+            raise HttpErrorException(
+                message=f"Network Error, reason {network_error}"
+            ) from network_error
+        except Exception as error:
+            raise CustomException(message=f"Api Call failed, reason {error}") from error
@@ -1,11 +1,43 @@
+import asyncio
 import functools
+import random
 import time
+from typing import Callable
 
 from src.settings.shared import logger
+from src.utils.metrics import Metrics
 
 
-def retry(times: int = 3, delay: float = 2.0):
-    """Retry decorator that retries a function call if an exception occurs."""
+def compute_backoff(
+    error: Exception, attempt: int, delay: float, max_delay: float
+) -> float:
+    """Seconds to wait before the next attempt.
+
+    Honours the `retry_after` of the error when set, otherwise exponential
+    backoff with full jitter. Either way the wait is capped at `max_delay`,
+    so a server asking for hours cannot stall a worker.
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is not None:
+        return min(retry_after, max_delay)
+    return random.uniform(0, min(max_delay, delay * 2 ** (attempt - 1)))
+
+
+def retry(
+    times: int = 3,
+    delay: float = 2.0,
+    max_delay: float = 60.0,
+    should_retry: Callable[[Exception], bool] = None,
+    on_retry: Callable[[Exception], None] = None,
+):
+    """Retry decorator that retries a function call if an exception occurs.
+
+    Waits follow exponential backoff with full jitter, capped at `max_delay`.
+    When the exception carries a `retry_after` (e.g. from a 429 Retry-After
+    header) that value is honoured instead, still capped at `max_delay`.
+    `should_retry` filters which errors are worth another attempt and
+    `on_retry` is called before each one.
+    """
 
     def decorator(func):
         @functools.wraps(func)
@@ -14,9 +46,14 @@ def retry(times: int = 3, delay: float = 2.0):
                 try:
                     return func(*args, **kwargs)
                 except Exception as error:
+                    if should_retry is not None and not should_retry(error):
+                        raise
                     logger.error(f"Attempt {attempt}/{times} failed: {error}")
                     if attempt < times:
-                        time.sleep(delay)  # Wait before retrying
+                        if on_retry is not None:
+                            on_retry(error)
+                        # Wait before retrying
+                        time.sleep(compute_backoff(error, attempt, delay, max_delay))
                     else:
                         logger.error("Max retries reached. Raising exception.")
                         raise  # Raise the last exception if all attempts fail
@@ -26,16 +63,47 @@ def retry(times: int = 3, delay: float = 2.0):
     return decorator
 
 
+def async_retry(
+    times: int = 3,
+    delay: float = 2.0,
+    max_delay: float = 60.0,
+    should_retry: Callable[[Exception], bool] = None,
+    on_retry: Callable[[Exception], None] = None,
+):
+    """Coroutine counterpart of `retry`, waiting with asyncio.sleep."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(1, times + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as error:
+                    if should_retry is not None and not should_retry(error):
+                        raise
+                    logger.error(f"Attempt {attempt}/{times} failed: {error}")
+                    if attempt < times:
+                        if on_retry is not None:
+                            on_retry(error)
+                        await asyncio.sleep(
+                            compute_backoff(error, attempt, delay, max_delay)
+                        )
+                    else:
+                        logger.error("Max retries reached. Raising exception.")
+                        raise
+
+        return wrapper
+
+    return decorator
+
+
 def time_execution(func):
-    """Decorator to measure execution time of a function"""
+    """Decorator recording the execution time of a function in Metrics,
+    as the stage_seconds histogram of stage `func.__name__`"""
 
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()  # Start timer
-        result = func(*args, **kwargs)
-        end_time = time.time()  # End timer
-        execution_time = end_time - start_time
-        print(f"Execution time of {func.__name__}: {execution_time:.6f} seconds")
-        return result
+        with Metrics.timer(func.__name__):
+            return func(*args, **kwargs)
 
     return wrapper
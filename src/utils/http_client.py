@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.settings.shared import logger
+
+DEFAULT_RATE_LIMIT_PER_MINUTE = 300
+DEFAULT_TIMEOUT = (5.0, 30.0)
+DEFAULT_POOL_SIZE = 64
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at `rate_per_minute`."""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None) -> None:
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(burst or max(1, int(self.rate_per_second)))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until available. Returns the seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity,
+                    self.tokens + (now - self.updated_at) * self.rate_per_second,
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait_time = (1 - self.tokens) / self.rate_per_second
+            time.sleep(wait_time)
+            waited += wait_time
+
+
+class HttpClient:
+    """Pooled HTTP session shared by every API call of the process.
+
+    Settings are read from app_config["API_KEYS"]["FMP"]:
+    RATE_LIMIT_PER_MINUTE, RATE_LIMIT_BURST, TIMEOUT ([connect, read] seconds)
+    and POOL_SIZE.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, fmp_config: Dict = None) -> None:
+        fmp_config = fmp_config or {}
+        pool_size = fmp_config.get("POOL_SIZE", DEFAULT_POOL_SIZE)
+        self.timeout: Tuple[float, float] = tuple(
+            fmp_config.get("TIMEOUT", DEFAULT_TIMEOUT)
+        )
+        self.rate_limiter = TokenBucket(
+            rate_per_minute=fmp_config.get(
+                "RATE_LIMIT_PER_MINUTE", DEFAULT_RATE_LIMIT_PER_MINUTE
+            ),
+            burst=fmp_config.get("RATE_LIMIT_BURST"),
+        )
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "throttles": 0, "rate_limited": 0}
+
+    @staticmethod
+    def get_client(app_config: Dict = None) -> "HttpClient":
+        if HttpClient._instance is None:
+            with HttpClient._instance_lock:
+                if HttpClient._instance is None:
+                    fmp_config = (app_config or {}).get("API_KEYS", {}).get("FMP", {})
+                    HttpClient._instance = HttpClient(fmp_config)
+                    logger.info(
+                        f"HTTP client ready. Rate limit: "
+                        f"{HttpClient._instance.rate_limiter.rate_per_second * 60:.0f}/min"
+                    )
+        return HttpClient._instance
+
+    @staticmethod
+    def reset() -> None:
+        with HttpClient._instance_lock:
+            if HttpClient._instance is not None:
+                HttpClient._instance.session.close()
+            HttpClient._instance = None
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[counter] += value
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        if self.rate_limiter.acquire() > 0:
+            self.increment("throttles")
+        self.increment("requests")
+        response = self.session.get(url=url, timeout=self.timeout, **kwargs)
+        if response.status_code == 429:
+            self.increment("rate_limited")
+        return response
@@ -0,0 +1,297 @@
+import bisect
+import json
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.settings.shared import logger
+
+DEFAULT_JSON_PATH = "reports/metrics.json"
+METRIC_PREFIX = "stock_analyser"
+# Seconds; covers a cache hit up to a full-history download behind a rate limit
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+RESERVOIR_SIZE = 4096
+ENDPOINTS = ("stock/list", "profile", "historical-price-full", "technical_indicator")
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Prometheus-style cumulative buckets plus a bounded sample for percentiles."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.sample: List[float] = []
+
+    def observe(self, value: float) -> None:
+        position = bisect.bisect_left(self.buckets, value)
+        if position < len(self.buckets):
+            self.bucket_counts[position] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        # Reservoir sampling keeps percentiles unbiased at a fixed memory cost
+        if len(self.sample) < RESERVOIR_SIZE:
+            self.sample.append(value)
+        else:
+            slot = random.randrange(self.count)
+            if slot < RESERVOIR_SIZE:
+                self.sample[slot] = value
+
+    def merge(self, other: Dict) -> None:
+        for position, bucket_count in enumerate(other["bucket_counts"]):
+            self.bucket_counts[position] += bucket_count
+        self.count += other["count"]
+        self.sum += other["sum"]
+        self.max = max(self.max, other["max"])
+        combined = self.sample + other["sample"]
+        if len(combined) > RESERVOIR_SIZE:
+            combined = random.sample(combined, RESERVOIR_SIZE)
+        self.sample = combined
+
+    def percentile(self, rank: float) -> float:
+        if not self.sample:
+            return 0.0
+        ordered = sorted(self.sample)
+        return ordered[max(0, math.ceil(rank / 100 * len(ordered)) - 1)]
+
+    def as_dict(self) -> Dict:
+        return {
+            "bucket_counts": list(self.bucket_counts),
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "sample": list(self.sample),
+        }
+
+
+class Metrics:
+    """Process-wide counters and histograms of a run.
+
+    Counters and histograms are keyed by a name and labels such as
+    stage="ohlcv_parse" or endpoint="profile". At the end of a run `export`
+    writes a JSON report to METRICS.JSON_PATH and, when
+    METRICS.PROMETHEUS_PATH is set, a Prometheus text-format file for the
+    node_exporter textfile collector.
+    """
+
+    _lock = threading.Lock()
+    _counters: Dict[Tuple[str, Labels], float] = {}
+    _histograms: Dict[Tuple[str, Labels], Histogram] = {}
+    _started_at = time.time()
+
+    @staticmethod
+    def labels_key(labels: Dict) -> Labels:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    @staticmethod
+    def increment(name: str, value: float = 1, **labels) -> None:
+        key = (name, Metrics.labels_key(labels))
+        with Metrics._lock:
+            Metrics._counters[key] = Metrics._counters.get(key, 0) + value
+
+    @staticmethod
+    def observe(name: str, value: float, **labels) -> None:
+        key = (name, Metrics.labels_key(labels))
+        with Metrics._lock:
+            histogram = Metrics._histograms.get(key)
+            if histogram is None:
+                histogram = Metrics._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @staticmethod
+    @contextmanager
+    def timer(stage: str, **labels) -> Iterator[None]:
+        """Adds the duration of the block to the stage_seconds histogram."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            Metrics.observe(
+                "stage_seconds", time.perf_counter() - start_time, stage=stage, **labels
+            )
+
+    @staticmethod
+    def endpoint_of(url: str) -> str:
+        path = urlsplit(url).path
+        for endpoint in ENDPOINTS:
+            if f"/{endpoint}" in path:
+                return endpoint
+        return "other"
+
+    @staticmethod
+    def reset() -> None:
+        with Metrics._lock:
+            Metrics._counters = {}
+            Metrics._histograms = {}
+            Metrics._started_at = time.time()
+
+    @staticmethod
+    def snapshot() -> Dict:
+        """Picklable state, e.g. to send the metrics of a shard to its parent."""
+        with Metrics._lock:
+            return {
+                "counters": [
+                    [name, list(labels), value]
+                    for (name, labels), value in Metrics._counters.items()
+                ],
+                "histograms": [
+                    [name, list(labels), histogram.as_dict()]
+                    for (name, labels), histogram in Metrics._histograms.items()
+                ],
+            }
+
+    @staticmethod
+    def merge(snapshot: Dict) -> None:
+        with Metrics._lock:
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(tuple(label) for label in labels))
+                Metrics._counters[key] = Metrics._counters.get(key, 0) + value
+            for name, labels, state in snapshot["histograms"]:
+                key = (name, tuple(tuple(label) for label in labels))
+                histogram = Metrics._histograms.get(key)
+                if histogram is None:
+                    histogram = Metrics._histograms[key] = Histogram()
+                histogram.merge(state)
+
+    @staticmethod
+    def report(extra: Dict = None) -> Dict:
+        """JSON-friendly summary: counters, and count/sum/mean/p50/p95/max per histogram."""
+        with Metrics._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(Metrics._counters.items())
+            ]
+            histograms = [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                    "p50": histogram.percentile(50),
+                    "p95": histogram.percentile(95),
+                    "max": histogram.max,
+                }
+                for (name, labels), histogram in sorted(Metrics._histograms.items())
+            ]
+            started_at = Metrics._started_at
+        return {
+            "started_at": started_at,
+            "elapsed_seconds": time.time() - started_at,
+            "counters": counters,
+            "histograms": histograms,
+            **(extra or {}),
+        }
+
+    @staticmethod
+    def escape_label(value: str) -> str:
+        return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    @staticmethod
+    def to_prometheus() -> str:
+        def format_labels(labels: Labels, extra: Labels = ()) -> str:
+            pairs = [
+                f'{name}="{Metrics.escape_label(value)}"'
+                for name, value in labels + extra
+            ]
+            return "{" + ",".join(pairs) + "}" if pairs else ""
+
+        lines = []
+        with Metrics._lock:
+            counter_names = sorted({name for name, _ in Metrics._counters})
+            for counter_name in counter_names:
+                metric = f"{METRIC_PREFIX}_{counter_name}"
+                lines.append(f"# TYPE {metric} counter")
+                for (name, labels), value in sorted(Metrics._counters.items()):
+                    if name == counter_name:
+                        lines.append(f"{metric}{format_labels(labels)} {value}")
+
+            histogram_names = sorted({name for name, _ in Metrics._histograms})
+            for histogram_name in histogram_names:
+                metric = f"{METRIC_PREFIX}_{histogram_name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for (name, labels), histogram in sorted(Metrics._histograms.items()):
+                    if name != histogram_name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(
+                        histogram.buckets, histogram.bucket_counts
+                    ):
+                        cumulative += bucket_count
+                        lines.append(
+                            f"{metric}_bucket"
+                            f"{format_labels(labels, (('le', repr(bound)),))} {cumulative}"
+                        )
+                    lines.append(
+                        f"{metric}_bucket{format_labels(labels, (('le', '+Inf'),))} "
+                        f"{histogram.count}"
+                    )
+                    lines.append(f"{metric}_sum{format_labels(labels)} {histogram.sum}")
+                    lines.append(
+                        f"{metric}_count{format_labels(labels)} {histogram.count}"
+                    )
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def write_file(path: str, content: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Scrapers must never read a half-written file
+        with open(f"{path}.tmp", "w") as report_file:
+            report_file.write(content)
+        os.replace(f"{path}.tmp", path)
+
+    @staticmethod
+    def export(app_config: Dict, extra: Dict = None) -> Optional[Dict]:
+        """
+        Writes the run report files configured in the METRICS section.
+
+        Args:
+            app_config (Dict): Application config holding METRICS.ENABLED,
+                JSON_PATH and PROMETHEUS_PATH.
+            extra (Dict): Additional top-level entries of the JSON report,
+                e.g. the run summary.
+
+        Returns:
+            Optional[Dict]: The JSON report, None when metrics are disabled.
+        """
+        metrics_config = app_config.get("METRICS", {})
+        if not metrics_config.get("ENABLED", True):
+            return None
+
+        report = Metrics.report(extra)
+        json_path = metrics_config.get("JSON_PATH", DEFAULT_JSON_PATH)
+        Metrics.write_file(json_path, json.dumps(report, indent=2, default=str))
+        logger.info(f"Metrics report written to {json_path}")
+
+        prometheus_path = metrics_config.get("PROMETHEUS_PATH")
+        if prometheus_path:
+            Metrics.write_file(prometheus_path, Metrics.to_prometheus())
+            logger.info(f"Prometheus metrics written to {prometheus_path}")
+        return report
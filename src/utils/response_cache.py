@@ -0,0 +1,273 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.settings.shared import logger
+
+DEFAULT_CACHE_PATH = "cache/fmp_responses.sqlite"
+DEFAULT_MAX_BYTES = 2 * 1024**3
+DEFAULT_TTL_SECONDS = {
+    "stock/list": 24 * 3600,
+    "profile": 24 * 3600,
+    "historical-price-full": 12 * 3600,
+    "technical_indicator": 12 * 3600,
+    "default": 3600,
+}
+ONLINE_MODE = "online"
+OFFLINE_MODE = "offline"
+SECRET_QUERY_PARAMS = {"apikey"}
+# Hits whose recency is written in one transaction
+ACCESS_FLUSH_SIZE = 256
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    ttl: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() - self.stored_at < self.ttl
+
+    def json(self):
+        return json.loads(self.body)
+
+    def conditional_headers(self) -> Dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Persistent, size-bounded LRU cache of API responses backed by SQLite.
+
+    Configured by the CACHE section of the app config: ENABLED, PATH,
+    MAX_BYTES, MODE ("online" or "offline") and TTL_SECONDS, a mapping of
+    endpoint name (e.g. "profile") to time-to-live. Entries are keyed on the
+    normalized URL without the API key. In offline mode responses are only
+    replayed from the cache and a miss raises instead of calling the API.
+
+    A hit only reads: its access time is kept in memory and written with the
+    next store, or once ACCESS_FLUSH_SIZE hits are pending, so concurrent
+    readers do not queue on the SQLite write lock.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: Dict = None,
+        mode: str = ONLINE_MODE,
+    ) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = {**DEFAULT_TTL_SECONDS, **(ttl_seconds or {})}
+        self.mode = mode
+        self._lock = threading.Lock()
+        self.pending_accesses: Dict[str, float] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "revalidated": 0,
+            "stores": 0,
+            "evictions": 0,
+        }
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """)
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+        self.connection.commit()
+        self.total_bytes = self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+
+    @staticmethod
+    def get_cache(app_config: Dict = None) -> Optional["ResponseCache"]:
+        """Process-wide cache, or None until a config with CACHE.ENABLED is seen."""
+        if ResponseCache._instance is None:
+            cache_config = (app_config or {}).get("CACHE", {})
+            if not cache_config.get("ENABLED"):
+                return None
+            with ResponseCache._instance_lock:
+                if ResponseCache._instance is None:
+                    ResponseCache._instance = ResponseCache(
+                        path=cache_config.get("PATH", DEFAULT_CACHE_PATH),
+                        max_bytes=cache_config.get("MAX_BYTES", DEFAULT_MAX_BYTES),
+                        ttl_seconds=cache_config.get("TTL_SECONDS"),
+                        mode=cache_config.get("MODE", ONLINE_MODE),
+                    )
+                    logger.info(
+                        f"Response cache ready at {ResponseCache._instance.path} "
+                        f"({ResponseCache._instance.mode} mode)"
+                    )
+        return ResponseCache._instance
+
+    @staticmethod
+    def reset() -> None:
+        with ResponseCache._instance_lock:
+            if ResponseCache._instance is not None:
+                ResponseCache._instance.close()
+            ResponseCache._instance = None
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == OFFLINE_MODE
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """Cache key: lower-cased host, sorted query, API key removed."""
+        parts = urlsplit(url)
+        query = sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if name.lower() not in SECRET_QUERY_PARAMS
+        )
+        return urlunsplit(
+            (
+                parts.scheme.lower(),
+                parts.netloc.lower(),
+                parts.path.rstrip("/"),
+                urlencode(query),
+                "",
+            )
+        )
+
+    def ttl_for(self, key: str) -> float:
+        path = urlsplit(key).path
+        for endpoint, ttl in self.ttl_seconds.items():
+            if endpoint != "default" and f"/{endpoint}" in path:
+                return ttl
+        return self.ttl_seconds["default"]
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            self.stats[counter] += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self.stats, "bytes": self.total_bytes}
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Cached entry for `url`, fresh or stale, counting hit/stale/miss."""
+        key = self.normalize_url(url)
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self.pending_accesses[key] = time.time()
+            if len(self.pending_accesses) >= ACCESS_FLUSH_SIZE:
+                self.flush_accesses()
+                self.connection.commit()
+
+        entry = CacheEntry(key, row[0], row[1], row[2], row[3], self.ttl_for(key))
+        self.increment("hits" if entry.fresh else "stale")
+        return entry
+
+    def refresh(self, entry: CacheEntry) -> None:
+        """Mark a stale entry fresh again after a 304 Not Modified."""
+        now = time.time()
+        with self._lock:
+            self.pending_accesses.pop(entry.key, None)
+            self.connection.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, entry.key),
+            )
+            self.connection.commit()
+            self.stats["revalidated"] += 1
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        key = self.normalize_url(url)
+        now = time.time()
+        with self._lock:
+            previous = self.connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self.connection.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                    (key, body, etag, last_modified, stored_at, accessed_at, size)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, body, etag, last_modified, now, now, len(body)),
+            )
+            self.total_bytes += len(body) - (previous[0] if previous else 0)
+            self.stats["stores"] += 1
+            self.pending_accesses.pop(key, None)
+            # Eviction picks the least recently used, so recency goes first
+            self.flush_accesses()
+            self.evict()
+            self.connection.commit()
+
+    def flush_accesses(self) -> None:
+        """Write the pending access times of the hits. Lock held."""
+        if not self.pending_accesses:
+            return
+        self.connection.executemany(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self.pending_accesses.items()],
+        )
+        self.pending_accesses.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush_accesses()
+            self.connection.commit()
+            self.connection.close()
+
+    def evict(self) -> None:
+        """Drop least recently used entries until under max_bytes. Lock held."""
+        while self.total_bytes > self.max_bytes:
+            rows = self.connection.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self.total_bytes <= self.max_bytes:
+                    break
+                self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.total_bytes -= size
+                self.stats["evictions"] += 1
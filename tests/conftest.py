@@ -0,0 +1,53 @@
+import os
+from typing import Dict
+
+import pytest
+
+from src.services.data_quality import DataQuality
+from src.settings.shared import set_app_config
+from src.utils import decorators
+from src.utils.http_client import HttpClient
+from src.utils.metrics import Metrics
+from src.utils.response_cache import ResponseCache
+
+
+@pytest.fixture(autouse=True)
+def isolated_run(tmp_path, monkeypatch):
+    """Each test runs in its own directory, with fresh singletons and no backoff."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(decorators, "compute_backoff", lambda *args: 0.0)
+    HttpClient.reset()
+    ResponseCache.reset()
+    Metrics.reset()
+    DataQuality.reset()
+    yield
+    HttpClient.reset()
+    ResponseCache.reset()
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """Offline run config against a FakeFmpServer, with every store in tmp_path."""
+
+    def make(url: str, engine: str = "threads", **sections) -> Dict:
+        config = {
+            "API_KEYS": {
+                "FMP": {
+                    "URL": url,
+                    "API_TOKEN": "test",
+                    "RATE_LIMIT_PER_MINUTE": 10_000_000,
+                }
+            },
+            "PROCESSING": {"ENGINE": engine, "MAX_WORKERS": 4},
+            "PERSISTENCE": {"ENABLED": False},
+            "CHECKPOINT": {"PATH": os.path.join(tmp_path, "run_journal.sqlite")},
+            "UNIVERSE": {"PATH": os.path.join(tmp_path, "universe.sqlite")},
+            "SCREENER": {"INDEX_PATH": os.path.join(tmp_path, "signal_index.npz")},
+            "METRICS": {"JSON_PATH": os.path.join(tmp_path, "metrics.json")},
+        }
+        for section, values in sections.items():
+            config.setdefault(section, {}).update(values)
+        set_app_config(config=config)
+        return config
+
+    return make
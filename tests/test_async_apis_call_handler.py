@@ -0,0 +1,41 @@
+import asyncio
+import os
+import threading
+
+from src.benchmarks.fake_fmp_server import FakeFmpServer
+from src.utils.async_apis_call_handler import AsyncApisHandler
+from src.utils.response_cache import ResponseCache
+
+
+def test_cache_runs_off_the_event_loop(make_config, tmp_path, monkeypatch):
+    calls = []
+
+    def recorded(method):
+        def wrapper(*args, **kwargs):
+            calls.append((method.__name__, threading.current_thread()))
+            return method(*args, **kwargs)
+
+        return wrapper
+
+    for name in ("lookup", "store", "refresh"):
+        monkeypatch.setattr(ResponseCache, name, recorded(getattr(ResponseCache, name)))
+
+    async def fetch_twice(config, url):
+        async with AsyncApisHandler(config) as client:
+            first = await client.get_body(url)
+            second = await client.get_body(url)
+            return first, second, client.get_stats()
+
+    with FakeFmpServer(tickers=2, days=50) as server:
+        config = make_config(
+            server.url,
+            engine="asyncio",
+            CACHE={"ENABLED": True, "PATH": os.path.join(tmp_path, "cache.sqlite")},
+        )
+        url = f"{server.url}/profile/T00000?apikey=test"
+        first, second, stats = asyncio.run(fetch_twice(config, url))
+
+    assert first == second
+    assert stats["requests"] == 1
+    assert {name for name, _ in calls} >= {"lookup", "store"}
+    assert all(thread is not threading.main_thread() for _, thread in calls)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from src.benchmarks.backtest_benchmark import per_bar_total_return
+from src.benchmarks.synthetic_data import SyntheticMarket
+from src.services.backtester import Backtester
+from src.services.technical_indicators import TechnicalIndicators
+
+COST_BPS = 5
+
+
+@pytest.fixture
+def frames():
+    return SyntheticMarket.ragged_universe(tickers=6, days=500, missing=0.05)
+
+
+def test_sma_matches_single_ticker_compute_sma(frames):
+    backtester = Backtester(frames)
+    sma = backtester.cache.sma(20)
+
+    for column, (ticker, frame) in enumerate(frames.items()):
+        rows = backtester.cache.dates.get_indexer(frame.index)
+        expected = TechnicalIndicators.compute_sma(frame, 20).to_numpy()
+        np.testing.assert_allclose(sma[rows, column], expected, rtol=1e-12)
+        assert np.isnan(np.delete(sma[:, column], rows)).all()
+
+
+def test_grid_point_matches_single_ticker_backtest(frames):
+    backtester = Backtester(frames, {"BACKTEST": {"COST_BPS": COST_BPS}})
+    swept = backtester.sweep("sma_crossover", {"fast": [10], "slow": [50]})
+
+    for ticker, frame in frames.items():
+        expected = per_bar_total_return(frame, 10, 50, COST_BPS / 10_000)
+        total_return = swept.loc[swept["ticker"] == ticker, "total_return"].item()
+        assert total_return == pytest.approx(expected, rel=1e-9, abs=1e-12)
+        exposure = swept.loc[swept["ticker"] == ticker, "exposure"].item()
+        assert 0 <= exposure <= 1
+
+
+def test_walk_forward_selects_a_grid_point_per_window(frames):
+    backtester = Backtester(frames)
+    grid = {"fast": [5, 10], "slow": [50, 100]}
+    result = backtester.walk_forward(
+        "sma_crossover", grid, train_days=200, test_days=100
+    )
+
+    assert list(result["metrics"].index) == list(frames)
+    assert len(result["selections"]) == len(
+        range(200, len(backtester.cache.dates), 100)
+    )
+    for params in result["selections"].to_numpy().ravel():
+        assert params in Backtester.grid_points("sma_crossover", grid)
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from src.benchmarks.batch_indicators_benchmark import (
+    max_difference,
+    run_batch,
+    run_per_ticker_loop,
+)
+from src.benchmarks.synthetic_data import SyntheticMarket
+from src.services.batch_indicators import BatchTechnicalIndicators
+from src.services.technical_indicators import TechnicalIndicators
+
+
+def test_batch_matches_per_ticker_loop_on_a_ragged_universe():
+    frames = SyntheticMarket.ragged_universe(tickers=12, days=400, missing=0.05)
+    assert len({len(frame) for frame in frames.values()}) > 1
+
+    loop_df = run_per_ticker_loop(frames)
+    batch_df = run_batch(frames)
+
+    assert len(batch_df) == len(loop_df)
+    assert max_difference(loop_df, batch_df) < 1e-9
+
+
+def test_missing_bars_do_not_break_windows():
+    full = SyntheticMarket.ohlcv_frame("FULL", 300, seed=1)
+    gappy = SyntheticMarket.ohlcv_frame("GAPPY", 300, seed=2)
+    gappy = gappy.drop(gappy.index[[10, 120, 250]])
+    late = SyntheticMarket.ohlcv_frame("LATE", 300, seed=3).iloc[100:]
+    frames = {"FULL": full, "GAPPY": gappy, "LATE": late}
+
+    matrices = BatchTechnicalIndicators.build_price_matrices(frames)
+    indicators = BatchTechnicalIndicators.compute_matrices(matrices)
+
+    for ticker, frame in frames.items():
+        sma_50 = indicators["sma_50"][ticker].reindex(frame.index)
+        expected = TechnicalIndicators.compute_sma(frame, 50)
+        pd.testing.assert_series_equal(sma_50, expected, check_names=False)
+        # Defined from the 50th traded bar on, NaN on the dates not traded
+        assert sma_50.notna().sum() == len(frame) - 49
+        not_traded = indicators["sma_50"].index.difference(frame.index)
+        assert indicators["sma_50"].loc[not_traded, ticker].isna().all()
+        assert np.isfinite(indicators["rsi"][ticker].reindex(frame.index).iloc[-1])
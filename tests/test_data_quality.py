@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.exceptions.exceptions import InvalidConfigException
+from src.services.data_quality import DataQuality
+from src.settings.shared import set_app_config
+
+QUALITY = {"DATA_QUALITY": {"ADJUST_SPLITS": True}}
+
+
+def make_frame(close, volume=None, start="2024-01-01") -> pd.DataFrame:
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.full(len(close), 1000) if volume is None else np.asarray(volume)
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": volume.astype(np.int64),
+        },
+        index=pd.bdate_range(start, periods=len(close), name="date"),
+    )
+
+
+def test_clean_frame_is_returned_as_is():
+    df = make_frame(np.linspace(100, 110, 30))
+    assert DataQuality.validate("CLEAN", df) is df
+    report = DataQuality.pop_report("CLEAN")
+    assert report["bars"] == 30
+    assert report["jumps"] == report["gaps"] == report["repaired_ranges"] == 0
+
+
+def test_drops_duplicates_and_bad_prices_and_repairs_ranges():
+    df = make_frame(np.linspace(100, 110, 10))
+    df = pd.concat([df, df.iloc[[3]]]).sort_index(kind="stable")
+    df.iloc[6, df.columns.get_loc("close")] = 0.0
+    df.iloc[8, df.columns.get_loc("high")] = df["low"].iloc[8] - 1
+
+    checked, report = DataQuality.check(df)
+
+    assert report.duplicate_dates == 1
+    assert report.bad_prices == 1
+    assert report.repaired_ranges == 1
+    assert report.high_below_low == 1
+    assert len(checked) == 9
+    assert checked.index.is_unique
+    assert (checked["high"] >= checked[["open", "close", "low"]].max(axis=1)).all()
+    assert (checked["low"] <= checked[["open", "close", "high"]].min(axis=1)).all()
+
+
+def test_flags_gaps_and_jumps():
+    df = make_frame([100, 101, 102, 160, 161, 162])
+    # Three weeks without a bar between the third and fourth bars
+    df.index = df.index[:3].append(df.index[3:] + pd.Timedelta(days=21))
+
+    _, report = DataQuality.check(df, max_gap_days=7, max_jump=0.4)
+
+    assert report.gaps == 1
+    assert report.max_gap_days > 20
+    assert report.jumps == 1
+    assert report.splits == 0
+
+
+def test_adjusts_a_split_confirmed_by_volume():
+    close = [100.0] * 10 + [50.0] * 10
+    volume = [1000] * 10 + [2000] * 10
+    df = make_frame(close, volume)
+
+    checked = DataQuality.validate("SPLIT", df, app_config=QUALITY)
+    report = DataQuality.pop_report("SPLIT")
+
+    assert report["splits"] == report["splits_adjusted"] == 1
+    assert report["unconfirmed_splits"] == 0
+    np.testing.assert_allclose(checked["close"], 50.0)
+    np.testing.assert_array_equal(checked["volume"], 2000)
+
+
+def test_leaves_a_crash_with_unchanged_volume_alone():
+    close = [100.0] * 10 + [50.0] * 10
+    df = make_frame(close)
+
+    checked = DataQuality.validate("CRASH", df, app_config=QUALITY)
+    report = DataQuality.pop_report("CRASH")
+
+    assert report["jumps"] == 1
+    assert report["splits"] == report["splits_adjusted"] == 0
+    assert report["unconfirmed_splits"] == 1
+    np.testing.assert_array_equal(checked["close"], close)
+
+
+def test_reverse_split_needs_the_volume_to_drop():
+    close = [10.0] * 10 + [100.0] * 10
+    volume = [10_000] * 10 + [1000] * 10
+    _, report = DataQuality.check(make_frame(close, volume), adjust_splits=True)
+    assert report.splits == report.splits_adjusted == 1
+
+    _, report = DataQuality.check(make_frame(close, [1000] * 20), adjust_splits=True)
+    assert report.splits == 0
+    assert report.unconfirmed_splits == 1
+
+
+def test_checks_the_seam_with_the_previous_bars():
+    frame = make_frame([100.0] * 10 + [50.0] * 5, [1000] * 10 + [2000] * 5)
+    previous, new = frame.iloc[:10], frame.iloc[10:]
+
+    checked = DataQuality.validate("SEAM", new, previous=previous)
+    report = DataQuality.pop_report("SEAM")
+
+    assert report["bars"] == len(new)
+    assert report["jumps"] == 1
+    assert report["splits"] == 1
+    pd.testing.assert_frame_equal(checked, new, check_freq=False)
+
+    DataQuality.validate("ALONE", new)
+    assert DataQuality.pop_report("ALONE")["jumps"] == 0
+
+
+def test_adjust_splits_is_rejected_in_incremental_mode():
+    config = {
+        "API_KEYS": {"FMP": {"URL": "http://unused", "API_TOKEN": "test"}},
+        "INCREMENTAL": {"ENABLED": True},
+        "DATA_QUALITY": {"ADJUST_SPLITS": True},
+    }
+    with pytest.raises(InvalidConfigException):
+        set_app_config(config=config)
@@ -0,0 +1,23 @@
+import pytest
+
+from src.exceptions.exceptions import HttpErrorException, RateLimitException
+from src.utils.decorators import compute_backoff
+
+
+def test_retry_after_is_honoured_below_max_delay():
+    error = RateLimitException("Rate limited", retry_after=5.0)
+    assert compute_backoff(error, attempt=1, delay=1.0, max_delay=60.0) == 5.0
+
+
+@pytest.mark.parametrize("retry_after", [61.0, 3600.0, 86400.0])
+def test_retry_after_is_clamped_to_max_delay(retry_after):
+    error = RateLimitException("Rate limited", retry_after=retry_after)
+    assert compute_backoff(error, attempt=1, delay=1.0, max_delay=60.0) == 60.0
+
+
+@pytest.mark.parametrize("attempt", [1, 2, 5, 20])
+def test_exponential_backoff_stays_within_its_cap(attempt):
+    error = HttpErrorException("Http Error", status_code=503)
+    cap = min(30.0, 1.0 * 2 ** (attempt - 1))
+    for _ in range(50):
+        assert 0 <= compute_backoff(error, attempt, delay=1.0, max_delay=30.0) <= cap
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from src.model.frame_schema import (
+    FRAME_COLUMNS,
+    FRAME_DTYPES,
+    INDICATOR_COLUMNS,
+    PRICE_COLUMNS,
+    FrameSchema,
+)
+
+
+def merged_frame() -> pd.DataFrame:
+    """A merged frame as the collectors build it, in no particular order."""
+    index = pd.DatetimeIndex(["2024-01-02", "2024-01-03"]).as_unit("s")
+    return pd.DataFrame(
+        {
+            "rsi": [45.123456789, 55.987654321],
+            "close": [101.123456789, 102.25],
+            "volume": [1000.0, np.nan],
+            "open": [100.0, 101.0],
+            "sma": [100.5, 101.5],
+            "adjClose": [101.1, 102.2],
+            "high": [102.0, 103.0],
+            "low": [99.0, 100.0],
+        },
+        index=index,
+    )
+
+
+def test_conform_orders_the_columns_and_drops_unknown_ones():
+    frame = FrameSchema.conform(merged_frame())
+
+    assert list(frame.columns) == FRAME_COLUMNS
+    assert "sma" not in frame.columns
+    assert "adjClose" not in frame.columns
+    # Columns the source did not provide are NaN
+    assert frame["sma_200"].isna().all()
+
+
+def test_conform_narrows_indicators_only():
+    frame = FrameSchema.conform(merged_frame())
+
+    assert frame.dtypes.astype(str).to_dict() == FRAME_DTYPES
+    for column in PRICE_COLUMNS:
+        assert frame[column].dtype == np.float64
+    assert frame["close"].iloc[0] == 101.123456789
+    for column in INDICATOR_COLUMNS:
+        assert frame[column].dtype == np.float32
+    assert frame["rsi"].iloc[0] == np.float32(45.123456789)
+    assert frame["volume"].tolist() == [1000, 0]
+
+
+def test_conform_sets_the_index_and_leaves_the_input_alone():
+    df = merged_frame()
+    frame = FrameSchema.conform(df)
+
+    assert frame.index.name == "date"
+    assert frame.index.dtype == "datetime64[ns]"
+    assert list(df.columns)[0] == "rsi"
+    assert df["rsi"].dtype == np.float64
+
+
+def test_universe_frame_stacks_tickers_with_a_categorical_symbol():
+    frame = FrameSchema.conform(merged_frame())
+    universe = FrameSchema.universe_frame({"BBB": frame, "AAA": frame.iloc[:1]})
+
+    assert list(universe.columns) == ["symbol"] + FRAME_COLUMNS
+    assert universe["symbol"].dtype == "category"
+    assert universe["symbol"].tolist() == ["AAA", "BBB", "BBB"]
+
+    empty = FrameSchema.universe_frame({})
+    assert empty.empty
+    assert list(empty.columns) == ["symbol"] + FRAME_COLUMNS
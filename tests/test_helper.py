@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from src.services.helper import HelperMethods
+
+
+def indicator_response(name: str, values: dict) -> list:
+    """technical_indicator entries, newest first, echoing a close of 0."""
+    return [
+        {"date": f"{day} 00:00:00", "close": 0.0, name: value}
+        for day, value in sorted(values.items(), reverse=True)
+    ]
+
+
+def test_indicators_line_up_by_date_whatever_their_coverage():
+    indicators = {
+        "rsi": indicator_response(
+            "rsi", {"2024-01-02": 40.0, "2024-01-03": 41.0, "2024-01-04": 42.0}
+        ),
+        # Starts later and misses a date in the middle
+        "ema": indicator_response("ema", {"2024-01-03": 3.0, "2024-01-05": 5.0}),
+        "adx": [],
+    }
+
+    df = HelperMethods.merge_indicator_data(indicators)
+
+    assert list(df.columns) == ["rsi", "ema", "adx"]
+    assert list(df.index.strftime("%Y-%m-%d")) == [
+        "2024-01-02",
+        "2024-01-03",
+        "2024-01-04",
+        "2024-01-05",
+    ]
+    np.testing.assert_array_equal(df["rsi"], [40.0, 41.0, 42.0, np.nan])
+    np.testing.assert_array_equal(df["ema"], [np.nan, 3.0, np.nan, 5.0])
+    assert df["adx"].isna().all()
+
+
+def test_join_keeps_the_ohlcv_rows_and_their_prices():
+    ohlcv = pd.DataFrame(
+        {"close": [10.0, 11.0, 12.0]},
+        index=pd.DatetimeIndex(
+            ["2024-01-02", "2024-01-03", "2024-01-04"], name="date"
+        ).as_unit("ns"),
+    )
+    indicators = HelperMethods.merge_indicator_data(
+        {"ema": indicator_response("ema", {"2024-01-04": 4.0, "2024-01-03": 3.0})}
+    )
+
+    df = HelperMethods.join_indicators(ohlcv, indicators)
+
+    assert df.index.equals(ohlcv.index)
+    np.testing.assert_array_equal(df["close"], [10.0, 11.0, 12.0])
+    np.testing.assert_array_equal(df["ema"], [np.nan, 3.0, 4.0])
+
+
+def test_no_indicator_data_gives_an_empty_frame():
+    assert HelperMethods.merge_indicator_data({"rsi": [], "ema": []}).empty
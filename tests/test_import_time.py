@@ -0,0 +1,26 @@
+import pytest
+
+from src.benchmarks.import_time_benchmark import (
+    BUDGETED_MODULES,
+    DEFAULT_BUDGET_MS,
+    best_run,
+    import_times,
+)
+
+# Dependencies that must only be imported once the config is valid
+HEAVY_PACKAGES = {"pandas", "numpy", "requests", "aiohttp", "pyarrow", "ijson", "ta"}
+
+
+@pytest.mark.parametrize("module", BUDGETED_MODULES)
+def test_module_imports_within_budget(module):
+    cumulative, heaviest = best_run(module, repeat=3)
+    assert cumulative / 1000 <= DEFAULT_BUDGET_MS, (
+        f"{module} took {cumulative / 1000:.1f} ms to import, over the "
+        f"{DEFAULT_BUDGET_MS:.0f} ms budget; heaviest imports: {heaviest}"
+    )
+
+
+@pytest.mark.parametrize("module", BUDGETED_MODULES)
+def test_module_does_not_import_heavy_packages(module):
+    imported = {package for _, package, _ in import_times(module)}
+    assert not imported & HEAVY_PACKAGES
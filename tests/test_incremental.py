@@ -0,0 +1,198 @@
+import os
+import sys
+import threading
+import types
+from datetime import timedelta
+
+import pandas as pd
+import pytest
+
+from src.benchmarks.fake_fmp_server import FakeFmpServer
+from src.benchmarks.synthetic_data import SyntheticMarket
+from src.enums.ticker_status import TickerStatus
+from src.model.warmup_store import WarmupStore
+from src.services.data_collector import DataCollector
+from src.stock_analyser.stock_processor import StockAnalyser
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    """Stand-in repository layer: latest dates per ticker, and stored rows."""
+    state = types.SimpleNamespace(
+        dates={}, threads=[], rows=[], supports_latest_date=True
+    )
+
+    def get_latest_date(symbol):
+        state.threads.append(threading.current_thread())
+        return state.dates.get(symbol)
+
+    persistor = types.ModuleType("src.model.persistor")
+    persistor.HistoricalDataHelper = types.SimpleNamespace(
+        supports_latest_date=lambda: state.supports_latest_date,
+        get_latest_date=get_latest_date,
+        persist_bulk_historical_data=state.rows.extend,
+    )
+    persistor.StockDataHelper = types.SimpleNamespace(
+        persist_bulk_stock_data=lambda data: None
+    )
+    monkeypatch.setitem(sys.modules, "src.model.persistor", persistor)
+    return state
+
+
+@pytest.fixture
+def latest_dates(repository):
+    """Latest persisted date per ticker; "threads" lists the calling threads."""
+    repository.dates["threads"] = repository.threads
+    return repository.dates
+
+
+@pytest.fixture
+def incremental_config(make_config, tmp_path):
+    def make(url: str = "http://unused", engine: str = "threads"):
+        return make_config(
+            url,
+            engine=engine,
+            INCREMENTAL={
+                "ENABLED": True,
+                "STATE_DIR": os.path.join(tmp_path, "warmup"),
+                "WARMUP_BARS": 250,
+            },
+        )
+
+    return make
+
+
+def test_plan_fetches_full_history_without_a_stored_date(
+    incremental_config, latest_dates
+):
+    plan = DataCollector.plan_incremental_fetch(incremental_config(), "AAA")
+    assert plan == {
+        "up_to_date": False,
+        "start_date": None,
+        "end_date": None,
+        "warmup": None,
+        "last_date": None,
+    }
+
+
+def test_plan_extends_the_warmup_window(incremental_config, latest_dates):
+    config = incremental_config()
+    frame = SyntheticMarket.ohlcv_frame("AAA", 300, seed=1)
+    WarmupStore(config).save("AAA", frame)
+    last_date = frame.index[-1]
+    latest_dates["AAA"] = last_date.date()
+
+    plan = DataCollector.plan_incremental_fetch(config, "AAA", end_date="2030-01-01")
+
+    assert plan["start_date"] == (last_date + timedelta(days=1)).date().isoformat()
+    assert plan["end_date"] == "2030-01-01"
+    assert len(plan["warmup"]) == 250
+    assert plan["warmup"].index.max() == last_date
+
+    up_to_date = DataCollector.plan_incremental_fetch(
+        config, "AAA", end_date=last_date.date().isoformat()
+    )
+    assert up_to_date["up_to_date"]
+
+
+def test_plan_rebuilds_a_lost_warmup_window(incremental_config, latest_dates):
+    config = incremental_config()
+    latest_dates["AAA"] = pd.Timestamp("2024-06-28").date()
+
+    plan = DataCollector.plan_incremental_fetch(config, "AAA", end_date="2024-07-31")
+
+    assert plan["warmup"] is None
+    assert not plan["up_to_date"]
+    days = WarmupStore(config).calendar_days()
+    assert (
+        plan["start_date"]
+        == (pd.Timestamp("2024-06-28") - timedelta(days=days)).date().isoformat()
+    )
+    # Enough calendar days for WARMUP_BARS business days
+    assert len(pd.bdate_range(end="2024-06-28", periods=250)) <= days
+
+
+@pytest.mark.parametrize("engine", ["threads", "asyncio"])
+def test_run_saves_warmup_windows_off_the_event_loop(
+    incremental_config, latest_dates, engine
+):
+    with FakeFmpServer(tickers=3, days=300) as server:
+        config = incremental_config(server.url, engine=engine)
+        summary = StockAnalyser().start_process(app_config=config)
+
+    assert summary.count(TickerStatus.SUCCEEDED) == 3
+    store = WarmupStore(config)
+    for result in summary.results:
+        assert len(store.load(result.ticker)) == 250
+    assert len(latest_dates["threads"]) == 3
+    assert threading.main_thread() not in latest_dates["threads"]
+
+
+def test_plan_falls_back_to_the_warmup_window_without_repository_support(
+    incremental_config, repository
+):
+    config = incremental_config()
+    repository.supports_latest_date = False
+    frame = SyntheticMarket.ohlcv_frame("AAA", 300, seed=1)
+    WarmupStore(config).save("AAA", frame)
+
+    plan = DataCollector.plan_incremental_fetch(config, "AAA", end_date="2030-01-01")
+
+    assert plan["last_date"] == frame.index[-1]
+    assert plan["warmup"].index.max() == frame.index[-1]
+    assert repository.threads == []
+    # Nothing processed yet: the full history
+    assert DataCollector.plan_incremental_fetch(config, "BBB")["last_date"] is None
+
+
+def full_history(config, ticker):
+    return DataCollector.fetch_historical_and_technical_indicators(
+        app_config=config, ticker=ticker
+    )
+
+
+def test_extended_frame_matches_the_full_history(incremental_config, latest_dates):
+    with FakeFmpServer(tickers=1, days=600) as server:
+        config = incremental_config(server.url)
+        ticker = server.symbols[0]
+        full = full_history(config, ticker)
+
+        cut = len(full) - 30
+        WarmupStore(config).save(ticker, full.iloc[:cut])
+        latest_dates[ticker] = full.index[cut - 1].date()
+        plan = DataCollector.plan_incremental_fetch(config, ticker)
+        extended = DataCollector.fetch_historical_and_technical_indicators(
+            app_config=config,
+            ticker=ticker,
+            start_date=plan["start_date"],
+            end_date=plan["end_date"],
+            warmup=plan["warmup"],
+        )
+
+    assert extended.index.equals(full.index[cut:])
+    pd.testing.assert_frame_equal(extended, full.iloc[cut:], rtol=1e-6)
+
+
+@pytest.mark.parametrize("engine", ["threads", "asyncio"])
+def test_rebuilt_window_is_not_persisted_again(incremental_config, repository, engine):
+    with FakeFmpServer(tickers=1, days=600) as server:
+        config = incremental_config(server.url, engine=engine)
+        config["PERSISTENCE"] = {"ENABLED": True}
+        ticker = server.symbols[0]
+        full = full_history(config, ticker)
+        # Stored by an earlier run, whose warm-up window is lost
+        last_date = full.index[-10]
+        repository.dates[ticker] = last_date.date()
+
+        summary = StockAnalyser().start_process(app_config=config)
+
+    assert summary.count(TickerStatus.SUCCEEDED) == 1
+    written = pd.DatetimeIndex([row["date"] for row in repository.rows])
+    assert list(written) == list(full.index[-9:])
+    for row in repository.rows:
+        expected = full.loc[pd.Timestamp(row["date"])]
+        for column in ("close", "sma_200", "rsi", "ema", "adx"):
+            assert row[column] == pytest.approx(expected[column], rel=1e-6)
+    # The rebuilt window is kept for the next run
+    assert WarmupStore(config).load(ticker).index.max() == full.index[-1]
+    assert len(WarmupStore(config).load(ticker)) == 250
@@ -0,0 +1,51 @@
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.services.helper import HelperMethods
+from src.services.indicator_engine import IndicatorEngine
+from src.services.ohlcv_parser import OhlcvParser
+from src.services.technical_indicators import INDICATORS_TO_FETCH
+
+FIXTURE_PATH = os.path.join(
+    os.path.dirname(__file__), "fixtures", "fmp_technical_indicators.json"
+)
+
+
+@pytest.fixture(scope="module")
+def fmp_responses():
+    """historical-price-full and technical_indicator responses for one ticker."""
+    with open(FIXTURE_PATH) as fixture:
+        return json.load(fixture)
+
+
+@pytest.fixture(scope="module")
+def local_indicators(fmp_responses):
+    body = json.dumps({"symbol": "TEST", "historical": fmp_responses["historical"]})
+    df = OhlcvParser.from_stream(io.BytesIO(body.encode()))
+    return IndicatorEngine.compute_all(df)
+
+
+@pytest.mark.parametrize("name", list(INDICATORS_TO_FETCH))
+def test_local_indicator_matches_fmp(fmp_responses, local_indicators, name):
+    fmp = HelperMethods.merge_indicator_data({name: fmp_responses[name]})[name]
+    local = local_indicators[name]
+
+    # Defined from the same bar on, with the same values from there
+    assert local.first_valid_index() == fmp.index[0]
+    np.testing.assert_allclose(
+        local.reindex(fmp.index).to_numpy(), fmp.to_numpy(), rtol=0, atol=1e-6
+    )
+
+
+def test_ema_is_seeded_with_the_sma_of_its_first_bars():
+    close = pd.Series(np.arange(1.0, 31.0))
+    ema = IndicatorEngine.ema(close, 10)
+
+    assert ema.iloc[:9].isna().all()
+    assert ema.iloc[9] == pytest.approx(close.iloc[:10].mean())
+    assert ema.iloc[10] == pytest.approx((2 * 11 + 9 * ema.iloc[9]) / 11)
@@ -0,0 +1,26 @@
+import pytest
+
+from src.main import parse_args
+
+
+def test_processes_alone_or_one_shard():
+    assert parse_args(["--processes", "4"]).processes == 4
+    args = parse_args(["--shard-index", "1", "--shard-count", "2"])
+    assert (args.processes, args.shard_index, args.shard_count) == (1, 1, 2)
+
+
+@pytest.mark.parametrize(
+    "argv, environ",
+    [
+        (["--processes", "2", "--shard-index", "1", "--shard-count", "2"], {}),
+        (["--processes", "2"], {"SHARD_INDEX": "0", "SHARD_COUNT": "3"}),
+    ],
+)
+def test_processes_rejects_a_shard(monkeypatch, capsys, argv, environ):
+    for name, value in environ.items():
+        monkeypatch.setenv(name, value)
+
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+
+    assert "--processes cannot be combined" in capsys.readouterr().err
@@ -0,0 +1,135 @@
+import json
+import os
+
+import pytest
+
+from src.utils.metrics import DEFAULT_BUCKETS, Histogram, Metrics
+
+
+def test_histogram_percentiles_and_buckets():
+    histogram = Histogram(buckets=(10.0, 50.0, 100.0))
+    for value in range(1, 101):
+        histogram.observe(float(value))
+    histogram.observe(500.0)
+
+    assert histogram.percentile(50) == 51.0
+    assert histogram.percentile(95) == 96.0
+    assert histogram.percentile(100) == 500.0
+    assert histogram.max == 500.0
+    # Bounds are inclusive; values above the last bound only count in +Inf
+    assert histogram.bucket_counts == [10, 40, 50]
+    assert histogram.count == 101
+    assert Histogram().percentile(95) == 0.0
+
+
+def test_snapshot_merges_into_the_parent():
+    Metrics.increment("http_requests", endpoint="profile")
+    Metrics.observe("stage_seconds", 0.5, stage="ohlcv_parse")
+    snapshot = Metrics.snapshot()
+    Metrics.merge(json.loads(json.dumps(snapshot)))
+
+    report = Metrics.report()
+    assert report["counters"] == [
+        {"name": "http_requests", "labels": {"endpoint": "profile"}, "value": 2}
+    ]
+    (histogram,) = report["histograms"]
+    assert histogram["count"] == 2
+    assert histogram["sum"] == 1.0
+
+
+def test_json_report_has_the_shape_the_benchmark_reads(tmp_path):
+    Metrics.observe("stage_seconds", 0.2, stage="data_quality")
+    Metrics.observe("stage_seconds", 0.4, stage="data_quality")
+    Metrics.observe("stage_seconds", 0.1, stage="fetch", engine="asyncio")
+    Metrics.observe("ticker_seconds", 1.5)
+    Metrics.increment("http_requests", endpoint="profile", status=200)
+    json_path = os.path.join(tmp_path, "reports", "metrics.json")
+
+    returned = Metrics.export(
+        {"METRICS": {"JSON_PATH": json_path}}, extra={"http": {"requests": 3}}
+    )
+
+    with open(json_path) as report_file:
+        report = json.load(report_file)
+    assert report == json.loads(json.dumps(returned))
+    assert report["http"] == {"requests": 3}
+    assert report["counters"] == [
+        {
+            "name": "http_requests",
+            "labels": {"endpoint": "profile", "status": "200"},
+            "value": 1,
+        }
+    ]
+    stages = {
+        histogram["labels"]["stage"]: histogram
+        for histogram in report["histograms"]
+        if histogram["name"] == "stage_seconds"
+        and set(histogram["labels"]) == {"stage"}
+    }
+    assert list(stages) == ["data_quality"]
+    assert stages["data_quality"]["p50"] == 0.2
+    assert stages["data_quality"]["p95"] == 0.4
+    assert stages["data_quality"]["mean"] == pytest.approx(0.3)
+    (ticker,) = [h for h in report["histograms"] if h["name"] == "ticker_seconds"]
+    assert ticker["labels"] == {}
+    assert ticker["sum"] == 1.5
+    assert not os.path.exists(f"{json_path}.tmp")
+
+
+def test_export_is_skipped_when_disabled(tmp_path):
+    json_path = os.path.join(tmp_path, "metrics.json")
+    config = {"METRICS": {"ENABLED": False, "JSON_PATH": json_path}}
+
+    assert Metrics.export(config) is None
+    assert not os.path.exists(json_path)
+
+
+def test_prometheus_text_format(tmp_path):
+    Metrics.increment("http_requests", endpoint="profile")
+    Metrics.increment("http_requests", 2, endpoint="historical-price-full")
+    Metrics.increment("tickers_failed")
+    Metrics.observe("stage_seconds", 0.003, stage="fetch")
+    Metrics.observe("stage_seconds", 0.2, stage="fetch")
+    Metrics.observe("stage_seconds", 120.0, stage="fetch")
+    prometheus_path = os.path.join(tmp_path, "metrics.prom")
+
+    Metrics.export(
+        {
+            "METRICS": {
+                "JSON_PATH": os.path.join(tmp_path, "metrics.json"),
+                "PROMETHEUS_PATH": prometheus_path,
+            }
+        }
+    )
+
+    with open(prometheus_path) as prometheus_file:
+        lines = prometheus_file.read().splitlines()
+    metric = "stock_analyser_stage_seconds"
+    assert lines[:5] == [
+        "# TYPE stock_analyser_http_requests counter",
+        'stock_analyser_http_requests{endpoint="historical-price-full"} 2',
+        'stock_analyser_http_requests{endpoint="profile"} 1',
+        "# TYPE stock_analyser_tickers_failed counter",
+        "stock_analyser_tickers_failed 1",
+    ]
+    assert lines[5] == f"# TYPE {metric} histogram"
+    buckets = lines[6 : 6 + len(DEFAULT_BUCKETS) + 1]
+    assert buckets[0] == f'{metric}_bucket{{stage="fetch",le="0.001"}} 0'
+    assert buckets[1] == f'{metric}_bucket{{stage="fetch",le="0.005"}} 1'
+    assert f'{metric}_bucket{{stage="fetch",le="0.25"}} 2' in buckets
+    assert buckets[-2] == f'{metric}_bucket{{stage="fetch",le="60.0"}} 2'
+    assert buckets[-1] == f'{metric}_bucket{{stage="fetch",le="+Inf"}} 3'
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert lines[-2] == f'{metric}_sum{{stage="fetch"}} 120.203'
+    assert lines[-1] == f'{metric}_count{{stage="fetch"}} 3'
+
+
+def test_prometheus_label_values_are_escaped():
+    Metrics.increment("errors", reason='bad "quote"\\path\nnext', code=500)
+
+    lines = Metrics.to_prometheus().splitlines()
+
+    assert lines[1] == (
+        'stock_analyser_errors{code="500",reason="bad \\"quote\\"\\\\path\\nnext"} 1'
+    )
@@ -0,0 +1,64 @@
+import io
+
+import ijson
+import pandas as pd
+import pytest
+
+from src.benchmarks.ohlcv_parse_benchmark import build_payload, run_decoded
+from src.services import ohlcv_parser
+from src.services.ohlcv_parser import OhlcvParser
+
+
+@pytest.fixture
+def ijson_calls(monkeypatch):
+    """Number of bodies decoded with ijson."""
+    calls = []
+    items = ijson.items
+
+    def counted_items(*args, **kwargs):
+        calls.append(args)
+        return items(*args, **kwargs)
+
+    monkeypatch.setattr(ijson, "items", counted_items)
+    return calls
+
+
+def assert_same_bars(expected: pd.DataFrame, actual: pd.DataFrame):
+    pd.testing.assert_frame_equal(
+        expected, actual, check_dtype=False, check_index_type=False, check_freq=False
+    )
+
+
+def test_small_bodies_are_decoded_whole(ijson_calls):
+    body = build_payload(300)
+    assert len(body) < ohlcv_parser.STREAM_THRESHOLD_BYTES
+
+    assert_same_bars(run_decoded(body), OhlcvParser.from_bytes(body))
+    # Cached bodies come as BytesIO and take the same path
+    assert_same_bars(run_decoded(body), OhlcvParser.from_stream(io.BytesIO(body)))
+    assert ijson_calls == []
+
+
+def test_large_bodies_are_streamed(ijson_calls, monkeypatch):
+    body = build_payload(300)
+    monkeypatch.setattr(ohlcv_parser, "STREAM_THRESHOLD_BYTES", len(body))
+
+    assert_same_bars(run_decoded(body), OhlcvParser.from_bytes(body))
+    assert len(ijson_calls) == 1
+
+
+def test_socket_streams_are_streamed(ijson_calls):
+    body = build_payload(300)
+    stream = io.BufferedReader(io.BytesIO(body))
+
+    assert_same_bars(run_decoded(body), OhlcvParser.from_stream(stream))
+    assert len(ijson_calls) == 1
+
+
+@pytest.mark.parametrize(
+    "body", [b"{}", b'{"historical": []}', b"[]", b'{"historical": {"a": 1}}']
+)
+def test_bodies_without_bars_give_an_empty_frame(body):
+    df = OhlcvParser.from_bytes(body)
+    assert df.empty
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
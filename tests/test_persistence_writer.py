@@ -0,0 +1,123 @@
+from typing import Dict, List
+
+import pytest
+
+from src.benchmarks.sqlite_sink import SqliteSink
+from src.benchmarks.synthetic_data import SyntheticMarket
+from src.enums.ticker_status import TickerStatus
+from src.model.persistence_writer import (
+    HISTORICAL_RECORDS,
+    STOCK_RECORDS,
+    PersistenceWriter,
+)
+from src.services.helper import HelperMethods
+from src.services.technical_indicators import TechnicalIndicators
+from src.stock_analyser.run_journal import RunJournal
+from src.stock_analyser.run_summary import TickerResult
+
+BROKEN_TICKER = "T00001"
+
+
+class FailingSink(SqliteSink):
+    """SqliteSink rejecting every historical chunk that holds BROKEN_TICKER."""
+
+    def persist_bulk_historical_data(self, data: List[Dict]) -> None:
+        if any(record["symbol"] == BROKEN_TICKER for record in data):
+            raise RuntimeError("database unavailable")
+        super().persist_bulk_historical_data(data)
+
+
+@pytest.fixture
+def frames():
+    frames = SyntheticMarket.universe(tickers=4, days=300)
+    for ticker, frame in frames.items():
+        frame["sma_50"] = TechnicalIndicators.compute_sma(frame, 50)
+        frame["sma_200"] = TechnicalIndicators.compute_sma(frame, 200)
+        frames[ticker] = frame.join(TechnicalIndicators.compute_local_indicators(frame))
+    return frames
+
+
+def submit(writer: PersistenceWriter, ticker: str, frame) -> None:
+    metadata = {
+        "symbol": ticker,
+        "name": ticker,
+        "sector": "Technology",
+        "industry": "Software",
+        "market_cap": 1e9,
+    }
+    writer.submit(STOCK_RECORDS, [metadata])
+    writer.submit(
+        HISTORICAL_RECORDS,
+        HelperMethods.frame_to_records(
+            frame, symbol=ticker, columns=writer.historical_columns
+        ),
+    )
+
+
+@pytest.mark.parametrize("chunk_size", [1, 128, 5000])
+def test_writer_stores_every_row(frames, chunk_size):
+    sink = SqliteSink()
+    app_config = {"PERSISTENCE": {"CHUNK_SIZE": chunk_size}}
+    with PersistenceWriter(app_config, sinks=sink.sinks()) as writer:
+        for ticker, frame in frames.items():
+            submit(writer, ticker, frame)
+
+    bars = sum(len(frame) for frame in frames.values())
+    assert sink.count("historical_data") == bars
+    assert sink.count("stocks") == len(frames)
+    assert writer.get_stats()["rows"] == bars + len(frames)
+    assert writer.get_stats()["failed_rows"] == 0
+    assert writer.failed_symbols == set()
+
+
+def test_writer_reports_the_symbols_of_failed_chunks(frames):
+    sink = FailingSink()
+    app_config = {"PERSISTENCE": {"CHUNK_SIZE": 100}}
+    with PersistenceWriter(app_config, sinks=sink.sinks()) as writer:
+        for ticker, frame in frames.items():
+            submit(writer, ticker, frame)
+
+    stats = writer.get_stats()
+    bars = sum(len(frame) for frame in frames.values())
+    assert BROKEN_TICKER in writer.failed_symbols
+    assert stats["failed_rows"] >= len(frames[BROKEN_TICKER])
+    assert sink.count("stocks") == len(frames)
+    assert sink.count("historical_data") == bars - stats["failed_rows"]
+    # Chunks span tickers, so a neighbour of the broken one may be lost too
+    for ticker, frame in frames.items():
+        stored = sink.connection.execute(
+            "SELECT COUNT(*) FROM historical_data WHERE symbol = ?", (ticker,)
+        ).fetchone()[0]
+        assert (stored == len(frame)) == (ticker not in writer.failed_symbols)
+
+
+@pytest.mark.parametrize("flush_every", [1, 2, 100])
+def test_journal_fails_tickers_the_writer_could_not_store(
+    make_config, frames, flush_every
+):
+    config = make_config("http://unused", CHECKPOINT={"FLUSH_EVERY": flush_every})
+    tickers = list(frames)
+    sink = FailingSink()
+    journal = RunJournal(config)
+    journal.begin(tickers)
+    # One chunk per ticker, so only the broken ticker is lost
+    chunk_size = len(frames[BROKEN_TICKER])
+    writer = PersistenceWriter(
+        {"PERSISTENCE": {"CHUNK_SIZE": chunk_size}}, sinks=sink.sinks()
+    )
+    writer.start()
+    journal.attach(writer)
+    for ticker, frame in frames.items():
+        submit(writer, ticker, frame)
+        journal.record(TickerResult(ticker, TickerStatus.SUCCEEDED, 0.1))
+    writer.close()
+    journal.close()
+
+    resumed = RunJournal(config)
+    remaining = resumed.begin(tickers, resume=True)
+    resumed.close()
+    assert remaining == [BROKEN_TICKER]
+    for ticker in set(tickers) - set(remaining):
+        assert sink.connection.execute(
+            "SELECT COUNT(*) FROM historical_data WHERE symbol = ?", (ticker,)
+        ).fetchone()[0] == len(frames[ticker])
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import pytest
+
+from src.exceptions.exceptions import HttpErrorException
+from src.services.profile_batcher import AsyncProfileBatcher, ProfileBatcher
+from src.utils.apis_call_handler import ApisHandler
+
+TICKERS = [f"T{number:05d}" for number in range(250)]
+# Tickers FMP has no profile for
+UNKNOWN = {"T00007"}
+
+
+class ProfileApi:
+    """Stand-in /profile endpoint recording the symbols of every request."""
+
+    def __init__(self, fail_batches: bool = False, delay: float = 0.05) -> None:
+        self.fail_batches = fail_batches
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def respond(self, url: str):
+        symbols = urlsplit(url).path.rsplit("/", 1)[-1].split(",")
+        with self._lock:
+            self.requests.append(symbols)
+        if self.fail_batches and len(symbols) > 1:
+            raise HttpErrorException("Http Error", status_code=500)
+        return [
+            {"symbol": symbol, "companyName": f"{symbol} Inc."}
+            for symbol in symbols
+            if symbol not in UNKNOWN
+        ]
+
+    def get(self, url: str = "", **kwargs):
+        time.sleep(self.delay)
+        return self.respond(url)
+
+
+class AsyncProfileClient:
+    def __init__(self, api: ProfileApi) -> None:
+        self.api = api
+
+    async def get(self, url: str = "", **kwargs):
+        await asyncio.sleep(self.api.delay)
+        return self.api.respond(url)
+
+
+@pytest.fixture
+def config(make_config):
+    return make_config("http://fmp.example", PROCESSING={"PROFILE_BATCH_SIZE": 100})
+
+
+@pytest.fixture
+def profile_api(monkeypatch):
+    def install(**kwargs) -> ProfileApi:
+        api = ProfileApi(**kwargs)
+        monkeypatch.setattr(ApisHandler, "get", staticmethod(api.get))
+        return api
+
+    return install
+
+
+def test_tickers_are_cut_into_batches_of_the_configured_size(config):
+    batcher = ProfileBatcher.get_batcher(config, TICKERS)
+
+    assert [len(batch) for batch in batcher.batches] == [100, 100, 50]
+    assert sum(batcher.batches, []) == TICKERS
+    assert batcher.batch_of["T00150"] == 1
+    assert (
+        ProfileBatcher.build_profile_url(config, ["A", "B"])
+        == "http://fmp.example/profile/A,B?apikey=test"
+    )
+
+    config["PROCESSING"]["PROFILE_BATCH_SIZE"] = 1
+    assert ProfileBatcher.get_batcher(config, TICKERS) is None
+    assert AsyncProfileBatcher.get_batcher(config, TICKERS) is None
+
+
+def test_concurrent_callers_share_one_batch_request(config, profile_api):
+    api = profile_api()
+    batcher = ProfileBatcher.get_batcher(config, TICKERS)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        profiles = dict(zip(TICKERS, executor.map(batcher.get, TICKERS)))
+
+    assert sorted(map(len, api.requests)) == [50, 100, 100]
+    assert profiles["T00007"] == []
+    for ticker in set(TICKERS) - UNKNOWN:
+        assert profiles[ticker] == [{"symbol": ticker, "companyName": f"{ticker} Inc."}]
+
+
+def test_failed_batches_fall_back_to_single_symbol_calls(config, profile_api):
+    api = profile_api(fail_batches=True, delay=0)
+    batcher = ProfileBatcher.get_batcher(config, TICKERS[:10])
+
+    profiles = {ticker: batcher.get(ticker) for ticker in TICKERS[:10]}
+
+    # One failed batch request, then one request per ticker
+    assert [len(symbols) for symbols in api.requests] == [10] + [1] * 10
+    assert profiles["T00003"] == [{"symbol": "T00003", "companyName": "T00003 Inc."}]
+    assert profiles["T00007"] == []
+
+
+def test_tickers_outside_the_batches_are_fetched_alone(config, profile_api):
+    api = profile_api(delay=0)
+    batcher = ProfileBatcher.get_batcher(config, TICKERS[:10])
+
+    assert batcher.get("OTHER") == [{"symbol": "OTHER", "companyName": "OTHER Inc."}]
+    assert api.requests == [["OTHER"]]
+
+
+def test_async_callers_share_one_batch_request(config):
+    api = ProfileApi()
+    client = AsyncProfileClient(api)
+    batcher = AsyncProfileBatcher.get_batcher(config, TICKERS)
+
+    async def fetch_all():
+        return await asyncio.gather(
+            *(batcher.get(client, ticker) for ticker in TICKERS)
+        )
+
+    profiles = dict(zip(TICKERS, asyncio.run(fetch_all())))
+
+    assert sorted(map(len, api.requests)) == [50, 100, 100]
+    assert profiles["T00007"] == []
+    assert profiles["T00200"] == [{"symbol": "T00200", "companyName": "T00200 Inc."}]
+
+
+def test_async_failed_batches_fall_back_to_single_symbol_calls(config):
+    api = ProfileApi(fail_batches=True, delay=0)
+    client = AsyncProfileClient(api)
+    batcher = AsyncProfileBatcher.get_batcher(config, TICKERS[:10])
+
+    async def fetch_all():
+        return await asyncio.gather(
+            *(batcher.get(client, ticker) for ticker in TICKERS[:10])
+        )
+
+    profiles = asyncio.run(fetch_all())
+
+    assert sorted(map(len, api.requests)) == [1] * 10 + [10]
+    assert profiles[3] == [{"symbol": "T00003", "companyName": "T00003 Inc."}]
+    assert profiles[7] == []
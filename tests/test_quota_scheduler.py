@@ -0,0 +1,71 @@
+import os
+import sqlite3
+
+import pytest
+
+from src.benchmarks.fake_fmp_server import FakeFmpServer
+from src.enums.ticker_status import TickerStatus
+from src.stock_analyser.quota_scheduler import QuotaScheduler
+from src.stock_analyser.run_summary import TickerResult
+from src.stock_analyser.stock_processor import StockAnalyser
+
+
+@pytest.fixture
+def scheduler_config(make_config, tmp_path):
+    def make(url: str, **scheduler):
+        return make_config(
+            url,
+            SCHEDULER={
+                "ENABLED": True,
+                "PATH": os.path.join(tmp_path, "schedule.sqlite"),
+                **scheduler,
+            },
+        )
+
+    return make
+
+
+def recorded_calls(config):
+    with sqlite3.connect(config["SCHEDULER"]["PATH"]) as connection:
+        return [
+            row[0]
+            for row in connection.execute("SELECT calls FROM runs ORDER BY started_at")
+        ]
+
+
+def test_each_run_records_only_its_own_calls(scheduler_config):
+    server_requests = []
+    analyser = StockAnalyser()
+    for _ in range(2):
+        # Same process and HttpClient for both runs
+        with FakeFmpServer(tickers=4, days=300) as server:
+            config = scheduler_config(server.url)
+            analyser.start_process(app_config=config)
+        server_requests.append(server.stats["requests"])
+        assert analyser.http_stats["requests"] == server.stats["requests"]
+
+    assert recorded_calls(config) == server_requests
+
+
+def test_plan_fits_the_daily_quota(scheduler_config):
+    config = scheduler_config("http://unused", DAILY_QUOTA=10)
+    scheduler = QuotaScheduler(config)
+    tickers = [f"T{number:05d}" for number in range(20)]
+    planned = scheduler.plan(tickers)
+
+    per_ticker = QuotaScheduler.estimate_calls_per_ticker(config)
+    assert len(planned) == int(10 // per_ticker)
+    assert scheduler.forecast.tickers_deferred == len(tickers) - len(planned)
+    assert not scheduler.forecast.fits
+
+
+def test_failures_lower_the_priority(scheduler_config):
+    config = scheduler_config("http://unused")
+    scheduler = QuotaScheduler(config)
+    scheduler.record(TickerResult("GOOD", TickerStatus.SUCCEEDED, 0.1))
+    scheduler.record(TickerResult("BAD", TickerStatus.FAILED, 0.1, error="500"))
+    scheduler.close(calls=4)
+
+    priorities = QuotaScheduler(config).priorities(["GOOD", "BAD", "NEW"])
+    assert priorities["NEW"] > priorities["BAD"] > priorities["GOOD"]
+    assert recorded_calls(config) == [4]
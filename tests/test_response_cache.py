@@ -0,0 +1,141 @@
+import os
+
+import pytest
+
+from src.benchmarks.fake_fmp_server import FakeFmpServer
+from src.exceptions.exceptions import CustomException
+from src.utils import response_cache
+from src.utils.apis_call_handler import ApisHandler
+from src.utils.response_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time of the cache module."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(path=os.path.join(tmp_path, "cache.sqlite"), max_bytes=300)
+    yield cache
+    cache.close()
+
+
+def test_keys_drop_the_api_key_and_sort_the_query():
+    first = "HTTPS://FMP.example/api/v3/historical-price-full/AAA?to=2024&from=2023&apikey=one"
+    second = "https://fmp.example/api/v3/historical-price-full/AAA/?apikey=two&from=2023&to=2024"
+
+    key = ResponseCache.normalize_url(first)
+    assert key == ResponseCache.normalize_url(second)
+    assert "apikey" not in key
+    assert key.endswith("/historical-price-full/AAA?from=2023&to=2024")
+
+
+def test_entries_expire_after_their_endpoint_ttl(tmp_path, clock):
+    cache = ResponseCache(
+        path=os.path.join(tmp_path, "cache.sqlite"),
+        ttl_seconds={"profile": 100, "default": 10},
+    )
+    cache.store("https://fmp.example/api/v3/profile/AAA?apikey=one", b"[1]")
+    cache.store("https://fmp.example/api/v3/quote/AAA?apikey=one", b"[2]")
+
+    clock[0] += 50
+    assert cache.lookup("https://fmp.example/api/v3/profile/AAA?apikey=two").fresh
+    assert not cache.lookup("https://fmp.example/api/v3/quote/AAA?apikey=two").fresh
+    clock[0] += 50
+    assert not cache.lookup("https://fmp.example/api/v3/profile/AAA").fresh
+    assert cache.lookup("https://fmp.example/api/v3/missing") is None
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["stale"], stats["misses"]) == (1, 2, 1)
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted_at_the_size_cap(cache, clock):
+    for name in ("a", "b", "c"):
+        clock[0] += 1
+        cache.store(f"https://fmp.example/{name}", b"x" * 100)
+    clock[0] += 1
+    assert cache.lookup("https://fmp.example/a") is not None
+
+    clock[0] += 1
+    cache.store("https://fmp.example/d", b"x" * 100)
+
+    assert cache.lookup("https://fmp.example/b") is None
+    for name in ("a", "c", "d"):
+        assert cache.lookup(f"https://fmp.example/{name}") is not None
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get_stats()["bytes"] == 300
+
+
+def test_hits_do_not_write(cache):
+    cache.store("https://fmp.example/a", b"[]")
+    changes = cache.connection.total_changes
+
+    for _ in range(10):
+        cache.lookup("https://fmp.example/a")
+
+    assert cache.connection.total_changes == changes
+    assert list(cache.pending_accesses) == ["https://fmp.example/a"]
+
+
+def test_pending_access_times_are_written_in_batches(cache, clock, monkeypatch):
+    monkeypatch.setattr(response_cache, "ACCESS_FLUSH_SIZE", 2)
+    cache.store("https://fmp.example/a", b"[]")
+    cache.store("https://fmp.example/b", b"[]")
+    clock[0] += 10
+
+    cache.lookup("https://fmp.example/a")
+    cache.lookup("https://fmp.example/b")
+
+    assert cache.pending_accesses == {}
+    accessed = dict(cache.connection.execute("SELECT key, accessed_at FROM responses"))
+    assert set(accessed.values()) == {clock[0]}
+
+
+def cached_config(make_config, tmp_path, url: str, mode: str):
+    return make_config(
+        url,
+        CACHE={
+            "ENABLED": True,
+            "PATH": os.path.join(tmp_path, "cache.sqlite"),
+            "MODE": mode,
+        },
+    )
+
+
+def test_offline_mode_replays_without_the_api(make_config, tmp_path):
+    with FakeFmpServer(tickers=2, days=30) as server:
+        config = cached_config(make_config, tmp_path, server.url, "online")
+        online = ApisHandler.get(url=f"{server.url}/profile/T00000?apikey=test")
+        url = server.url
+    ResponseCache.reset()
+
+    config = cached_config(make_config, tmp_path, url, "offline")
+    # The server is gone, and the key does not depend on the API key
+    replayed = ApisHandler.get(
+        url=f"{url}/profile/T00000?apikey=other", app_config=config
+    )
+    assert replayed == online
+    with pytest.raises(CustomException):
+        ApisHandler.get(url=f"{url}/profile/T00001?apikey=test", app_config=config)
+
+
+def test_stale_entries_are_revalidated_with_a_304(make_config, tmp_path, clock):
+    with FakeFmpServer(tickers=1, days=30) as server:
+        config = cached_config(make_config, tmp_path, server.url, "online")
+        url = f"{server.url}/profile/T00000?apikey=test"
+        first = ApisHandler.get(url=url, app_config=config)
+        clock[0] += 48 * 3600
+
+        second = ApisHandler.get(url=url, app_config=config)
+        third = ApisHandler.get(url=url, app_config=config)
+
+        assert first == second == third
+        assert server.stats["requests"] == 2
+        assert server.stats["not_modified"] == 1
+    stats = ResponseCache.get_cache(config).get_stats()
+    assert (stats["stale"], stats["revalidated"], stats["hits"]) == (1, 1, 1)
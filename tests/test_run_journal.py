@@ -0,0 +1,49 @@
+import pytest
+
+from src.benchmarks.fake_fmp_server import FakeFmpServer
+from src.enums.ticker_status import TickerStatus
+from src.stock_analyser.run_journal import RunJournal
+from src.stock_analyser.run_summary import TickerResult
+from src.stock_analyser.stock_processor import StockAnalyser
+
+
+def test_resume_skips_only_completed_tickers(make_config):
+    config = make_config("http://unused")
+    journal = RunJournal(config)
+    journal.begin(["AAA", "BBB", "CCC", "DDD"])
+    journal.record(TickerResult("AAA", TickerStatus.SUCCEEDED, 0.1))
+    journal.record(TickerResult("BBB", TickerStatus.SKIPPED, 0.1))
+    journal.record(TickerResult("CCC", TickerStatus.FAILED, 0.1, error="HTTP 500"))
+    journal.record(TickerResult("DDD", TickerStatus.SKIPPED, 0.1, error="timeout"))
+    journal.close()
+
+    resumed = RunJournal(config)
+    remaining = resumed.begin(["AAA", "BBB", "CCC", "DDD"], resume=True)
+    resumed.close()
+
+    assert remaining == ["CCC", "DDD"]
+
+
+@pytest.mark.parametrize("engine", ["threads", "asyncio"])
+@pytest.mark.parametrize("status", [500, 429])
+def test_resume_retries_tickers_that_failed(make_config, engine, status):
+    failures = {"historical-price-full": status}
+    with FakeFmpServer(tickers=3, days=300, failures=failures) as server:
+        config = make_config(server.url, engine=engine)
+        failed = StockAnalyser().start_process(app_config=config)
+    assert failed.count(TickerStatus.FAILED) == 3
+
+    with FakeFmpServer(tickers=3, days=300) as server:
+        config = make_config(server.url, engine=engine)
+        resumed = StockAnalyser().start_process(app_config=config, resume=True)
+
+    assert resumed.count(TickerStatus.SUCCEEDED) == 3
+    assert {result.ticker for result in resumed.results} == {
+        result.ticker for result in failed.results
+    }
+
+    journal = RunJournal(config)
+    assert (
+        journal.begin([result.ticker for result in failed.results], resume=True) == []
+    )
+    journal.close()
@@ -0,0 +1,128 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.exceptions.exceptions import CustomException
+from src.services.screener import Screener, ScreenRule, SignalIndexBuilder
+
+NAN = np.nan
+
+
+def signal(rule: ScreenRule) -> str:
+    (name,) = rule.signals
+    return name
+
+
+def test_rules_collect_their_signals():
+    rule = ScreenRule("rsi < 30 and (close > 1.05 * sma_200 or not williams >= -80)")
+
+    assert list(rule.signals) == [
+        "rsi < 30",
+        "close > 1.05 * sma_200",
+        "williams >= -80",
+    ]
+    assert rule.negated_columns == {"williams"}
+    assert rule.bitmap_names[-1] == "defined(williams)"
+    assert ScreenRule.columns_of(ScreenRule("cross_above(sma_50, sma_200)").tree) == [
+        "sma_200",
+        "sma_50",
+    ]
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "rsi <",
+        "rsi",
+        "rsi == 30",
+        "10 < rsi < 30",
+        "unknown_column > 1",
+        "max(rsi, 30) > 1",
+        "cross_above(sma_50)",
+        "rsi < True",
+        "rsi < 'thirty'",
+    ],
+)
+def test_invalid_rules_are_rejected(expression):
+    with pytest.raises(CustomException, match="Invalid screen rule"):
+        ScreenRule(expression)
+
+
+def test_rsi_oversold_threshold_is_false_on_nan():
+    rule = ScreenRule("rsi < 30")
+    values = {"rsi": np.array([NAN, 25.0, 30.0, 35.0, 29.9])}
+
+    result = ScreenRule.evaluate_signal(rule.signals["rsi < 30"], values)
+
+    np.testing.assert_array_equal(result, [False, True, False, False, True])
+
+
+def test_golden_cross_holds_on_the_crossing_bar_only():
+    rule = ScreenRule("cross_above(sma_50, sma_200)")
+    node = rule.signals[signal(rule)]
+    values = {
+        "sma_50": np.array([9.0, 10.0, 11.0, 12.0, 9.0, 13.0]),
+        "sma_200": np.array([NAN, 11.0, 11.0, 11.0, 11.0, 11.0]),
+    }
+
+    np.testing.assert_array_equal(
+        ScreenRule.evaluate_signal(node, values),
+        [False, False, False, True, False, True],
+    )
+    # Continuing from a stored bar where sma_50 was above already
+    previous = {"sma_50": 12.0, "sma_200": 11.0}
+    values = {"sma_50": np.array([12.5]), "sma_200": np.array([11.0])}
+    assert not ScreenRule.evaluate_signal(node, values, previous)[0]
+    previous = {"sma_50": 10.0, "sma_200": 11.0}
+    assert ScreenRule.evaluate_signal(node, values, previous)[0]
+
+
+@pytest.fixture
+def screener(tmp_path):
+    """Index of one ticker in warm-up (NaN sma_200) and one past it."""
+    dates = pd.bdate_range("2024-01-02", periods=3, name="date")
+    frames = {
+        "WARM": pd.DataFrame(
+            {"close": [10.0, 11.0, 12.0], "sma_200": [NAN, NAN, NAN], "rsi": 50.0},
+            index=dates,
+        ),
+        "DONE": pd.DataFrame(
+            {"close": [10.0, 11.0, 12.0], "sma_200": [11.5, 11.5, 11.5], "rsi": 50.0},
+            index=dates,
+        ),
+    }
+    config = {
+        "SCREENER": {
+            "INDEX_PATH": os.path.join(tmp_path, "signal_index.npz"),
+            "RULES": {
+                "below_trend": "not close > sma_200",
+                "not_oversold": "not (rsi < 30 or close > sma_200)",
+            },
+        }
+    }
+    builder = SignalIndexBuilder(config)
+    for ticker, frame in frames.items():
+        builder.add(ticker, frame)
+    builder.close()
+    return Screener.get_screener(config)
+
+
+def test_negated_rules_skip_tickers_in_warm_up(screener):
+    assert screener.screen("below_trend") == {
+        "2024-01-02": ["DONE"],
+        "2024-01-03": ["DONE"],
+    }
+    assert screener.screen("not_oversold") == {
+        "2024-01-02": ["DONE"],
+        "2024-01-03": ["DONE"],
+    }
+    # The comparison itself never holds on NaN
+    assert screener.screen("close > sma_200") == {"2024-01-04": ["DONE"]}
+
+
+def test_double_negation_is_the_signal(screener):
+    assert screener.screen("not not close > sma_200") == screener.screen(
+        "close > sma_200"
+    )
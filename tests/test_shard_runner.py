@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.benchmarks.fake_fmp_server import FakeFmpServer
+from src.enums.ticker_status import TickerStatus
+from src.model.signal_index import PRESENT_SIGNAL, SignalIndex
+from src.stock_analyser.shard_runner import ShardRunner
+
+SHARDS = 2
+
+
+def test_shard_configs_have_their_own_state_paths(make_config):
+    config = make_config("http://unused", SCHEDULER={"DAILY_QUOTA": 1000})
+    shard_configs = [
+        ShardRunner.shard_config(config, shard_index, SHARDS)
+        for shard_index in range(SHARDS)
+    ]
+
+    for section, key in (
+        ("CHECKPOINT", "PATH"),
+        ("SCHEDULER", "PATH"),
+        ("SCREENER", "INDEX_PATH"),
+        ("METRICS", "JSON_PATH"),
+    ):
+        paths = {shard_config[section][key] for shard_config in shard_configs}
+        assert len(paths) == SHARDS
+        assert config[section].get(key) not in paths
+    for shard_config in shard_configs:
+        assert shard_config["SCHEDULER"]["DAILY_QUOTA"] == 500
+
+
+def test_shards_cover_the_universe_once(make_config):
+    tickers = [f"T{number:05d}" for number in range(50)]
+    shards = [
+        ShardRunner.select_shard(
+            tickers, {"PROCESSING": {"SHARD_INDEX": index, "SHARD_COUNT": SHARDS}}
+        )
+        for index in range(SHARDS)
+    ]
+    assert sorted(sum(shards, [])) == tickers
+
+
+def test_run_merges_the_signal_index_of_every_shard(make_config):
+    with FakeFmpServer(tickers=8, days=300) as server:
+        config = make_config(server.url)
+        summary = ShardRunner.run(config, processes=SHARDS)
+
+    assert summary.count(TickerStatus.SUCCEEDED) == 8
+    index_path = config["SCREENER"]["INDEX_PATH"]
+    shard_indexes = [
+        SignalIndex.load(ShardRunner.shard_path(index_path, shard_index, SHARDS))
+        for shard_index in range(SHARDS)
+    ]
+    shard_tickers = [set(index.tickers) for index in shard_indexes]
+    assert all(shard_tickers)
+    assert not shard_tickers[0] & shard_tickers[1]
+
+    merged = SignalIndex.load(index_path)
+    assert set(merged.tickers) == {result.ticker for result in summary.results}
+    for shard_index in shard_indexes:
+        for signal in shard_index.signals:
+            shard_matrix = shard_index.unpack(shard_index.bitmap(signal))
+            merged_matrix = merged.unpack(merged.bitmap(signal))
+            rows = np.searchsorted(merged.dates, shard_index.dates)
+            for column, ticker in enumerate(shard_index.tickers):
+                np.testing.assert_array_equal(
+                    merged_matrix[rows, merged.ticker_ids[ticker]],
+                    shard_matrix[:, column],
+                )
+        assert merged.last_rows.keys() >= shard_index.last_rows.keys()
+    assert merged.unpack(merged.bitmap(PRESENT_SIGNAL)).any(axis=0).all()
+
+
+@pytest.mark.parametrize("engine", ["threads", "asyncio"])
+def test_run_shard_returns_the_stats_of_its_engine(make_config, engine):
+    with FakeFmpServer(tickers=3, days=300) as server:
+        config = make_config(server.url, engine=engine)
+        output = ShardRunner.run_shard(config)
+
+    assert output["http"]["requests"] == server.stats["requests"] > 0
@@ -0,0 +1,83 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.benchmarks.synthetic_data import SyntheticMarket
+from src.model.frame_schema import FRAME_COLUMNS
+from src.model.snapshot_store import SnapshotStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SnapshotStore({"SNAPSHOT": {"PATH": os.path.join(tmp_path, "snapshots")}})
+
+
+def frame(ticker: str, seed: int) -> pd.DataFrame:
+    """Two years of bars, 2023 and 2024."""
+    df = SyntheticMarket.ohlcv_frame(ticker, 520, seed=seed)
+    df.index = pd.bdate_range("2023-01-02", periods=len(df), name="date").as_unit("ns")
+    return df[df.index.year <= 2024]
+
+
+def test_partitions_by_symbol_and_year(store):
+    store.write("AAA", frame("AAA", 1))
+    store.write("BBB", frame("BBB", 2))
+
+    partitions = sorted(
+        os.path.relpath(os.path.join(directory, name), store.path)
+        for directory, _, names in os.walk(store.path)
+        for name in names
+    )
+    assert partitions == [
+        os.path.join(f"symbol={symbol}", f"year={year}", "part-0.parquet")
+        for symbol in ("AAA", "BBB")
+        for year in (2023, 2024)
+    ]
+
+
+def test_rewriting_a_partition_merges_without_duplicate_dates(store):
+    df = frame("AAA", 1)
+    store.write("AAA", df.iloc[:-20])
+    # An incremental run: the last stored day again, changed, and new days
+    update = df.iloc[-21:].copy()
+    update["close"] += 1.0
+    store.write("AAA", update)
+
+    stored = store.read(symbols=["AAA"])
+    assert stored.index.is_unique
+    assert stored.index.equals(df.index)
+    pd.testing.assert_series_equal(
+        stored["close"],
+        pd.concat([df["close"].iloc[:-21], update["close"]]),
+        check_names=False,
+        check_freq=False,
+    )
+    assert list(stored.columns) == FRAME_COLUMNS + ["symbol"]
+
+
+def test_reads_only_the_matching_partitions(store):
+    store.write("AAA", frame("AAA", 1))
+    store.write("BBB", frame("BBB", 2))
+    # Unreadable, so opening a pruned partition would fail the read
+    for path in (("symbol=BBB", "year=2024"), ("symbol=AAA", "year=2023")):
+        with open(os.path.join(store.path, *path, "part-0.parquet"), "wb") as file:
+            file.write(b"not parquet")
+
+    df = store.read(
+        start_date="2024-03-01",
+        end_date="2024-03-31",
+        symbols=["AAA"],
+        columns=["close"],
+    )
+
+    assert list(df.columns) == ["symbol", "close"]
+    assert set(df["symbol"]) == {"AAA"}
+    assert df.index.min() >= pd.Timestamp("2024-03-01")
+    assert df.index.max() <= pd.Timestamp("2024-03-31")
+    assert len(df) == len(pd.bdate_range("2024-03-01", "2024-03-31"))
+
+
+def test_reading_an_empty_store(store):
+    assert store.read().empty
+    assert store.read_ticker("AAA", years=[2024]).empty
@@ -0,0 +1,39 @@
+import pytest
+
+from src.benchmarks.fake_fmp_server import FakeFmpServer
+from src.enums.ticker_status import TickerStatus
+from src.stock_analyser.stock_processor import StockAnalyser
+
+ENGINES = ["threads", "asyncio"]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_processes_every_ticker(make_config, engine):
+    with FakeFmpServer(tickers=4, days=300) as server:
+        config = make_config(server.url, engine=engine)
+        summary = StockAnalyser().start_process(app_config=config)
+
+    assert summary.count(TickerStatus.SUCCEEDED) == 4
+    assert summary.count(TickerStatus.FAILED) == 0
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize(
+    "failures",
+    [
+        {"historical-price-full": 500},
+        {"historical-price-full": 429},
+        {"profile": 500},
+        {"profile": 429},
+    ],
+)
+def test_http_errors_fail_the_ticker(make_config, engine, failures):
+    with FakeFmpServer(tickers=3, days=300, failures=failures) as server:
+        config = make_config(server.url, engine=engine)
+        summary = StockAnalyser().start_process(app_config=config)
+
+    status_code = str(next(iter(failures.values())))
+    assert summary.count(TickerStatus.FAILED) == 3
+    assert summary.count(TickerStatus.SKIPPED) == 0
+    for result in summary.results:
+        assert status_code in result.error
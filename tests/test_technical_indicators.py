@@ -0,0 +1,82 @@
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+import pytest
+
+from src.benchmarks.fake_fmp_server import FakeFmpServer
+from src.exceptions.exceptions import HttpErrorException
+from src.services.helper import HelperMethods
+from src.services.technical_indicators import INDICATORS_TO_FETCH, TechnicalIndicators
+from src.utils.apis_call_handler import ApisHandler
+
+
+@pytest.fixture
+def indicator_api(make_config, monkeypatch):
+    """FakeFmpServer whose indicator values differ per type, with failing types."""
+    failing = {}
+    threads = []
+    get = ApisHandler.get
+
+    def tagged_get(url: str = "", **kwargs):
+        indicator = parse_qs(urlsplit(url).query)["type"][0]
+        threads.append(threading.current_thread().name)
+        if indicator in failing:
+            raise failing[indicator]
+        factor = list(INDICATORS_TO_FETCH).index(indicator) + 1
+        return [
+            dict(entry, **{indicator: entry[indicator] * factor})
+            for entry in get(url=url, **kwargs)
+        ]
+
+    monkeypatch.setattr(ApisHandler, "get", staticmethod(tagged_get))
+    with FakeFmpServer(tickers=1, days=120) as server:
+        make_config(server.url)
+        yield server, failing, threads
+
+
+def fetch_concurrently(server) -> pd.DataFrame:
+    return TechnicalIndicators.fetch_all_technical_indicator(
+        server.url, server.symbols[0], "test"
+    )
+
+
+def fetch_sequentially(server) -> pd.DataFrame:
+    return HelperMethods.merge_indicator_data(
+        {
+            name: TechnicalIndicators.get_tech_indicator_data(
+                server.url, server.symbols[0], "test", indicator_type=indicator.value
+            )
+            for name, indicator in INDICATORS_TO_FETCH.items()
+        }
+    )
+
+
+def test_concurrent_fetch_matches_the_sequential_merge(indicator_api):
+    server, _, threads = indicator_api
+
+    concurrent = fetch_concurrently(server)
+    assert all(name.startswith("indicator") for name in threads)
+    threads.clear()
+    sequential = fetch_sequentially(server)
+
+    assert list(concurrent.columns) == list(INDICATORS_TO_FETCH)
+    assert len(concurrent) == 120
+    pd.testing.assert_frame_equal(concurrent, sequential)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [HttpErrorException("Http Error", status_code=404), RuntimeError("broken")],
+)
+def test_a_failing_indicator_leaves_the_others_merged(indicator_api, error):
+    server, failing, _ = indicator_api
+    expected = fetch_sequentially(server)
+    failing["adx"] = error
+
+    df = fetch_concurrently(server)
+
+    assert list(df.columns) == list(INDICATORS_TO_FETCH)
+    assert df["adx"].isna().all()
+    others = [name for name in INDICATORS_TO_FETCH if name != "adx"]
+    pd.testing.assert_frame_equal(df[others], expected[others])
@@ -0,0 +1,66 @@
+import pytest
+
+from src.exceptions.exceptions import CustomException
+from src.model.universe_index import UniverseIndex
+from src.services.data_collector import DataCollector
+
+
+def entry(symbol: str) -> dict:
+    return {
+        "symbol": symbol,
+        "name": symbol,
+        "price": 10.0,
+        "exchange": "NASDAQ Global Select",
+        "exchangeShortName": "NASDAQ",
+        "type": "stock",
+    }
+
+
+SYMBOLS = [f"T{number:05d}" for number in range(20)]
+
+
+@pytest.fixture
+def universe(make_config):
+    config = make_config("http://unused", UNIVERSE={"MAX_SHRINK": 0.25})
+    index = UniverseIndex(config)
+    index.refresh([entry(symbol) for symbol in SYMBOLS])
+    yield index
+    index.close()
+
+
+def test_refresh_records_listings_and_delistings(universe):
+    payload = [entry(symbol) for symbol in SYMBOLS[2:]] + [entry("NEW")]
+    diff = universe.refresh(payload)
+
+    assert diff.listed == ["NEW"]
+    assert diff.delisted == SYMBOLS[:2]
+    assert universe.select() == sorted(SYMBOLS[2:] + ["NEW"])
+
+
+@pytest.mark.parametrize(
+    "payload",
+    [[], [{}], [{"symbol": ""}, {"symbol": None}, "T00001", 42], {"Error": "x"}],
+)
+def test_refresh_rejects_payloads_without_valid_entries(universe, payload):
+    version = universe.latest_version()
+    with pytest.raises(CustomException):
+        universe.refresh(payload)
+    assert universe.latest_version() == version
+    assert universe.select() == SYMBOLS
+
+
+def test_refresh_rejects_a_payload_that_shrinks_the_universe_too_much(universe):
+    version = universe.latest_version()
+    with pytest.raises(CustomException, match="MAX_SHRINK"):
+        universe.refresh([entry(symbol) for symbol in SYMBOLS[:10]])
+    assert universe.latest_version() == version
+    assert universe.select() == SYMBOLS
+
+    # Within the allowed fraction the refresh goes through
+    diff = universe.refresh([entry(symbol) for symbol in SYMBOLS[5:]])
+    assert diff.delisted == SYMBOLS[:5]
+
+
+def test_rejected_refresh_keeps_the_previous_universe_for_the_run(universe):
+    truncated = [entry(symbol) for symbol in SYMBOLS[:3]]
+    assert DataCollector.build_universe(truncated, universe=universe) == SYMBOLS